@@ -1,17 +1,71 @@
+"""Talzeeq desktop application.
+
+Usage:
+    python app.py [--profile-startup]
+
+With --profile-startup the application quits after the main window's first paint and reports the import time of
+every module and the time of every startup stage.
+"""
+
+
 # Built-in imports.
+import argparse
 import sys
 
-# Third-party package imports.
-from PyQt5.QtWidgets import QApplication
+from typing import List
 
 # First-party package imports.
-from widgets.main_window import MainWindow
+from utils.startup_profiler import StartupProfiler
 
 
-if __name__ == '__main__':
-    app = QApplication(sys.argv)
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Builds Deep Learning models in a drag-and-drop environment.')
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='Report the modules import times and the time until the first paint, then quit.',
+    )
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    # Unknown arguments are left to Qt.
+    args, qt_argv = create_parser().parse_known_args(argv[1:])
+
+    startup_profiler = None
+    if args.profile_startup:
+        startup_profiler = StartupProfiler()
+        startup_profiler.start()
+
+    # Imported after the profiler starts, so their imports are timed.
+    from PyQt5.QtWidgets import QApplication
+    from widgets.main_window import MainWindow
+
+    if startup_profiler:
+        startup_profiler.mark_stage('imports')
+
+    app = QApplication(argv[:1] + qt_argv)
 
     main_window = MainWindow()
+
+    if startup_profiler:
+        startup_profiler.mark_stage('main window')
+
+        from widgets.first_paint_filter import FirstPaintFilter
+
+        def report_startup_profile():
+            startup_profiler.mark_stage('first paint')
+            startup_profiler.stop()
+            startup_profiler.write_report(sys.stderr)
+            app.quit()
+
+        first_paint_filter = FirstPaintFilter(main_window.view.viewport())
+        first_paint_filter.first_painted.connect(report_startup_profile)
+
     main_window.showMaximized()
 
-    sys.exit(app.exec_())
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,232 @@
+"""Export benchmark, times every export stage on synthetic diagrams and reports the results as JSON.
+
+Usage:
+    python -m benchmarks.export_benchmark [--graphs chain fan random residual] [--sizes 10 100 1000]
+                                          [--repeat 3] [--output results.json]
+
+Every stage is timed --repeat times and the best time is reported, then it is run once more under tracemalloc to
+report its peak memory.
+"""
+
+
+# Built-in imports.
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from typing import Any, Callable, Dict, List, Tuple
+
+# The benchmark never shows a window, so it runs without a display server by default.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third-party package imports.
+from PyQt5.QtWidgets import QApplication
+
+# First-party package imports.
+from utils import export_utils
+from utils import frameworks_utils
+from utils import graph_utils
+from frameworks.Keras.dense_layer import DenseLayer
+from frameworks.Keras.input_layer import InputLayer
+from widgets.arrow import Arrow
+from widgets.diagram_item import DiagramItem
+
+
+FRAMEWORK_NAME = 'Keras'
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+RANDOM_SEED = 2020
+
+
+def generate_chain_graph(size: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """One input layer followed by a chain of layers."""
+
+    return size, [(node - 1, node) for node in range(1, size)]
+
+
+def generate_fan_graph(size: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """One input layer fanned out to size - 2 layers, all fanned in to the last layer."""
+
+    if size < 3:
+        return generate_chain_graph(size)
+
+    last_node = size - 1
+    edges = list()
+    for node in range(1, last_node):
+        edges.append((0, node))
+        edges.append((node, last_node))
+    return size, edges
+
+
+def generate_random_graph(size: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """Random DAG, every layer takes one to three random earlier layers as parents."""
+
+    generator = random.Random(RANDOM_SEED)
+    edges = list()
+    for node in range(1, size):
+        for parent in generator.sample(range(node), min(node, generator.randint(1, 3))):
+            edges.append((parent, node))
+    return size, edges
+
+
+def generate_residual_graph(size: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """Chain of layers where every other layer also takes the output of the layer three steps back."""
+
+    edges = list()
+    for node in range(1, size):
+        edges.append((node - 1, node))
+        if node >= 3 and node % 2 == 1:
+            edges.append((node - 3, node))
+    return size, edges
+
+
+GRAPH_GENERATORS = {
+    'chain': generate_chain_graph,
+    'fan': generate_fan_graph,
+    'random': generate_random_graph,
+    'residual': generate_residual_graph,
+}
+
+
+def create_qt_elements(nodes_count: int, edges: List[Tuple[int, int]]) -> Tuple[List[DiagramItem], List[Arrow]]:
+    nodes = list()
+    for node in range(nodes_count):
+        layer = InputLayer() if node == 0 else DenseLayer()
+        layer.object_name = 'layer_{}'.format(node)
+        nodes.append(DiagramItem(layer, None))
+
+    arrows = list()
+    for start_node, end_node in edges:
+        arrow = Arrow(nodes[start_node], nodes[end_node])
+        nodes[start_node].add_arrow(arrow)
+        nodes[end_node].add_arrow(arrow)
+        arrows.append(arrow)
+
+    return nodes, arrows
+
+
+def measure_stage(stage: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    best_time = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        stage()
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    stage()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'time_seconds': best_time, 'peak_memory_bytes': peak_memory}
+
+
+def benchmark_graph(graph_name: str, size: int, repeat: int) -> Dict[str, Any]:
+    nodes_count, edges = GRAPH_GENERATORS[graph_name](size)
+    nodes, arrows = create_qt_elements(nodes_count, edges)
+    nodes_mapping = {node: index for index, node in enumerate(nodes)}
+    layers = [node.get_framework_layer() for node in nodes]
+
+    uni_graph = graph_utils.create_graph_from_qt_elements(nodes, arrows, nodes_mapping)
+    bi_graph = graph_utils.create_graph_from_qt_elements(nodes, arrows, nodes_mapping, is_bi_directional=True)
+    graph_evaluation = graph_utils.evaluate_graph(uni_graph)
+    root_nodes = graph_evaluation.root_nodes
+    root_nodes_set = set(root_nodes)
+    topological_sort = graph_evaluation.topological_sort
+    parents = graph_evaluation.parents
+
+    input_definitions = export_utils.build_input_definitions(map(layers.__getitem__, root_nodes))
+    layer_definitions = export_utils.build_layer_definitions(layers, topological_sort, root_nodes_set)
+    model_connections = export_utils.build_model_connections(layers, parents, topological_sort, root_nodes_set)
+
+    stages = {
+        'create_graph_from_qt_elements': lambda: graph_utils.create_graph_from_qt_elements(
+            nodes,
+            arrows,
+            nodes_mapping,
+        ),
+        'create_bi_directional_graph_from_qt_elements': lambda: graph_utils.create_graph_from_qt_elements(
+            nodes,
+            arrows,
+            nodes_mapping,
+            is_bi_directional=True,
+        ),
+        'is_one_connected_component': lambda: graph_utils.is_one_connected_component(bi_graph),
+        'create_graph_topological_sort': lambda: graph_utils.create_graph_topological_sort(uni_graph),
+        'get_root_nodes': lambda: graph_utils.get_root_nodes(uni_graph),
+        'evaluate_graph': lambda: graph_utils.evaluate_graph(uni_graph),
+        'build_input_definitions': lambda: export_utils.build_input_definitions(map(layers.__getitem__, root_nodes)),
+        'build_layer_definitions': lambda: export_utils.build_layer_definitions(
+            layers,
+            topological_sort,
+            root_nodes_set,
+        ),
+        'build_model_connections': lambda: export_utils.build_model_connections(
+            layers,
+            parents,
+            topological_sort,
+            root_nodes_set,
+        ),
+        'get_formatted_framework_template': lambda: frameworks_utils.get_formatted_framework_template(
+            FRAMEWORK_NAME,
+            input_definitions,
+            layer_definitions,
+            model_connections,
+        ),
+        'write_model': lambda: export_utils.write_model(io.StringIO(), FRAMEWORK_NAME, layers, graph_evaluation),
+        'export_model': lambda: export_utils.export_model(FRAMEWORK_NAME, layers, uni_graph),
+    }
+
+    return {
+        'graph': graph_name,
+        'size': size,
+        'nodes': nodes_count,
+        'edges': len(edges),
+        'stages': {stage_name: measure_stage(stage, repeat) for stage_name, stage in stages.items()},
+    }
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Times every export stage on synthetic diagrams.')
+    parser.add_argument('--graphs', nargs='+', choices=sorted(GRAPH_GENERATORS), default=sorted(GRAPH_GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per stage, the best is kept.')
+    parser.add_argument('--output', help='Path of the JSON results file, the standard output if omitted.')
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = create_parser().parse_args(argv)
+
+    # Diagram items need a GUI application for their text items, even though nothing is shown.
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'benchmarks': [
+            benchmark_graph(graph_name, size, args.repeat)
+            for graph_name in args.graphs
+            for size in args.sizes
+        ],
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
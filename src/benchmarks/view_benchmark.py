@@ -0,0 +1,259 @@
+"""View benchmark, times the diagram view's rendering settings against each other on large scenes.
+
+Usage:
+    python -m benchmarks.view_benchmark [--settings default no_index ...] [--sizes 1000 10000]
+                                        [--repeat 3] [--output results.json]
+
+Every settings variant is applied to the same grid diagram, then repaints at 100% and 50% zoom, a move of all the
+items and point lookups are timed --repeat times and the best time is reported.
+
+Removing half of the items at once is also timed on every size, both by rebuilding the scene's items and one by one,
+see DiagramScene.rebuild_scene_items.
+
+Opening a diagram is timed on every size as well, decoding its .tlzb file and adding it to a new scene, see
+DiagramScene.add_items.
+"""
+
+
+# Built-in imports.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from typing import Any, Callable, Dict, List
+
+# The benchmark never shows a window, so it runs without a display server by default.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third-party package imports.
+from PyQt5.QtCore import QPointF, QRectF
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QMenu
+
+# First-party package imports.
+from utils import diagram_file_utils
+from benchmarks.export_benchmark import GRAPH_GENERATORS
+from constants import diagram_constants
+from constants import main_window_constants
+from frameworks.Keras.dense_layer import DenseLayer
+from frameworks.Keras.input_layer import InputLayer
+from widgets.diagram_scene import DiagramScene
+from widgets.diagram_view import DiagramView, DiagramViewSettings
+
+
+DEFAULT_SIZES = [1000, 10000]
+
+VIEW_SIZE = (1600, 1000)
+
+GRID_COLUMNS = 100
+
+GRID_SPACING = (250, 80)
+
+SETTINGS_VARIANTS = {
+    'default': dict(),
+    'no_index': dict(item_index_method=QGraphicsScene.NoIndex),
+    'shallow_bsp_tree': dict(bsp_tree_depth=4),
+    'deep_bsp_tree': dict(bsp_tree_depth=16),
+    'unindexed_bulk_moves': dict(bulk_move_items_count=1),
+    'full_viewport_update': dict(viewport_update_mode=QGraphicsView.FullViewportUpdate),
+    'no_background_cache': dict(is_background_cached=False),
+    'no_optimization_flags': dict(optimization_flags=0),
+    'fixed_scene_rect': dict(is_scene_rect_growing=False),
+}
+
+
+def create_scene(size: int) -> DiagramScene:
+    scene = DiagramScene(QMenu())
+    scene.setSceneRect(
+        QRectF(0, 0, main_window_constants.DIAGRAM_SCENE_SIZE, main_window_constants.DIAGRAM_SCENE_SIZE)
+    )
+    nodes_count, edges = GRAPH_GENERATORS['random'](size)
+
+    items = list()
+    for node in range(nodes_count):
+        column, row = node % GRID_COLUMNS, node // GRID_COLUMNS
+        position = QPointF(column * GRID_SPACING[0], row * GRID_SPACING[1])
+        items.append(scene.create_diagram_item(InputLayer() if node == 0 else DenseLayer(), position))
+
+    for start_node, end_node in edges:
+        scene.create_arrow(items[start_node], items[end_node])
+
+    QApplication.processEvents()
+    return scene
+
+
+def measure(stage: Callable[[], Any], repeat: int) -> float:
+    best_time = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        stage()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time
+
+
+def move_all_items(scene: DiagramScene, items: List[Any], dx: float):
+    is_bulk_move = scene.bulk_move_items_count and len(items) >= scene.bulk_move_items_count
+    if is_bulk_move:
+        scene.begin_bulk_change()
+
+    for item in items:
+        item.moveBy(dx, 0)
+    scene.update_moved_items()
+
+    if is_bulk_move:
+        scene.end_bulk_change()
+
+
+def lookup_points(scene: DiagramScene, points: List[QPointF]):
+    for point in points:
+        scene.items(point)
+
+
+def benchmark_settings(settings_name: str, size: int, repeat: int) -> Dict[str, Any]:
+    scene = create_scene(size)
+    view = DiagramView(scene, DiagramViewSettings(**SETTINGS_VARIANTS[settings_name]))
+    view.resize(*VIEW_SIZE)
+
+    items = scene.get_diagram_graph().get_nodes()
+    points = [item.pos() for item in items[::max(1, len(items) // 1000)]]
+
+    def repaint(scale: float):
+        view.resetTransform()
+        view.scale(scale, scale)
+        view.viewport().grab()
+
+    results = {
+        'settings': settings_name,
+        'size': size,
+        'stages': {
+            'repaint_100': measure(lambda: repaint(1.0), repeat),
+            'repaint_50': measure(lambda: repaint(0.5), repeat),
+            'move_all_items': measure(lambda: move_all_items(scene, items, 1.0), repeat),
+            'lookup_points': measure(lambda: lookup_points(scene, points), repeat),
+        },
+    }
+
+    view.deleteLater()
+    scene.deleteLater()
+    QApplication.processEvents()
+    return results
+
+
+def remove_half_items(size: int, rebuild_remove_items_count: int) -> float:
+    """Times removing every other item of a new scene with the given rebuild threshold, the scene is not timed."""
+
+    scene = create_scene(size)
+    items = scene.get_diagram_graph().get_nodes()[::2]
+
+    default_rebuild_remove_items_count = diagram_constants.DIAGRAM_REBUILD_REMOVE_ITEMS_COUNT
+    diagram_constants.DIAGRAM_REBUILD_REMOVE_ITEMS_COUNT = rebuild_remove_items_count
+    try:
+        start_time = time.perf_counter()
+        scene.remove_items(items)
+        elapsed_time = time.perf_counter() - start_time
+    finally:
+        diagram_constants.DIAGRAM_REBUILD_REMOVE_ITEMS_COUNT = default_rebuild_remove_items_count
+
+    scene.deleteLater()
+    QApplication.processEvents()
+    return elapsed_time
+
+
+def benchmark_remove(size: int, repeat: int) -> Dict[str, Any]:
+    return {
+        'size': size,
+        'stages': {
+            'remove_half_items_rebuilt': min(remove_half_items(size, 1) for _ in range(repeat)),
+            'remove_half_items_one_by_one': min(remove_half_items(size, sys.maxsize) for _ in range(repeat)),
+        },
+    }
+
+
+def open_diagram(data: bytes) -> Dict[str, float]:
+    """Times decoding the given diagram bytes and adding the diagram to a new scene, the scene creation is not timed."""
+
+    scene = DiagramScene(QMenu())
+    scene.setSceneRect(
+        QRectF(0, 0, main_window_constants.DIAGRAM_SCENE_SIZE, main_window_constants.DIAGRAM_SCENE_SIZE)
+    )
+
+    start_time = time.perf_counter()
+    diagram = diagram_file_utils.decode_diagram(data)
+    decode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    scene.add_diagram(diagram)
+    add_time = time.perf_counter() - start_time
+
+    scene.clear_diagram()
+    scene.deleteLater()
+    QApplication.processEvents()
+    return {'decode_diagram': decode_time, 'add_diagram': add_time}
+
+
+def benchmark_open(size: int, repeat: int) -> Dict[str, Any]:
+    nodes_count, edges = GRAPH_GENERATORS['random'](size)
+    layers = [InputLayer() if node == 0 else DenseLayer() for node in range(nodes_count)]
+    for node, layer in enumerate(layers):
+        layer.object_name = 'layer_{}'.format(node)
+    positions = [
+        ((node % GRID_COLUMNS) * GRID_SPACING[0], (node // GRID_COLUMNS) * GRID_SPACING[1])
+        for node in range(nodes_count)
+    ]
+    data = diagram_file_utils.encode_diagram(
+        diagram_file_utils.Diagram('Keras', layers, positions, edges),
+        is_binary=True,
+    )
+
+    stages_times = [open_diagram(data) for _ in range(repeat)]
+    return {
+        'size': size,
+        'edges_count': len(edges),
+        'stages': {
+            stage_name: min(stage_times[stage_name] for stage_times in stages_times)
+            for stage_name in stages_times[0]
+        },
+    }
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Times the diagram view rendering settings on large scenes.')
+    parser.add_argument('--settings', nargs='+', choices=list(SETTINGS_VARIANTS), default=list(SETTINGS_VARIANTS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per stage, the best is kept.')
+    parser.add_argument('--output', help='Path of the JSON results file, the standard output if omitted.')
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = create_parser().parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'benchmarks': [
+            benchmark_settings(settings_name, size, args.repeat)
+            for settings_name in args.settings
+            for size in args.sizes
+        ],
+        'remove_benchmarks': [benchmark_remove(size, args.repeat) for size in args.sizes],
+        'open_benchmarks': [benchmark_open(size, args.repeat) for size in args.sizes],
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,3 +4,4 @@ pyrcc5 src/resources.qrc -o src/resources_rc.py
 # designs
 pyuic5 src/frameworks/Keras/designs/dense_layer.ui -o src/frameworks/Keras/designs/dense_layer_ui.py
 pyuic5 src/frameworks/Keras/designs/input_layer.ui -o src/frameworks/Keras/designs/input_layer_ui.py
+pyuic5 src/frameworks/Keras/designs/block_layer.ui -o src/frameworks/Keras/designs/block_layer_ui.py
@@ -0,0 +1,78 @@
+# Below this level of detail, items are drawn as plain shapes without labels or arrow heads.
+# The level of detail is the painter's scale, so 0.75 keeps the full details down to the 75% zoom.
+DIAGRAM_LOW_DETAIL_LEVEL = 0.75
+
+# Depth of the scene's BSP tree item index, 0 lets Qt choose it from the number of items.
+DIAGRAM_SCENE_BSP_TREE_DEPTH = 0
+
+# Dragging at least this number of selected items drops the scene's item index until the drag ends, 0 never drops it.
+# Disabled by default: rebuilding the BSP tree after the drag makes the following item lookups slower, and the drag
+# itself is dominated by the arrow updates, see benchmarks/view_benchmark.py.
+DIAGRAM_BULK_MOVE_ITEMS_COUNT = 0
+
+# Space added around an item that grows the scene rect, so the view can scroll past the diagram's edge.
+DIAGRAM_SCENE_GROWTH_MARGIN = 500
+
+# Side of the square cells of the diagram items spatial index, about the size of a layer item.
+DIAGRAM_SPATIAL_INDEX_CELL_SIZE = 256
+
+# A connection dropped within this distance of an item snaps to it.
+DIAGRAM_CONNECTION_SNAP_RADIUS = 20
+
+# Margin around a diagram item's polygon, wider than any pen, items further apart than it are known not to collide.
+DIAGRAM_ITEM_COLLISION_MARGIN = 10.0
+
+# Removing at least this number of items and arrows at once drops the scene's item index until they are all removed.
+DIAGRAM_BULK_REMOVE_ITEMS_COUNT = 1000
+
+# Adding at least this number of items and arrows at once, like opening a diagram, drops the item index until then.
+DIAGRAM_BULK_ADD_ITEMS_COUNT = 1000
+
+# Removing at least this number of items and arrows at once takes all of them out of the scene and adds back the rest.
+DIAGRAM_REBUILD_REMOVE_ITEMS_COUNT = 10000
+
+# Adding at least this number of arrows at once computes the topological order of the whole graph once, instead of
+# reordering the nodes between the ends of every arrow, which can cover most of the graph for each of them.
+DIAGRAM_BATCH_ORDER_ARROWS_COUNT = 64
+
+# Pasted and duplicated items are placed this far right and below the copied items, once more for every paste.
+DIAGRAM_PASTE_OFFSET = 40
+
+# Arrows are drawn behind all the diagram items.
+DIAGRAM_ARROW_Z_VALUE = -1000.0
+
+# Diagram items' z-values are kept within this distance of 0, so they never reach the arrows' z-value.
+DIAGRAM_ITEM_Z_VALUE_LIMIT = 900.0
+
+# Layer names become attributes of the exported model class or arguments of its call method, so they can not be
+# any of its own names, see frameworks/Keras/template.py.
+DIAGRAM_RESERVED_LAYER_NAMES = frozenset((
+    'self', 'training', 'tf', 'model', 'Talzeeq', 'call', 'build', 'compile', 'fit', 'evaluate', 'predict',
+    'summary', 'save', 'name', 'layers', 'inputs', 'outputs', 'weights', 'variables', 'trainable', 'losses',
+    'metrics', 'optimizer',
+))
+
+# Every layer also defines a "<name>_output" attribute, so names with this suffix could clash with another layer.
+DIAGRAM_LAYER_OUTPUT_NAME_SUFFIX = '_output'
+
+# Memory the undo history may hold, in bytes, the oldest commands are dropped past it.
+DIAGRAM_UNDO_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Estimated memory of the items, arrows and item positions held by undo commands, in bytes, measured on a scene of
+# 20k items and arrows.
+DIAGRAM_UNDO_ITEM_COST = 4096
+DIAGRAM_UNDO_ARROW_COST = 2048
+DIAGRAM_UNDO_POSITION_COST = 48
+DIAGRAM_UNDO_COMMAND_COST = 512
+
+# Moves of the same items pushed within this number of seconds of each other are undone at once.
+DIAGRAM_UNDO_MOVE_MERGE_INTERVAL = 0.5
+
+# The diagram journal is synced to the disk at most once per this number of seconds, see utils/diagram_journal.py.
+DIAGRAM_JOURNAL_FSYNC_INTERVAL = 1.0
+
+# Maximum number of records the journal writer encodes and writes at once.
+DIAGRAM_JOURNAL_BATCH_RECORDS_COUNT = 1000
+
+# The diagram journal is compacted once it grows past this size in bytes and twice the size of its diagram.
+DIAGRAM_JOURNAL_COMPACT_SIZE = 4 * 1024 * 1024
@@ -2,10 +2,24 @@ MAIN_WINDOW_TITLE = 'Talzeeq'
 
 FILE_MENU_NAME = '&File'
 
+OPEN_ACTION_NAME = 'open'
+
+SAVE_ACTION_NAME = 'save'
+
 EXPORT_ACTION_NAME = 'export'
 
 EDIT_MENU_NAME = '&Edit'
 
+UNDO_ACTION_NAME = 'undo'
+
+REDO_ACTION_NAME = 'redo'
+
+COPY_ACTION_NAME = 'copy'
+
+PASTE_ACTION_NAME = 'paste'
+
+DUPLICATE_ACTION_NAME = 'duplicate'
+
 DELETE_ACTON_NAME = 'delete'
 
 TO_FRONT_ACTION_NAME = 'to_front'
@@ -39,3 +53,59 @@ MODEL_GRAPH_MULTIPLE_COMPONENTS_ERROR_MSG = 'Your model\'s graph has more than o
 MODEL_GRAPH_CYCLE_ERROR_MSG = 'Your model\'s graph has one or more cycles.\nMake sure to solve this problem by remove any cycle in your graph.'
 
 MODEL_GRAPH_ROOT_NODE_IS_NOT_INPUT_ERROR_MSG = 'Your model\'s graph has one or more root nodes that are not input layers.\nMake sure to solve this problem by changing all root nodes to input layers.'
+
+MODEL_GRAPH_LAYER_NAME_MISSING_ERROR_MSG = 'Your model\'s graph has one or more layers without a name.\nMake sure to name every layer.'
+
+MODEL_GRAPH_BLOCK_FILE_ERROR_MSG = 'The block diagram file "{}" can not be loaded or its graph is not valid.\nMake sure the file exists and its graph can be exported on its own.'
+
+MODEL_GRAPH_BLOCK_OUTPUTS_ERROR_MSG = 'The block diagram file "{}" must have exactly one output layer.\nMake sure all the layers of the block lead to one layer that is not an input layer.'
+
+MODEL_GRAPH_BLOCK_RECURSION_ERROR_MSG = 'The block diagram file "{}" includes itself.\nMake sure the blocks inside a block do not reference any of its containing blocks.'
+
+MODEL_GRAPH_BLOCK_INPUTS_ERROR_MSG = 'The block layer "{}" is connected to {} layers, but its block has {} input layers.\nMake sure to connect every block layer to as many layers as its block inputs.'
+
+MODEL_GRAPH_VALID_STATUS_MSG = 'Model graph is valid.'
+
+MODEL_GRAPH_EMPTY_ERROR_MSG = 'Your model\'s graph has no layers.\nMake sure to add at least one input layer to your graph.'
+
+DIAGRAM_FILE_ERROR_MSG_TITLE = 'Diagram File Error'
+
+DIAGRAM_FILE_ERROR_MSG_TEXT = 'Error while opening the diagram file!'
+
+LAYER_NAME_ERROR_MSG_TITLE = 'Layer Name Error'
+
+LAYER_NAME_ERROR_MSG_TEXT = 'The layer name was not changed!'
+
+LAYER_NAME_INVALID_ERROR_MSG = 'The layer name "{}" is not a valid Python identifier.\nMake sure it only has letters, digits and underscores and does not start with a digit.'
+
+LAYER_NAME_RESERVED_ERROR_MSG = 'The layer name "{}" is reserved by Python or by the exported model.\nMake sure to choose another name.'
+
+LAYER_NAME_TAKEN_ERROR_MSG = 'The layer name "{}" is already used by another layer.\nMake sure every layer has a unique name.'
+
+LAYER_NAME_EXPANDED_TAKEN_ERROR_MSG = 'The layer name "{}" of a block\'s inner layer is already used by another layer.\nMake sure to rename the block layer or the other layer.'
+
+DIAGRAM_JOURNAL_DIR_NAME = '.talzeeq'
+
+# Every running instance writes its own journal, named by its process id and start time, next to a lock file held
+# while it runs, see utils/diagram_journal.py.
+DIAGRAM_JOURNAL_FILE_NAME = 'journal-{}.jsonl'
+
+DIAGRAM_JOURNAL_LOCK_FILE_SUFFIX = '.lock'
+
+# A journal that can not be recovered is renamed with this suffix, so it is kept but not recovered again.
+DIAGRAM_JOURNAL_BAD_FILE_SUFFIX = '.bad'
+
+# The model code is written to a temporary file with this suffix, then it replaces the output file.
+EXPORT_TEMPORARY_FILE_SUFFIX = '.tmp'
+
+DIAGRAM_JOURNAL_RECOVERED_STATUS_MSG = 'Recovered the unsaved diagram of the last session.'
+
+DIAGRAM_JOURNAL_NOT_RECOVERED_STATUS_MSG = 'The unsaved diagram of the last session could not be recovered, its journal was kept in {}.'
+
+DIAGRAM_JOURNAL_ERROR_STATUS_MSG = 'Crash recovery is off: {}'
+
+DIAGRAM_MIME_TYPE = 'application/x-talzeeq-diagram'
+
+DIAGRAM_FILE_DEFAULT_NAME = 'talzeeq.tlz'
+
+DIAGRAM_FILE_FILTERS = 'Talzeeq Diagram (*.tlz);;Talzeeq Binary Diagram (*.tlzb);;All files (*.*)'
@@ -0,0 +1,190 @@
+# Built-in imports.
+from typing import List, Union
+
+# Third-party package imports.
+from PyQt5.QtGui import QPolygonF
+from PyQt5.QtWidgets import QDialog, QFileDialog
+
+# First-party package imports.
+from utils import export_utils
+from frameworks import block_definitions
+from frameworks import layer_dialogs_pool
+from constants import main_window_constants
+from frameworks.layer_interface import LayerInterface
+
+
+class BlockLayer(LayerInterface):
+    """Layer referencing a saved diagram, it is expanded to the diagram's layers only when the model is exported.
+
+    The block's parents replace the input layers of its diagram, both ordered by layer name, and the diagram's
+    output layer takes the block's name, see frameworks/block_definitions.py.
+    """
+
+    LAYER_DISPLAY_NAME = 'Block Layer'
+    LAYER_NAME_PREFIX  = 'block'
+
+    LAYER_PARAMETERS = ('object_name', 'block_file_path')
+
+    def __init__(self):
+        # Named by the scene's DiagramNameAllocator when the layer is placed.
+        self.object_name     = None
+        self.block_file_path = ''
+
+        # Block definition checked by the last layer_graph_error call, the model is written using it.
+        self.block_definition = None
+
+        # Expanded layers of the last block definition and name, reused by the layer definition and connections.
+        self.expanded_block_key = None
+        self.expanded_layers    = None
+
+    def layer_name(self) -> str:
+        return self.LAYER_DISPLAY_NAME
+
+    def layer_image(self) -> QPolygonF:
+        return self.BASIC_LAYER_IMAGE
+
+    def layer_graph_error(
+        self,
+        parents: List[LayerInterface],
+        diagram_dir_path: Union[str, None] = None,
+    ) -> Union[str, None]:
+        self.block_definition = None
+        try:
+            block_definition = block_definitions.get_block_definition(self.block_file_path, diagram_dir_path)
+        except ValueError as error:
+            return str(error)
+
+        if len(parents) != block_definition.get_inputs_count():
+            return main_window_constants.MODEL_GRAPH_BLOCK_INPUTS_ERROR_MSG.format(
+                self.object_name,
+                len(parents),
+                block_definition.get_inputs_count(),
+            )
+
+        self.block_definition = block_definition
+        return None
+
+    def layer_names_suffixes(self, diagram_dir_path: Union[str, None] = None) -> List[str]:
+        # A block that can not be loaded takes no other names, its error is reported by layer_graph_error.
+        try:
+            block_definition = block_definitions.get_block_definition(self.block_file_path, diagram_dir_path)
+        except ValueError:
+            return []
+
+        return block_definition.get_names_suffixes()
+
+    def layer_definition(self) -> str:
+        block_definition = self.get_block_definition()
+        layers = self.get_expanded_layers(block_definition)
+
+        return '\n'.join(
+            layers[node].layer_definition()
+            for node in block_definition.topological_sort
+            if node not in block_definition.inputs_indices
+        )
+
+    def layer_connections(self, parents: List[LayerInterface], is_root: List[bool]) -> str:
+        block_definition = self.get_block_definition()
+        if len(parents) != block_definition.get_inputs_count():
+            raise export_utils.ModelGraphError(main_window_constants.MODEL_GRAPH_BLOCK_INPUTS_ERROR_MSG.format(
+                self.object_name,
+                len(parents),
+                block_definition.get_inputs_count(),
+            ))
+
+        # The parents come in the model graph's node order, which changes when unrelated nodes are removed.
+        parents_order = sorted(range(len(parents)), key=lambda index: parents[index].object_name)
+        parents = [parents[index] for index in parents_order]
+        is_root = [is_root[index] for index in parents_order]
+
+        layers = self.get_expanded_layers(block_definition)
+        inputs_indices = block_definition.inputs_indices
+
+        layer_connections = list()
+        for node in block_definition.topological_sort:
+            if node in inputs_indices:
+                continue
+
+            node_parents = list()
+            node_is_root = list()
+            for parent in block_definition.parents[node]:
+                input_index = inputs_indices.get(parent)
+                if input_index is None:
+                    node_parents.append(layers[parent])
+                    node_is_root.append(False)
+                else:
+                    node_parents.append(parents[input_index])
+                    node_is_root.append(is_root[input_index])
+
+            node_connections = layers[node].layer_connections(node_parents, node_is_root)
+            if node_connections:
+                layer_connections.append(node_connections)
+
+        return '\n'.join(layer_connections)
+
+    def get_block_definition(self) -> block_definitions.BlockDefinition:
+        """Returns the block definition checked with the model graph, so the block files are not read again.
+
+        A layer that was not checked resolves a relative block file path against the current directory.
+
+        Raises:
+            ModelGraphError: If the layer was not checked and its block definition can not be loaded.
+        """
+
+        if self.block_definition is not None:
+            return self.block_definition
+
+        try:
+            return block_definitions.get_block_definition(self.block_file_path)
+        except ValueError as error:
+            raise export_utils.ModelGraphError(str(error))
+
+    def get_expanded_layers(self, block_definition: block_definitions.BlockDefinition) -> List[LayerInterface]:
+        expanded_block_key = (block_definition, self.object_name)
+        if self.expanded_block_key != expanded_block_key:
+            self.expanded_layers = block_definition.expand_layers(self.object_name)
+            self.expanded_block_key = expanded_block_key
+        return self.expanded_layers
+
+    def layer_config_dialog(self) -> bool:
+        dialog = layer_dialogs_pool.get_layer_dialog(BlockLayerDialog)
+        ui = dialog.ui
+
+        ui.objectNameLineEdit.setText(self.object_name)
+        ui.blockFilePathLineEdit.setText(self.block_file_path)
+
+        if dialog.exec_() != QDialog.Accepted:
+            return False
+
+        self.layer_dialog_accept(dialog)
+        return True
+
+    def layer_dialog_accept(self, dialog: QDialog):
+        ui = dialog.ui
+
+        self.object_name = ui.objectNameLineEdit.text()
+        self.block_file_path = ui.blockFilePathLineEdit.text()
+        self.block_definition = None
+
+
+class BlockLayerDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # The compiled dialog is only imported when the dialog is first opened.
+        from frameworks.Keras.designs.block_layer_ui import Ui_BlockLayer
+
+        self.ui = Ui_BlockLayer()
+        self.ui.setupUi(self)
+        self.ui.blockFilePathPushButton.clicked.connect(self.browse_block_file)
+
+    def browse_block_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            'Open Block Diagram',
+            self.ui.blockFilePathLineEdit.text(),
+            main_window_constants.DIAGRAM_FILE_FILTERS,
+        )
+
+        if file_path:
+            self.ui.blockFilePathLineEdit.setText(file_path)
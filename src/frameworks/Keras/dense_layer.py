@@ -4,22 +4,25 @@ from typing import List
 # Third-party package imports.
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPolygonF
-from PyQt5.QtWidgets import QDialog, QDialogButtonBox
-from coolname import generate_slug
+from PyQt5.QtWidgets import QDialog
 
 # First-party package imports.
+from frameworks import layer_dialogs_pool
 from frameworks.layer_interface import LayerInterface
-from frameworks.Keras.designs.dense_layer_ui import Ui_DenseLayer
 
 
 class DenseLayer(LayerInterface):
     LAYER_DISPLAY_NAME                 = 'Dense Layer'
+    LAYER_NAME_PREFIX                  = 'dense'
     LAYER_DEFINITION                   = '    self.{} = tf.keras.layers.Dense(units={}, activation=\'{}\', use_bias={})'
     ROOT_LAYER_CONNECTION_TEMPLATE     = '    self.{}_output = self.{}({})'
     NON_ROOT_LAYER_CONNECTION_TEMPLATE = '    self.{}_output = self.{}(self.{}_output)'
 
+    LAYER_PARAMETERS = ('object_name', 'units', 'activation', 'use_bias')
+
     def __init__(self):
-        self.object_name = generate_slug(2).replace('-', '_')
+        # Named by the scene's DiagramNameAllocator when the layer is placed.
+        self.object_name = None
         self.units       = 32
         self.activation  = 'linear'
         self.use_bias    = False
@@ -57,11 +60,9 @@ class DenseLayer(LayerInterface):
 
         return '\n'.join(layer_connections)
 
-    def layer_config_dialog(self):
-        self.dense_layer_dialog = DenseLayerDialog()
-        ui = self.dense_layer_dialog.ui
-
-        ui.buttonBox.button(QDialogButtonBox.Ok).clicked.connect(self.layer_dialog_accept)
+    def layer_config_dialog(self) -> bool:
+        dialog = layer_dialogs_pool.get_layer_dialog(DenseLayerDialog)
+        ui = dialog.ui
 
         ui.objectNameLineEdit.setText(self.object_name)
 
@@ -72,10 +73,14 @@ class DenseLayer(LayerInterface):
 
         ui.useBiasCheckBox.setChecked(self.use_bias)
 
-        self.dense_layer_dialog.exec_()
+        if dialog.exec_() != QDialog.Accepted:
+            return False
+
+        self.layer_dialog_accept(dialog)
+        return True
 
-    def layer_dialog_accept(self):
-        ui = self.dense_layer_dialog.ui
+    def layer_dialog_accept(self, dialog: QDialog):
+        ui = dialog.ui
 
         self.object_name = ui.objectNameLineEdit.text()
         self.units = ui.unitsSpinBox.value()
@@ -86,5 +91,9 @@ class DenseLayer(LayerInterface):
 class DenseLayerDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
+
+        # The compiled dialog is only imported when the dialog is first opened.
+        from frameworks.Keras.designs.dense_layer_ui import Ui_DenseLayer
+
         self.ui = Ui_DenseLayer()
         self.ui.setupUi(self)
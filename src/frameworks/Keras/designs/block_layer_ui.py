@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'src/frameworks/Keras/designs/block_layer.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.2
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_BlockLayer(object):
+    def setupUi(self, BlockLayer):
+        BlockLayer.setObjectName("BlockLayer")
+        BlockLayer.resize(400, 104)
+        self.formLayout = QtWidgets.QFormLayout(BlockLayer)
+        self.formLayout.setObjectName("formLayout")
+        self.objectNameLabel = QtWidgets.QLabel(BlockLayer)
+        self.objectNameLabel.setObjectName("objectNameLabel")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.objectNameLabel)
+        self.objectNameLineEdit = QtWidgets.QLineEdit(BlockLayer)
+        self.objectNameLineEdit.setObjectName("objectNameLineEdit")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.objectNameLineEdit)
+        self.blockFilePathLabel = QtWidgets.QLabel(BlockLayer)
+        self.blockFilePathLabel.setObjectName("blockFilePathLabel")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.blockFilePathLabel)
+        self.blockFilePathLayout = QtWidgets.QHBoxLayout()
+        self.blockFilePathLayout.setObjectName("blockFilePathLayout")
+        self.blockFilePathLineEdit = QtWidgets.QLineEdit(BlockLayer)
+        self.blockFilePathLineEdit.setObjectName("blockFilePathLineEdit")
+        self.blockFilePathLayout.addWidget(self.blockFilePathLineEdit)
+        self.blockFilePathPushButton = QtWidgets.QPushButton(BlockLayer)
+        self.blockFilePathPushButton.setObjectName("blockFilePathPushButton")
+        self.blockFilePathLayout.addWidget(self.blockFilePathPushButton)
+        self.formLayout.setLayout(1, QtWidgets.QFormLayout.FieldRole, self.blockFilePathLayout)
+        self.buttonBox = QtWidgets.QDialogButtonBox(BlockLayer)
+        self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
+        self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
+        self.buttonBox.setObjectName("buttonBox")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.SpanningRole, self.buttonBox)
+
+        self.retranslateUi(BlockLayer)
+        self.buttonBox.accepted.connect(BlockLayer.accept)
+        self.buttonBox.rejected.connect(BlockLayer.reject)
+        QtCore.QMetaObject.connectSlotsByName(BlockLayer)
+
+    def retranslateUi(self, BlockLayer):
+        _translate = QtCore.QCoreApplication.translate
+        BlockLayer.setWindowTitle(_translate("BlockLayer", "Block Layer"))
+        self.objectNameLabel.setText(_translate("BlockLayer", "Object Name"))
+        self.blockFilePathLabel.setText(_translate("BlockLayer", "Block File"))
+        self.blockFilePathPushButton.setText(_translate("BlockLayer", "Browse..."))
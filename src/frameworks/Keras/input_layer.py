@@ -3,12 +3,11 @@ from typing import List
 
 # Third-party package imports.
 from PyQt5.QtGui import QPolygonF
-from PyQt5.QtWidgets import QDialog, QDialogButtonBox
-from coolname import generate_slug
+from PyQt5.QtWidgets import QDialog
 
 # First-party package imports.
+from frameworks import layer_dialogs_pool
 from frameworks.layer_interface import LayerInterface
-from frameworks.Keras.designs.input_layer_ui import Ui_InputLayer
 
 
 class InputLayer(LayerInterface):
@@ -16,8 +15,11 @@ class InputLayer(LayerInterface):
 
     LAYER_DISPLAY_NAME = 'Input Layer'
 
+    LAYER_NAME_PREFIX = 'input'
+
     def __init__(self):
-        self.object_name = generate_slug(2).replace('-', '_')
+        # Named by the scene's DiagramNameAllocator when the layer is placed.
+        self.object_name = None
 
     def layer_name(self) -> str:
         return self.LAYER_DISPLAY_NAME
@@ -31,18 +33,20 @@ class InputLayer(LayerInterface):
     def layer_connections(self, parents: List[LayerInterface], is_root: List[bool]) -> str:
         pass
 
-    def layer_config_dialog(self):
-        self.dense_layer_dialog = InputLayerDialog()
-        ui = self.dense_layer_dialog.ui
-
-        ui.buttonBox.button(QDialogButtonBox.Ok).clicked.connect(self.layer_dialog_accept)
+    def layer_config_dialog(self) -> bool:
+        dialog = layer_dialogs_pool.get_layer_dialog(InputLayerDialog)
+        ui = dialog.ui
 
         ui.objectNameLineEdit.setText(self.object_name)
 
-        self.dense_layer_dialog.exec_()
+        if dialog.exec_() != QDialog.Accepted:
+            return False
+
+        self.layer_dialog_accept(dialog)
+        return True
 
-    def layer_dialog_accept(self):
-        ui = self.dense_layer_dialog.ui
+    def layer_dialog_accept(self, dialog: QDialog):
+        ui = dialog.ui
 
         self.object_name = ui.objectNameLineEdit.text()
 
@@ -50,5 +54,9 @@ class InputLayer(LayerInterface):
 class InputLayerDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
+
+        # The compiled dialog is only imported when the dialog is first opened.
+        from frameworks.Keras.designs.input_layer_ui import Ui_InputLayer
+
         self.ui = Ui_InputLayer()
         self.ui.setupUi(self)
@@ -0,0 +1,204 @@
+"""Block definitions, the sub-diagrams referenced by block layers, loaded once per diagram file.
+
+A block layer renders as one node in the editor and is only expanded to the layers of its sub-diagram when the
+model code is generated. The sub-diagram is loaded and evaluated once per file and reused by every block layer
+referencing it, until the file or any block file nested in it is modified.
+
+A relative block file path is resolved against the directory of the diagram file containing the block layer, so
+a diagram and its blocks can be moved together, and the block layers of a sub-diagram resolve theirs against the
+sub-diagram's directory.
+
+Available methods:
+- get_block_definition.
+- clear_block_definitions.
+"""
+
+
+# Built-in imports.
+import copy
+import os
+
+from typing import Dict, List, Union
+
+# First-party package imports.
+from utils import diagram_file_utils
+from utils import export_utils
+from utils import graph_utils
+from constants import main_window_constants
+from frameworks.layer_interface import LayerInterface
+
+
+block_definitions = dict()
+
+# Files being loaded, in nesting order, a block referencing itself through its own sub-diagram would be loaded
+# forever. Every loading file collects the modification times of the block files nested in it.
+loading_file_paths = list()
+loading_files_modification_times = list()
+
+
+class BlockDefinition(object):
+    """Class to hold the evaluated sub-diagram of a block.
+
+    The sub-diagram's input layers are replaced by the block's parents, both ordered by layer name, so the parent
+    whose name comes first feeds the input layer whose name comes first, whatever the nodes' order in the diagrams.
+    Its only leaf layer is the block's output.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        files_modification_times: Dict[str, float],
+        layers: List[LayerInterface],
+        graph_evaluation: graph_utils.GraphEvaluation,
+        output_node: int,
+    ):
+        self.file_path = file_path
+        # Modification times of the block's file and of every block file nested in it, at any depth.
+        self.files_modification_times = files_modification_times
+        self.layers = layers
+        self.parents = graph_evaluation.parents
+        self.topological_sort = graph_evaluation.topological_sort
+        self.input_nodes = sorted(graph_evaluation.root_nodes, key=lambda node: layers[node].object_name)
+        self.inputs_indices = {node: index for index, node in enumerate(self.input_nodes)}
+        self.output_node = output_node
+        self.names_suffixes = None
+
+    def get_inputs_count(self) -> int:
+        return len(self.input_nodes)
+
+    def is_modified(self) -> bool:
+        """Checks whether the block's file or any block file nested in it was modified or removed since loading."""
+
+        for file_path, modification_time in self.files_modification_times.items():
+            try:
+                if os.path.getmtime(file_path) != modification_time:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def get_names_suffixes(self) -> List[str]:
+        """Returns the suffixes of the names the block's inner layers take after expand_layers, see expand_layers.
+
+        The output layer takes the block's name itself, so only the names nested in it add suffixes.
+        """
+
+        if self.names_suffixes is None:
+            diagram_dir_path = os.path.dirname(self.file_path)
+            self.names_suffixes = list()
+            for node in self.topological_sort:
+                if node in self.inputs_indices:
+                    continue
+
+                layer = self.layers[node]
+                layer_names_suffixes = layer.layer_names_suffixes(diagram_dir_path)
+                if node == self.output_node:
+                    self.names_suffixes.extend(layer_names_suffixes)
+                else:
+                    self.names_suffixes.append(layer.object_name)
+                    self.names_suffixes.extend(
+                        '{}_{}'.format(layer.object_name, suffix)
+                        for suffix in layer_names_suffixes
+                    )
+        return self.names_suffixes
+
+    def expand_layers(self, block_name: str) -> List[LayerInterface]:
+        """Copies the sub-diagram's layers renamed for the block with the given name.
+
+        The output layer takes the block's name, so the following layers read the block's output, and the other
+        layers are prefixed by it.
+
+        Args:
+            block_name: String represents the object name of the block layer.
+
+        Returns:
+            List of the renamed layers in the sub-diagram's order, the input layers are not copied.
+        """
+
+        layers = list(self.layers)
+        for node in self.topological_sort:
+            if node in self.inputs_indices:
+                continue
+
+            layer = layers[node] = copy.copy(self.layers[node])
+            if node == self.output_node:
+                layer.object_name = block_name
+            else:
+                layer.object_name = '{}_{}'.format(block_name, layer.object_name)
+        return layers
+
+
+def get_block_definition(file_path: str, diagram_dir_path: Union[str, None] = None) -> BlockDefinition:
+    """Returns the block definition of the given diagram file.
+
+    It is loaded again only if the file or any block file nested in it was modified, and a cached definition is
+    checked against the files being loaded as well, so a block can not include itself through a cached block.
+
+    Args:
+        file_path: String represents the path of the block's diagram file.
+        diagram_dir_path: String represents the directory of the diagram file containing the block layer, a
+            relative file path is resolved against it. The current directory is used if None.
+
+    Returns:
+        The BlockDefinition object.
+
+    Raises:
+        ValueError: If the diagram file can not be loaded or its model graph is not a valid block.
+    """
+
+    file_path = os.path.abspath(os.path.join(diagram_dir_path or '', file_path))
+
+    block_definition = block_definitions.get(file_path)
+    if block_definition is None or block_definition.is_modified():
+        block_definition = load_block_definition(file_path)
+        block_definitions[file_path] = block_definition
+
+    for nested_file_path in block_definition.files_modification_times:
+        if nested_file_path in loading_file_paths:
+            raise ValueError(main_window_constants.MODEL_GRAPH_BLOCK_RECURSION_ERROR_MSG.format(nested_file_path))
+
+    # The block containing this one, if it is being loaded, depends on the same files.
+    if loading_files_modification_times:
+        loading_files_modification_times[-1].update(block_definition.files_modification_times)
+    return block_definition
+
+
+def load_block_definition(file_path: str) -> BlockDefinition:
+    if file_path in loading_file_paths:
+        raise ValueError(main_window_constants.MODEL_GRAPH_BLOCK_RECURSION_ERROR_MSG.format(file_path))
+
+    # The modification time is read before the file, so a change while loading is seen by the next call.
+    try:
+        files_modification_times = {file_path: os.path.getmtime(file_path)}
+        diagram = diagram_file_utils.load_diagram(file_path)
+    except (OSError, ValueError, KeyError):
+        raise ValueError(main_window_constants.MODEL_GRAPH_BLOCK_FILE_ERROR_MSG.format(file_path))
+
+    # Evaluating the graph checks the nested block layers, which loads their block definitions.
+    graph = graph_utils.create_graph_from_edges(len(diagram.layers), diagram.edges)
+    loading_file_paths.append(file_path)
+    loading_files_modification_times.append(files_modification_times)
+    try:
+        graph_evaluation = export_utils.evaluate_model_graph(diagram.layers, graph, os.path.dirname(file_path))
+    except export_utils.ModelGraphError as error:
+        file_error_msg = main_window_constants.MODEL_GRAPH_BLOCK_FILE_ERROR_MSG.format(file_path)
+        raise ValueError('{}\n{}'.format(file_error_msg, error))
+    finally:
+        loading_file_paths.pop()
+        loading_files_modification_times.pop()
+
+    children_counts = [0] * len(diagram.layers)
+    for parents in graph_evaluation.parents:
+        for parent in parents:
+            children_counts[parent] += 1
+
+    # The output layer is the only leaf layer, and it can not be one of the inputs replaced by the block's parents.
+    output_nodes = [node for node, children_count in enumerate(children_counts) if children_count == 0]
+    if len(output_nodes) != 1 or diagram.layers[output_nodes[0]].IS_INPUT_LAYER:
+        raise ValueError(main_window_constants.MODEL_GRAPH_BLOCK_OUTPUTS_ERROR_MSG.format(file_path))
+
+    return BlockDefinition(file_path, files_modification_times, diagram.layers, graph_evaluation, output_nodes[0])
+
+
+def clear_block_definitions():
+    block_definitions.clear()
@@ -0,0 +1,34 @@
+"""Layer dialogs pool, every layer dialog class is created once and shared by all the layers using it.
+
+A layer fills the shared dialog with its own parameters every time it is opened, so opening a dialog does not
+build its widgets again and the layers do not keep a dialog each.
+"""
+
+
+# Third-party package imports.
+from PyQt5.QtWidgets import QDialog
+
+
+layer_dialogs = dict()
+
+
+def get_layer_dialog(dialog_class: type) -> QDialog:
+    """Returns the shared dialog of the given class, it is created on the first call.
+
+    Args:
+        dialog_class: QDialog subclass taking no required arguments.
+
+    Returns:
+        The shared dialog object.
+    """
+
+    dialog = layer_dialogs.get(dialog_class)
+    if dialog is None:
+        dialog = layer_dialogs[dialog_class] = dialog_class()
+    return dialog
+
+
+def clear_layer_dialogs():
+    for dialog in layer_dialogs.values():
+        dialog.deleteLater()
+    layer_dialogs.clear()
@@ -1,16 +1,22 @@
 # Built-in imports.
 import abc
 
-from typing import List
+from typing import Any, Dict, List, Union
 
 # Third-party package imports.
 from PyQt5.QtCore import QPointF
 from PyQt5.QtGui import QPolygonF
+from PyQt5.QtWidgets import QDialog
 
 
 class LayerInterface(object, metaclass=abc.ABCMeta):
     IS_INPUT_LAYER = False
 
+    LAYER_PARAMETERS = ('object_name',)
+
+    # Prefix of the layer names handed out by the scene, like layer_1 and layer_2.
+    LAYER_NAME_PREFIX = 'layer'
+
     BASIC_LAYER_IMAGE = QPolygonF([
         QPointF(-20, -20),
         QPointF(100, -20),
@@ -37,12 +43,53 @@ class LayerInterface(object, metaclass=abc.ABCMeta):
             NotImplemented
         )
 
+    def get_layer_parameters(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.LAYER_PARAMETERS}
+
+    def set_layer_parameters(self, layer_parameters: Dict[str, Any]):
+        for name in self.LAYER_PARAMETERS:
+            if name in layer_parameters:
+                setattr(self, name, layer_parameters[name])
+
+    def layer_graph_error(
+        self,
+        parents: List['LayerInterface'],
+        diagram_dir_path: Union[str, None] = None,
+    ) -> Union[str, None]:
+        """Checks the layer against its parents in the model graph, the graph rules are checked before it.
+
+        Args:
+            parents: List of the layers of the layer's parents.
+            diagram_dir_path: String represents the directory of the layer's diagram file, the relative file paths
+                of the layer are resolved against it. The current directory is used if None.
+
+        Returns:
+            If the layer can not be exported with the given parents, then the returned value is the error message.
+            None otherwise.
+        """
+
+        return None
+
+    def layer_names_suffixes(self, diagram_dir_path: Union[str, None] = None) -> List[str]:
+        """Returns the suffixes of the other names the layer takes in the model code, like a block's inner layers.
+
+        Every other name is the layer's name followed by an underscore and one of the suffixes, so these names have
+        to be free as well.
+
+        Args:
+            diagram_dir_path: String represents the directory of the layer's diagram file, see layer_graph_error.
+        """
+
+        return []
+
     @abc.abstractmethod
     def layer_name(self) -> str:
         raise NotImplementedError
 
     @abc.abstractmethod
     def layer_image(self) -> QPolygonF:
+        """Returns the polygon of the layer's diagram item, it is read once per layer class like the layer's name."""
+
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -54,9 +101,15 @@ class LayerInterface(object, metaclass=abc.ABCMeta):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def layer_config_dialog(self):
+    def layer_config_dialog(self) -> bool:
+        """Opens the layer's shared dialog from layer_dialogs_pool filled with the layer's parameters.
+
+        Returns:
+            Boolean indicates whether the dialog was accepted and the parameters were updated.
+        """
+
         raise NotImplementedError
 
     @abc.abstractmethod
-    def layer_dialog_accept(self):
+    def layer_dialog_accept(self, dialog: QDialog):
         raise NotImplementedError
@@ -1,13 +1,63 @@
-# First-party package imports.
-from frameworks.Keras.dense_layer import DenseLayer
-from frameworks.Keras.input_layer import InputLayer
+"""Layers registry, lists every framework's layers from its manifest file without importing them.
 
+Every framework directory has a manifest.json file listing its layers:
 
-keras_layers = [
-	InputLayer,
-	DenseLayer,
-]
+    {
+        "layers": [
+            {"name": "DenseLayer", "module": "frameworks.Keras.dense_layer", "display_name": "Dense Layer"}
+        ]
+    }
 
-layers_registry = {
-	'Keras': keras_layers,
-}
+A layer's module, and so its dialog, is only imported the first time its class is needed, when it is placed on
+the scene or loaded from a diagram file.
+"""
+
+
+# Built-in imports.
+import importlib
+import json
+import os
+
+from typing import Dict, List
+
+
+FRAMEWORKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FRAMEWORK_MANIFEST_FILE_NAME = 'manifest.json'
+
+
+class LayerEntry(object):
+    """Class to describe a framework layer from its manifest, its module is imported when its class is first needed."""
+
+    def __init__(self, name: str, module_name: str, display_name: str):
+        self.name = name
+        self.module_name = module_name
+        self.display_name = display_name
+        self.layer_class = None
+
+    def get_layer_class(self) -> type:
+        if self.layer_class is None:
+            self.layer_class = getattr(importlib.import_module(self.module_name), self.name)
+        return self.layer_class
+
+
+def load_layers_registry(frameworks_dir: str) -> Dict[str, List[LayerEntry]]:
+    layers_registry = dict()
+
+    for framework_name in sorted(os.listdir(frameworks_dir)):
+        manifest_path = os.path.join(frameworks_dir, framework_name, FRAMEWORK_MANIFEST_FILE_NAME)
+        if not os.path.isfile(manifest_path):
+            continue
+
+        with open(manifest_path, 'r') as fp:
+            manifest = json.load(fp)
+
+        layers_registry[framework_name] = [
+            LayerEntry(layer['name'], layer['module'], layer['display_name'])
+            for layer in manifest['layers']
+        ]
+
+    return layers_registry
+
+
+layers_registry = load_layers_registry(FRAMEWORKS_DIR)
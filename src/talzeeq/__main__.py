@@ -0,0 +1,125 @@
+"""Talzeeq command-line interface, exports saved diagrams without starting the Qt widgets.
+
+Usage:
+    python -m talzeeq export DIAGRAM [-o OUTPUT]
+    python -m talzeeq batch INPUT_DIR OUTPUT_DIR [-j JOBS] [-r]
+"""
+
+
+# Built-in imports.
+import argparse
+import os
+import sys
+import time
+
+from typing import List, Tuple
+
+# First-party package imports.
+from utils import diagram_file_utils
+from utils import export_utils
+
+
+def export_command(args: argparse.Namespace) -> int:
+    try:
+        diagram, graph_evaluation = export_utils.evaluate_diagram_file(args.diagram)
+
+        if args.output:
+            export_utils.write_model_file(args.output, diagram.framework_name, diagram.layers, graph_evaluation)
+        else:
+            export_utils.write_model(sys.stdout, diagram.framework_name, diagram.layers, graph_evaluation)
+    except export_utils.ModelGraphError as error:
+        return write_error('{}: {}'.format(args.diagram, error))
+    except (OSError, ValueError, KeyError, IndexError) as error:
+        return write_error('{}: {}: {}'.format(args.diagram, error.__class__.__name__, error))
+
+    return 0
+
+
+def write_error(error_msg: str) -> int:
+    """Writes the given error message to the standard error on one line, like the batch command's failures.
+
+    Returns:
+        Integer represents the exit status of a failed command.
+    """
+
+    sys.stderr.write('talzeeq: error: {}\n'.format(error_msg.replace('\n', ' ')))
+    return 1
+
+
+def batch_command(args: argparse.Namespace) -> int:
+    diagram_output_paths = find_diagram_output_paths(args.input_dir, args.output_dir, args.recursive)
+
+    start_time = time.perf_counter()
+    results = export_utils.batch_export_diagram_files(diagram_output_paths, args.jobs)
+    elapsed_time = time.perf_counter() - start_time
+
+    failures_count = 0
+    for result in results:
+        if result.is_succeeded():
+            sys.stdout.write('ok    {:8.3f}s  {}\n'.format(result.elapsed_time, result.diagram_path))
+        else:
+            failures_count += 1
+            error = result.error.replace('\n', ' ')
+            sys.stdout.write('FAIL  {:8.3f}s  {}: {}\n'.format(result.elapsed_time, result.diagram_path, error))
+
+    sys.stdout.write(
+        '\n{} diagram(s), {} exported, {} failed in {:.3f}s ({:.3f}s of export time across workers).\n'.format(
+            len(results),
+            len(results) - failures_count,
+            failures_count,
+            elapsed_time,
+            sum(result.elapsed_time for result in results),
+        ),
+    )
+
+    return 1 if failures_count else 0
+
+
+def find_diagram_output_paths(input_dir: str, output_dir: str, is_recursive: bool) -> List[Tuple[str, str]]:
+    diagram_output_paths = list()
+
+    for dir_path, dir_names, file_names in os.walk(input_dir):
+        if not is_recursive:
+            dir_names.clear()
+        dir_names.sort()
+
+        for file_name in sorted(file_names):
+            file_stem, file_extension = os.path.splitext(file_name)
+            if file_extension not in diagram_file_utils.DIAGRAM_FILE_EXTENSIONS:
+                continue
+
+            relative_dir = os.path.relpath(dir_path, input_dir)
+            diagram_output_paths.append((
+                os.path.join(dir_path, file_name),
+                os.path.normpath(os.path.join(output_dir, relative_dir, file_stem + '.py')),
+            ))
+
+    return diagram_output_paths
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='talzeeq', description='Talzeeq command-line interface.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Export a saved diagram to model code.')
+    export_parser.add_argument('diagram', help='Path of the diagram file.')
+    export_parser.add_argument('-o', '--output', help='Path of the output file, the standard output if omitted.')
+    export_parser.set_defaults(command_function=export_command)
+
+    batch_parser = subparsers.add_parser('batch', help='Export all saved diagrams in a directory in parallel.')
+    batch_parser.add_argument('input_dir', help='Directory of the diagram files.')
+    batch_parser.add_argument('output_dir', help='Directory of the output files.')
+    batch_parser.add_argument('-j', '--jobs', type=int, help='Number of worker processes, one per core if omitted.')
+    batch_parser.add_argument('-r', '--recursive', action='store_true', help='Look for diagrams in sub-directories.')
+    batch_parser.set_defaults(command_function=batch_command)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = create_parser().parse_args(argv)
+    return args.command_function(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
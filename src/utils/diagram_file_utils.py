@@ -0,0 +1,296 @@
+"""Diagram file utils file to save and load diagrams without the Qt scene.
+
+Diagrams are stored column by column: a table of the used layer classes and their parameter names, then flat
+arrays of layer class ids, positions, parameter values and edges. Two encodings are available, JSON (.tlz) and
+binary (.tlzb) where the numeric arrays are stored as raw little-endian 4 bytes integers and 8 bytes doubles.
+
+Available methods:
+- save_diagram.
+- load_diagram.
+- encode_diagram.
+- decode_diagram.
+"""
+
+
+# Built-in imports.
+import array
+import json
+import struct
+import sys
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+# First-party package imports.
+from utils import frameworks_utils
+from frameworks.layer_interface import LayerInterface
+
+
+DIAGRAM_FILE_VERSION = 2
+
+DIAGRAM_FILE_EXTENSION = '.tlz'
+
+DIAGRAM_BINARY_FILE_EXTENSION = '.tlzb'
+
+DIAGRAM_FILE_EXTENSIONS = (DIAGRAM_FILE_EXTENSION, DIAGRAM_BINARY_FILE_EXTENSION)
+
+DIAGRAM_BINARY_MAGIC = b'TLZB'
+
+# Magic, version, header length, nodes count and edges count.
+DIAGRAM_BINARY_PREFIX = struct.Struct('<4sHIII')
+
+# The item sizes of the array typecodes depend on the platform, the binary columns are always 4 bytes unsigned
+# integers and 8 bytes doubles, so the files are the same on every platform.
+DIAGRAM_BINARY_UINT32_TYPECODE = next(typecode for typecode in 'IL' if array.array(typecode).itemsize == 4)
+DIAGRAM_BINARY_DOUBLE_TYPECODE = 'd'
+
+
+class Diagram(object):
+    """Class to hold a diagram's layers, positions and edges independently of the Qt scene."""
+
+    def __init__(
+        self,
+        framework_name: str,
+        layers: List[LayerInterface],
+        positions: List[Tuple[float, float]],
+        edges: List[Tuple[int, int]],
+    ):
+        self.framework_name = framework_name
+        self.layers = layers
+        self.positions = positions
+        self.edges = edges
+
+
+def save_diagram(file_path: str, diagram: Diagram):
+    """Saves the given diagram to the given file path, the encoding is chosen by the file extension.
+
+    Args:
+        file_path: String represents the path of the diagram file.
+        diagram: Diagram object to be saved.
+    """
+
+    with open(file_path, 'wb') as fp:
+        fp.write(encode_diagram(diagram, is_binary=file_path.endswith(DIAGRAM_BINARY_FILE_EXTENSION)))
+
+
+def load_diagram(file_path: str) -> Diagram:
+    """Loads the diagram saved in the given file path, the encoding is detected from the file content.
+
+    Args:
+        file_path: String represents the path of the diagram file.
+
+    Returns:
+        The loaded Diagram object.
+
+    Raises:
+        ValueError: If the diagram file is corrupted or its version is not supported.
+        KeyError: If the diagram references an unknown framework or layer.
+    """
+
+    with open(file_path, 'rb') as fp:
+        return decode_diagram(fp.read())
+
+
+def encode_diagram(diagram: Diagram, is_binary: bool = False) -> bytes:
+    """Encodes the given diagram using the latest diagram file version.
+
+    Args:
+        diagram: Diagram object to be encoded.
+        is_binary: Boolean indicates whether to use the binary or the JSON encoding.
+
+    Returns:
+        Bytes represent the encoded diagram.
+    """
+
+    layer_classes = dict()
+    layer_class_ids = list()
+    layers_parameters = list()
+    for layer in diagram.layers:
+        layer_class = layer.__class__
+        if layer_class not in layer_classes:
+            layer_classes[layer_class] = len(layer_classes)
+        layer_class_ids.append(layer_classes[layer_class])
+        layers_parameters.append([getattr(layer, name) for name in layer_class.LAYER_PARAMETERS])
+
+    header = {
+        'version': DIAGRAM_FILE_VERSION,
+        'framework': diagram.framework_name,
+        'layers': [
+            {'name': layer_class.__name__, 'parameters': list(layer_class.LAYER_PARAMETERS)}
+            for layer_class in layer_classes
+        ],
+        'parameters': layers_parameters,
+    }
+
+    positions = [coordinate for position in diagram.positions for coordinate in position]
+    edges = [node for edge in diagram.edges for node in edge]
+
+    if not is_binary:
+        header['nodes'] = layer_class_ids
+        header['positions'] = positions
+        header['edges'] = edges
+        return json.dumps(header, separators=(',', ':')).encode('utf-8')
+
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return b''.join([
+        DIAGRAM_BINARY_PREFIX.pack(
+            DIAGRAM_BINARY_MAGIC,
+            DIAGRAM_FILE_VERSION,
+            len(header_bytes),
+            len(diagram.layers),
+            len(diagram.edges),
+        ),
+        header_bytes,
+        encode_array(DIAGRAM_BINARY_UINT32_TYPECODE, layer_class_ids),
+        encode_array(DIAGRAM_BINARY_DOUBLE_TYPECODE, positions),
+        encode_array(DIAGRAM_BINARY_UINT32_TYPECODE, edges),
+    ])
+
+
+def decode_diagram(data: bytes) -> Diagram:
+    """Decodes the given diagram bytes, either JSON or binary and of any supported diagram file version.
+
+    Args:
+        data: Bytes represent the encoded diagram.
+
+    Returns:
+        The decoded Diagram object.
+
+    Raises:
+        ValueError: If the diagram bytes are corrupted or their version is not supported.
+        KeyError: If the diagram references an unknown framework or layer.
+    """
+
+    # A value of the wrong type in the header, like a number instead of a list, is reported as a corrupted file.
+    try:
+        return decode_diagram_data(data)
+    except (TypeError, AttributeError) as error:
+        raise ValueError('Corrupted diagram file: {}'.format(error))
+
+
+def decode_diagram_data(data: bytes) -> Diagram:
+    if not data.startswith(DIAGRAM_BINARY_MAGIC):
+        header = json.loads(data.decode('utf-8'))
+        if header.get('version') == 1:
+            return decode_diagram_v1(header)
+        if header.get('version') != DIAGRAM_FILE_VERSION:
+            raise ValueError('Unsupported diagram file version: {}'.format(header.get('version')))
+        return create_diagram(header, header['nodes'], header['positions'], header['edges'])
+
+    if len(data) < DIAGRAM_BINARY_PREFIX.size:
+        raise ValueError('Corrupted binary diagram file.')
+
+    _, version, header_length, nodes_count, edges_count = DIAGRAM_BINARY_PREFIX.unpack_from(data)
+    if version != DIAGRAM_FILE_VERSION:
+        raise ValueError('Unsupported diagram file version: {}'.format(version))
+
+    offset = DIAGRAM_BINARY_PREFIX.size
+    header = json.loads(data[offset:offset + header_length].decode('utf-8'))
+    offset += header_length
+
+    layer_class_ids, offset = decode_array(DIAGRAM_BINARY_UINT32_TYPECODE, data, offset, nodes_count)
+    positions, offset = decode_array(DIAGRAM_BINARY_DOUBLE_TYPECODE, data, offset, nodes_count * 2)
+    edges, offset = decode_array(DIAGRAM_BINARY_UINT32_TYPECODE, data, offset, edges_count * 2)
+
+    return create_diagram(header, layer_class_ids, positions, edges)
+
+
+def create_diagram(
+    header: Dict[str, Any],
+    layer_class_ids: List[int],
+    positions: List[float],
+    edges: List[int],
+) -> Diagram:
+    framework_name = header['framework']
+
+    layer_classes = list()
+    for layer_class_json in header['layers']:
+        layer_class = frameworks_utils.get_framework_layer_class(framework_name, layer_class_json['name'])
+        layer_classes.append((layer_class, layer_class_json['parameters']))
+
+    layers_parameters = header['parameters']
+    if len(layers_parameters) != len(layer_class_ids) or len(positions) != len(layer_class_ids) * 2:
+        raise ValueError('Corrupted diagram file: the nodes, parameters and positions counts do not match.')
+    if not all(isinstance(coordinate, (int, float)) for coordinate in positions):
+        raise ValueError('Corrupted diagram file: a position is not a number.')
+    check_edges_nodes(len(layer_class_ids), edges)
+
+    layers = list()
+    for layer_class_id, layer_parameters in zip(layer_class_ids, layers_parameters):
+        if not isinstance(layer_class_id, int) or not 0 <= layer_class_id < len(layer_classes):
+            raise ValueError('Corrupted diagram file: unknown layer class id {}.'.format(layer_class_id))
+
+        layer_class, parameters_names = layer_classes[layer_class_id]
+        if not isinstance(layer_parameters, list) or len(layer_parameters) != len(parameters_names):
+            raise ValueError(
+                'Corrupted diagram file: the parameters of a {} do not match.'.format(layer_class.__name__),
+            )
+
+        layer = layer_class()
+        layer.set_layer_parameters(dict(zip(parameters_names, layer_parameters)))
+        layers.append(layer)
+
+    return Diagram(
+        framework_name,
+        layers,
+        list(zip(positions[0::2], positions[1::2])),
+        list(zip(edges[0::2], edges[1::2])),
+    )
+
+
+def decode_diagram_v1(header: Dict[str, Any]) -> Diagram:
+    framework_name = header['framework']
+
+    layers = list()
+    positions = list()
+    for node in header['nodes']:
+        layer = frameworks_utils.get_framework_layer_class(framework_name, node['layer'])()
+        layer.set_layer_parameters(node['parameters'])
+        layers.append(layer)
+        positions.append(tuple(node['position']))
+
+    edges = [tuple(edge) for edge in header['edges']]
+    if not all(len(edge) == 2 for edge in edges):
+        raise ValueError('Corrupted diagram file: an edge does not have two nodes.')
+    check_edges_nodes(len(layers), [node for edge in edges for node in edge])
+
+    return Diagram(framework_name, layers, positions, edges)
+
+
+def check_edges_nodes(nodes_count: int, edges_nodes: Sequence[int]):
+    """Checks the flat start and end nodes of the edges, so a loaded diagram never references a missing node.
+
+    Raises:
+        ValueError: If an edge is missing its end node or references a node out of range.
+    """
+
+    if len(edges_nodes) % 2:
+        raise ValueError('Corrupted diagram file: an edge has no end node.')
+    if not edges_nodes:
+        return
+    if (
+        not all(isinstance(node, int) for node in edges_nodes) or
+        min(edges_nodes) < 0 or
+        max(edges_nodes) >= nodes_count
+    ):
+        raise ValueError('Corrupted diagram file: an edge references a node out of range.')
+
+
+def encode_array(typecode: str, values: List[Any]) -> bytes:
+    """Encodes the given values as a little-endian array, whatever the byte order of the platform is."""
+
+    values_array = array.array(typecode, values)
+    if sys.byteorder == 'big':
+        values_array.byteswap()
+    return values_array.tobytes()
+
+
+def decode_array(typecode: str, data: bytes, offset: int, count: int) -> Tuple[array.array, int]:
+    values_array = array.array(typecode)
+    end = offset + values_array.itemsize * count
+    if end > len(data):
+        raise ValueError('Corrupted binary diagram file.')
+
+    values_array.frombytes(data[offset:end])
+    if sys.byteorder == 'big':
+        values_array.byteswap()
+    return values_array, end
@@ -0,0 +1,398 @@
+"""Diagram journal file to recover the diagram being edited after a crash.
+
+The scene sends every edit as a small record to a DiagramJournal, and a background thread appends the records to
+the journal file as JSON lines, so the UI thread never waits for the disk. Records are written in batches and
+synced to the disk at most once per DIAGRAM_JOURNAL_FSYNC_INTERVAL seconds. The thread also keeps the diagram
+state the records lead to, and once the journal grows past twice the size of that state, it replaces the file with
+the state alone.
+
+Every running instance writes its own journal and holds an advisory lock on the journal's lock file while it runs,
+so a journal whose lock is free was left by a crashed instance and can be recovered by the next one.
+
+Records, items and arrows are referenced by the ids the scene gave them:
+- {"op": "clear"}.
+- {"op": "add", "framework": name, "items": [[id, layer class name, parameters, x, y], ...],
+   "arrows": [[id, start item id, end item id], ...]}.
+- {"op": "remove", "items": [id, ...], "arrows": [id, ...]}.
+- {"op": "move", "items": [id, ...], "positions": [x, y, ...]}.
+- {"op": "edit", "item": id, "parameters": parameters}.
+
+Available methods:
+- get_journal_file_path.
+- find_orphan_journal.
+- remove_orphan_journal.
+- read_journal.
+"""
+
+
+# Built-in imports.
+import fnmatch
+import json
+import os
+import queue
+import threading
+import time
+
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# First-party package imports.
+from utils import frameworks_utils
+from constants import diagram_constants
+from constants import main_window_constants
+from utils.diagram_file_utils import Diagram
+
+
+class DiagramJournalState(object):
+    """Class to hold the diagram state the journal records lead to."""
+
+    def __init__(self):
+        self.framework_name = None
+        self.items = dict()
+        self.arrows = dict()
+
+    def apply_record(self, record: Dict[str, Any]):
+        op = record['op']
+        if op == 'clear':
+            self.items.clear()
+            self.arrows.clear()
+        elif op == 'add':
+            self.framework_name = record['framework']
+            for item_id, layer_class_name, layer_parameters, x, y in record['items']:
+                self.items[item_id] = [layer_class_name, layer_parameters, x, y]
+            for arrow_id, start_item_id, end_item_id in record['arrows']:
+                self.arrows[arrow_id] = (start_item_id, end_item_id)
+        elif op == 'remove':
+            for item_id in record['items']:
+                self.items.pop(item_id, None)
+            for arrow_id in record['arrows']:
+                self.arrows.pop(arrow_id, None)
+        elif op == 'move':
+            positions = record['positions']
+            for index, item_id in enumerate(record['items']):
+                item = self.items.get(item_id)
+                if item is not None:
+                    item[2] = positions[index * 2]
+                    item[3] = positions[index * 2 + 1]
+        elif op == 'edit':
+            item = self.items.get(record['item'])
+            if item is not None:
+                item[1] = record['parameters']
+
+    def get_records(self) -> List[Dict[str, Any]]:
+        """Returns the records that lead to the state on their own."""
+
+        return [
+            {'op': 'clear'},
+            {
+                'op': 'add',
+                'framework': self.framework_name,
+                'items': [[item_id] + item for item_id, item in self.items.items()],
+                'arrows': [[arrow_id, *arrow] for arrow_id, arrow in self.arrows.items()],
+            },
+        ]
+
+    def get_diagram(self) -> Union[Diagram, None]:
+        """Creates the diagram of the state.
+
+        Returns:
+            The Diagram object, or None if the state has no items.
+
+        Raises:
+            KeyError: If the state references an unknown framework or layer.
+        """
+
+        if not self.items:
+            return None
+
+        items_indices = dict()
+        layers = list()
+        positions = list()
+        for item_id, (layer_class_name, layer_parameters, x, y) in self.items.items():
+            layer = frameworks_utils.get_framework_layer_class(self.framework_name, layer_class_name)()
+            layer.set_layer_parameters(layer_parameters)
+            items_indices[item_id] = len(layers)
+            layers.append(layer)
+            positions.append((x, y))
+
+        # Arrows of removed items are removed with them, the check only guards against a torn journal.
+        edges = [
+            (items_indices[start_item_id], items_indices[end_item_id])
+            for start_item_id, end_item_id in self.arrows.values()
+            if start_item_id in items_indices and end_item_id in items_indices
+        ]
+
+        return Diagram(self.framework_name, layers, positions, edges)
+
+
+class DiagramJournalLock(object):
+    """Class to hold an advisory lock on a journal's lock file, the lock is freed by the system if its process dies."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.fp = None
+
+    def acquire(self) -> bool:
+        """Locks the lock file without waiting for it.
+
+        Returns:
+            Boolean indicates whether the lock was acquired, it is not if another running instance holds it.
+
+        Raises:
+            OSError: If the lock file can not be created.
+        """
+
+        fp = open(self.file_path, 'a')
+        try:
+            if os.name == 'nt':
+                msvcrt.locking(fp.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fp.close()
+            return False
+
+        self.fp = fp
+        return True
+
+    def release(self):
+        """Unlocks and deletes the lock file."""
+
+        if self.fp is None:
+            return
+
+        self.fp.close()
+        self.fp = None
+        try:
+            os.remove(self.file_path)
+        except OSError:
+            pass
+
+
+class DiagramJournal(object):
+    """Class to append the diagram edits to the journal file from a background writer thread.
+
+    If the writer thread fails, like on a full disk, the journal stops accepting records and calls the error callback
+    from the writer thread with the error.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fsync_interval: float = diagram_constants.DIAGRAM_JOURNAL_FSYNC_INTERVAL,
+        compact_size: int = diagram_constants.DIAGRAM_JOURNAL_COMPACT_SIZE,
+        error_callback: Union[Callable[[Exception], None], None] = None,
+    ):
+        self.file_path = file_path
+        self.fsync_interval = fsync_interval
+        self.compact_size = compact_size
+        self.error_callback = error_callback
+        self.error = None
+        self.records = queue.Queue()
+        self.state = DiagramJournalState()
+        self.thread = threading.Thread(target=self.run, name='DiagramJournal', daemon=True)
+        self.lock = DiagramJournalLock(file_path + main_window_constants.DIAGRAM_JOURNAL_LOCK_FILE_SUFFIX)
+        self.written_size = 0
+        self.state_size = 0
+
+    def start(self):
+        """Locks the journal, then starts the writer thread.
+
+        Raises:
+            OSError: If the journal directory or lock file can not be created, or the journal is already locked.
+        """
+
+        journal_dir = os.path.dirname(self.file_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+
+        if not self.lock.acquire():
+            raise OSError('The diagram journal is locked by another instance: {}'.format(self.file_path))
+
+        self.records.put({'op': 'clear'})
+        self.thread.start()
+
+    def write(self, record: Dict[str, Any]):
+        if self.error is None:
+            self.records.put(record)
+
+    def get_error(self) -> Union[Exception, None]:
+        return self.error
+
+    def close(self, is_deleted: bool = False):
+        """Writes and syncs the pending records, then stops the writer thread.
+
+        Args:
+            is_deleted: Boolean indicates whether the journal file is deleted, on a clean exit.
+        """
+
+        if self.thread.is_alive():
+            self.records.put(None)
+            self.thread.join()
+
+        if is_deleted:
+            try:
+                os.remove(self.file_path)
+            except OSError:
+                pass
+        self.lock.release()
+
+    def run(self):
+        try:
+            self.write_records()
+        except Exception as error:
+            self.error = error
+            if self.error_callback is not None:
+                self.error_callback(error)
+
+    def write_records(self):
+        fp = open(self.file_path, 'a', encoding='utf-8')
+        self.written_size = fp.tell()
+        sync_time = time.monotonic()
+        is_synced = True
+        is_closed = False
+
+        try:
+            while not is_closed:
+                records = list()
+                try:
+                    records.append(self.records.get(timeout=self.fsync_interval))
+                    while len(records) < diagram_constants.DIAGRAM_JOURNAL_BATCH_RECORDS_COUNT:
+                        records.append(self.records.get_nowait())
+                except queue.Empty:
+                    pass
+
+                if None in records:
+                    is_closed = True
+                    records = records[:records.index(None)]
+
+                if records:
+                    data = self.encode_records(records)
+                    fp.write(data)
+                    fp.flush()
+                    self.written_size += len(data)
+                    is_synced = False
+
+                if not is_synced and (is_closed or time.monotonic() - sync_time >= self.fsync_interval):
+                    os.fsync(fp.fileno())
+                    sync_time = time.monotonic()
+                    is_synced = True
+
+                if not is_closed and self.written_size > max(self.compact_size, self.state_size * 2):
+                    fp.close()
+                    self.compact()
+                    fp = open(self.file_path, 'a', encoding='utf-8')
+        finally:
+            fp.close()
+
+    def encode_records(self, records: List[Dict[str, Any]]) -> str:
+        for record in records:
+            self.state.apply_record(record)
+        return ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+
+    def compact(self):
+        """Replaces the journal file with the records of the current state, the file is replaced atomically."""
+
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in self.state.get_records())
+
+        compacted_file_path = self.file_path + '.tmp'
+        with open(compacted_file_path, 'w', encoding='utf-8') as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(compacted_file_path, self.file_path)
+
+        self.written_size = len(data)
+        self.state_size = len(data)
+
+
+def get_journal_file_path(journal_dir: str) -> str:
+    """Returns the path of the running instance's own journal in the given directory."""
+
+    instance_id = '{}-{}'.format(os.getpid(), time.time_ns())
+    return os.path.join(journal_dir, main_window_constants.DIAGRAM_JOURNAL_FILE_NAME.format(instance_id))
+
+
+def find_orphan_journal(journal_dir: str) -> Union[Tuple[str, DiagramJournalLock], None]:
+    """Finds the newest journal in the given directory whose instance is not running anymore, and locks it.
+
+    Args:
+        journal_dir: String represents the path of the journals directory.
+
+    Returns:
+        Tuple of the journal file path and its acquired lock, to be released by remove_orphan_journal, or None if
+        every journal belongs to a running instance.
+    """
+
+    file_name_pattern = main_window_constants.DIAGRAM_JOURNAL_FILE_NAME.format('*')
+    try:
+        file_names = fnmatch.filter(os.listdir(journal_dir), file_name_pattern)
+    except OSError:
+        return None
+
+    file_paths = list()
+    for file_name in file_names:
+        file_path = os.path.join(journal_dir, file_name)
+        try:
+            file_paths.append((os.path.getmtime(file_path), file_path))
+        except OSError:
+            continue
+
+    for _, file_path in sorted(file_paths, reverse=True):
+        lock = DiagramJournalLock(file_path + main_window_constants.DIAGRAM_JOURNAL_LOCK_FILE_SUFFIX)
+        try:
+            if lock.acquire():
+                return file_path, lock
+        except OSError:
+            continue
+
+    return None
+
+
+def remove_orphan_journal(file_path: str, lock: DiagramJournalLock, is_bad: bool = False):
+    """Removes a recovered orphan journal and releases its lock.
+
+    Args:
+        file_path: String represents the path of the journal file.
+        lock: DiagramJournalLock of the journal returned by find_orphan_journal.
+        is_bad: Boolean indicates whether the journal could not be recovered, it is then moved aside instead.
+    """
+
+    try:
+        if is_bad:
+            os.replace(file_path, file_path + main_window_constants.DIAGRAM_JOURNAL_BAD_FILE_SUFFIX)
+        else:
+            os.remove(file_path)
+    except OSError:
+        pass
+    finally:
+        lock.release()
+
+
+def read_journal(file_path: str) -> Union[DiagramJournalState, None]:
+    """Replays the journal in the given file path.
+
+    A crash can leave the last line half written, the replay stops at the first line that can not be read.
+
+    Args:
+        file_path: String represents the path of the journal file.
+
+    Returns:
+        The DiagramJournalState the records lead to, or None if there is no journal file.
+    """
+
+    if not os.path.exists(file_path):
+        return None
+
+    state = DiagramJournalState()
+    with open(file_path, 'r', encoding='utf-8') as fp:
+        for line in fp:
+            try:
+                state.apply_record(json.loads(line))
+            except (ValueError, KeyError, TypeError, IndexError):
+                break
+    return state
@@ -0,0 +1,402 @@
+"""Export utils file to generate model code from a model graph without the Qt scene.
+
+The model code is generated as a stream: the input definitions, layer definitions and model connections are
+yielded one layer at a time and written straight to the output file, so exporting a huge model keeps the memory
+usage flat.
+
+Available methods:
+- evaluate_model_graph.
+- write_model.
+- write_model_file.
+- export_model.
+- evaluate_diagram_file.
+- export_diagram_file.
+- export_diagram_file_to.
+- batch_export_diagram_files.
+- get_model_graph_error_msg.
+- get_layers_names_error_msg.
+- generate_input_definitions.
+- generate_layer_definitions.
+- generate_model_connections.
+- build_input_definitions.
+- build_layer_definitions.
+- build_model_connections.
+"""
+
+
+# Built-in imports.
+import io
+import os
+import time
+
+from typing import Iterable, Iterator, List, Set, TextIO, Tuple, Union
+
+# First-party package imports.
+from utils import diagram_file_utils
+from utils import frameworks_utils
+from utils import graph_utils
+from utils import layer_names_utils
+from constants import main_window_constants
+from frameworks.layer_interface import LayerInterface
+
+
+class ModelGraphError(Exception):
+    """Raised when the model graph can not be exported, the message is one of the model graph error messages."""
+
+
+class DiagramExportResult(object):
+    """Class to hold the result of exporting one diagram file."""
+
+    def __init__(self, diagram_path: str, output_path: str, elapsed_time: float, error: Union[str, None] = None):
+        self.diagram_path = diagram_path
+        self.output_path = output_path
+        self.elapsed_time = elapsed_time
+        self.error = error
+
+    def is_succeeded(self) -> bool:
+        return self.error is None
+
+
+def evaluate_model_graph(
+    layers: List[LayerInterface],
+    graph: List[List[int]],
+    diagram_dir_path: Union[str, None] = None,
+) -> graph_utils.GraphEvaluation:
+    """Evaluates the given model graph and checks it against the model graph rules.
+
+    Args:
+        layers: List of the graph nodes' framework layers.
+        graph: Uni-directional graph represented in adjacency list format.
+        diagram_dir_path: String represents the directory of the graph's diagram file, the relative file paths of
+            the layers are resolved against it. The current directory is used if None.
+
+    Returns:
+        GraphEvaluation object of the model graph.
+
+    Raises:
+        ModelGraphError: If the model graph is not valid.
+    """
+
+    graph_evaluation = graph_utils.evaluate_graph(graph)
+
+    model_graph_error_msg = get_model_graph_error_msg(layers, graph_evaluation, diagram_dir_path)
+    if model_graph_error_msg:
+        raise ModelGraphError(model_graph_error_msg)
+
+    return graph_evaluation
+
+
+def write_model(
+    fp: TextIO,
+    framework_name: str,
+    layers: List[LayerInterface],
+    graph_evaluation: graph_utils.GraphEvaluation,
+):
+    """Writes the framework's template formatted using the layers of an evaluated model graph.
+
+    Args:
+        fp: Text file object to write the model code to.
+        framework_name: String represents the name of the framework.
+        layers: List of the graph nodes' framework layers.
+        graph_evaluation: GraphEvaluation object of the valid model graph.
+    """
+
+    root_nodes = graph_evaluation.root_nodes
+    root_nodes_set = set(root_nodes)
+
+    frameworks_utils.write_formatted_framework_template(
+        fp,
+        framework_name,
+        generate_input_definitions(map(layers.__getitem__, root_nodes)),
+        generate_layer_definitions(layers, graph_evaluation.topological_sort, root_nodes_set),
+        generate_model_connections(
+            layers,
+            graph_evaluation.parents,
+            graph_evaluation.topological_sort,
+            root_nodes_set,
+        ),
+    )
+
+
+def write_model_file(
+    file_path: str,
+    framework_name: str,
+    layers: List[LayerInterface],
+    graph_evaluation: graph_utils.GraphEvaluation,
+):
+    """Writes the model code to the given file path through a temporary file in the same directory.
+
+    The temporary file replaces the output file only once the model code is fully written, so an error while writing
+    never leaves a truncated output file behind.
+
+    Args:
+        file_path: String represents the path of the output file.
+        framework_name: String represents the name of the framework.
+        layers: List of the graph nodes' framework layers.
+        graph_evaluation: GraphEvaluation object of the valid model graph.
+
+    Raises:
+        ModelGraphError: If a layer can not be written.
+        OSError: If the output file can not be written.
+    """
+
+    temporary_file_path = file_path + main_window_constants.EXPORT_TEMPORARY_FILE_SUFFIX
+    try:
+        with open(temporary_file_path, 'w') as fp:
+            write_model(fp, framework_name, layers, graph_evaluation)
+        os.replace(temporary_file_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temporary_file_path)
+        except OSError:
+            pass
+        raise
+
+
+def export_model(framework_name: str, layers: List[LayerInterface], graph: List[List[int]]) -> str:
+    """Evaluates the given model graph and formats the framework's template using its layers.
+
+    Args:
+        framework_name: String represents the name of the framework.
+        layers: List of the graph nodes' framework layers.
+        graph: Uni-directional graph represented in adjacency list format.
+
+    Returns:
+        String represents the formatted framework's template.
+
+    Raises:
+        ModelGraphError: If the model graph is not valid.
+    """
+
+    graph_evaluation = evaluate_model_graph(layers, graph)
+
+    fp = io.StringIO()
+    write_model(fp, framework_name, layers, graph_evaluation)
+    return fp.getvalue()
+
+
+def evaluate_diagram_file(file_path: str) -> Tuple[diagram_file_utils.Diagram, graph_utils.GraphEvaluation]:
+    """Loads the diagram saved in the given file path and evaluates its model graph.
+
+    Args:
+        file_path: String represents the path of the diagram file.
+
+    Returns:
+        Tuple of the loaded Diagram object and the GraphEvaluation object of its model graph.
+
+    Raises:
+        ModelGraphError: If the model graph is not valid.
+    """
+
+    diagram = diagram_file_utils.load_diagram(file_path)
+    graph = graph_utils.create_graph_from_edges(len(diagram.layers), diagram.edges)
+    return diagram, evaluate_model_graph(diagram.layers, graph, os.path.dirname(os.path.abspath(file_path)))
+
+
+def export_diagram_file(file_path: str) -> str:
+    """Loads the diagram saved in the given file path and exports it.
+
+    Args:
+        file_path: String represents the path of the diagram file.
+
+    Returns:
+        String represents the formatted framework's template.
+
+    Raises:
+        ModelGraphError: If the model graph is not valid.
+    """
+
+    diagram, graph_evaluation = evaluate_diagram_file(file_path)
+
+    fp = io.StringIO()
+    write_model(fp, diagram.framework_name, diagram.layers, graph_evaluation)
+    return fp.getvalue()
+
+
+def export_diagram_file_to(diagram_path: str, output_path: str) -> DiagramExportResult:
+    """Exports the diagram saved in the given file path and writes the model code to the output path.
+
+    Any error is caught and kept in the returned result, so the function is safe to run in a worker process.
+
+    Args:
+        diagram_path: String represents the path of the diagram file.
+        output_path: String represents the path of the output file.
+
+    Returns:
+        DiagramExportResult object holds the elapsed time and the error message if any.
+    """
+
+    start_time = time.perf_counter()
+    try:
+        diagram, graph_evaluation = evaluate_diagram_file(diagram_path)
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        write_model_file(output_path, diagram.framework_name, diagram.layers, graph_evaluation)
+    except ModelGraphError as error:
+        return DiagramExportResult(diagram_path, output_path, time.perf_counter() - start_time, str(error))
+    except Exception as error:
+        error_msg = '{}: {}'.format(error.__class__.__name__, error)
+        return DiagramExportResult(diagram_path, output_path, time.perf_counter() - start_time, error_msg)
+
+    return DiagramExportResult(diagram_path, output_path, time.perf_counter() - start_time)
+
+
+def batch_export_diagram_files(
+    diagram_output_paths: List[Tuple[str, str]],
+    max_workers: Union[int, None] = None,
+) -> List[DiagramExportResult]:
+    """Exports the given diagram files across a pool of worker processes.
+
+    Args:
+        diagram_output_paths: List of (diagram path, output path) pairs.
+        max_workers: Integer represents the number of worker processes, the number of CPU cores if None.
+
+    Returns:
+        List of DiagramExportResult objects in the same order of the given pairs.
+    """
+
+    if not diagram_output_paths:
+        return list()
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(diagram_output_paths))
+    if max_workers == 1:
+        return [export_diagram_file_to(*paths) for paths in diagram_output_paths]
+
+    # Big chunks keep the inter-process overhead low, small enough chunks keep the workers balanced.
+    chunksize = max(1, len(diagram_output_paths) // (max_workers * 4))
+
+    # Importing the process pool pulls in multiprocessing, which the GUI never needs, so it waits until here.
+    from concurrent.futures import ProcessPoolExecutor
+
+    diagram_paths, output_paths = zip(*diagram_output_paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(export_diagram_file_to, diagram_paths, output_paths, chunksize=chunksize))
+
+
+def get_model_graph_error_msg(
+    layers: List[LayerInterface],
+    graph_evaluation: graph_utils.GraphEvaluation,
+    diagram_dir_path: Union[str, None] = None,
+) -> Union[str, None]:
+    """Checks the given model graph evaluation against the model graph rules.
+
+    Args:
+        layers: List of the graph nodes' framework layers.
+        graph_evaluation: GraphEvaluation object of the model graph.
+        diagram_dir_path: String represents the directory of the graph's diagram file, see evaluate_model_graph.
+
+    Returns:
+        If the model graph is not valid, then the returned value is the error message. None otherwise.
+    """
+
+    if len(layers) == 0:
+        return main_window_constants.MODEL_GRAPH_EMPTY_ERROR_MSG
+    if not graph_evaluation.is_one_connected_component:
+        return main_window_constants.MODEL_GRAPH_MULTIPLE_COMPONENTS_ERROR_MSG
+    if not graph_evaluation.is_acyclic():
+        return main_window_constants.MODEL_GRAPH_CYCLE_ERROR_MSG
+    if not graph_utils.is_all_root_nodes_are_input_layers(layers, graph_evaluation.root_nodes):
+        return main_window_constants.MODEL_GRAPH_ROOT_NODE_IS_NOT_INPUT_ERROR_MSG
+    layers_names_error_msg = get_layers_names_error_msg(layers, diagram_dir_path)
+    if layers_names_error_msg:
+        return layers_names_error_msg
+    for layer, parents in zip(layers, graph_evaluation.parents):
+        layer_graph_error = layer.layer_graph_error([layers[parent] for parent in parents], diagram_dir_path)
+        if layer_graph_error:
+            return layer_graph_error
+    return None
+
+
+def get_layers_names_error_msg(
+    layers: List[LayerInterface],
+    diagram_dir_path: Union[str, None] = None,
+) -> Union[str, None]:
+    """Checks that every layer has a unique name that is valid in the model code.
+
+    The scene's name allocator keeps the names of the edited diagram valid, but diagram files exported without the
+    scene can have any names. The other names a layer takes in the model code, like the names of a block's inner
+    layers, have to be unique as well, see LayerInterface.layer_names_suffixes.
+
+    Args:
+        layers: List of the graph nodes' framework layers.
+        diagram_dir_path: String represents the directory of the graph's diagram file, see evaluate_model_graph.
+
+    Returns:
+        If a layer name is missing, not valid or taken by another layer, then the returned value is the error
+        message. None otherwise.
+    """
+
+    names = set()
+    for layer in layers:
+        name = layer.object_name
+        if not isinstance(name, str) or not name:
+            return main_window_constants.MODEL_GRAPH_LAYER_NAME_MISSING_ERROR_MSG
+        if name in names:
+            return main_window_constants.LAYER_NAME_TAKEN_ERROR_MSG.format(name)
+
+        name_error_msg = layer_names_utils.get_layer_name_error(name)
+        if name_error_msg is not None:
+            return name_error_msg
+        names.add(name)
+
+    for layer in layers:
+        for suffix in layer.layer_names_suffixes(diagram_dir_path):
+            expanded_name = '{}_{}'.format(layer.object_name, suffix)
+            if expanded_name in names:
+                return main_window_constants.LAYER_NAME_EXPANDED_TAKEN_ERROR_MSG.format(expanded_name)
+            names.add(expanded_name)
+    return None
+
+
+def generate_input_definitions(root_layers: Iterable[LayerInterface]) -> Iterator[str]:
+    for layer in root_layers:
+        yield layer.layer_definition()
+
+
+def generate_layer_definitions(
+    layers: List[LayerInterface],
+    graph_topological_sort: List[int],
+    root_nodes: Set[int],
+) -> Iterator[str]:
+    for element in graph_topological_sort:
+        if element not in root_nodes:
+            yield layers[element].layer_definition()
+
+
+def generate_model_connections(
+    layers: List[LayerInterface],
+    parents: List[List[int]],
+    graph_topological_sort: List[int],
+    root_nodes: Set[int],
+) -> Iterator[str]:
+    for element in graph_topological_sort:
+        layer_connections = layers[element].layer_connections(
+            [layers[parent] for parent in parents[element]],
+            [parent in root_nodes for parent in parents[element]],
+        )
+        if layer_connections:
+            yield layer_connections
+
+
+def build_input_definitions(root_layers: Iterable[LayerInterface]) -> str:
+    return ', '.join(generate_input_definitions(root_layers))
+
+
+def build_layer_definitions(
+    layers: List[LayerInterface],
+    graph_topological_sort: List[int],
+    root_nodes: Set[int],
+) -> str:
+    return '\n'.join(generate_layer_definitions(layers, graph_topological_sort, root_nodes))
+
+
+def build_model_connections(
+    layers: List[LayerInterface],
+    parents: List[List[int]],
+    graph_topological_sort: List[int],
+    root_nodes: Set[int],
+) -> str:
+    return '\n'.join(generate_model_connections(layers, parents, graph_topological_sort, root_nodes))
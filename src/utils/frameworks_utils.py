@@ -1,13 +1,22 @@
 # Built-in imports.
 import os
+import string
 
-from typing import List
+from typing import Dict, Iterable, List, TextIO, Tuple, Union
 
 # First-party package imports.
-from frameworks.layers_registry import layers_registry
+from frameworks.layers_registry import LayerEntry, layers_registry
 from frameworks.layer_interface import LayerInterface
 
 
+FRAMEWORKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frameworks')
+
+FRAMEWORK_TEMPLATE_FILE_NAME = 'template.py'
+
+# Mapping from a framework name to its template file's modification time, content and parsed content.
+framework_templates_cache: Dict[str, Tuple[int, str, List[Tuple[str, Union[int, None]]]]] = dict()
+
+
 def get_frameworks_list() -> List[str]:
     """Returns list of the available frameworks.
 
@@ -15,7 +24,7 @@ def get_frameworks_list() -> List[str]:
         List of strings represents the names of the available frameworks.
     """
 
-    return layers_registry.keys()
+    return list(layers_registry.keys())
 
 
 def get_sorted_frameworks_list() -> List[str]:
@@ -29,7 +38,7 @@ def get_sorted_frameworks_list() -> List[str]:
 
 
 def get_framework_layers(framework_name: str) -> List[LayerInterface]:
-    """Returns a list of available layers for the given framework.
+    """Returns a list of available layers for the given framework, it imports all of them.
 
     Args:
         framework_name: String represents the name of the framework.
@@ -38,6 +47,19 @@ def get_framework_layers(framework_name: str) -> List[LayerInterface]:
         List of layers for the given framework.
     """
 
+    return [layer_entry.get_layer_class() for layer_entry in get_framework_layer_entries(framework_name)]
+
+
+def get_framework_layer_entries(framework_name: str) -> List[LayerEntry]:
+    """Returns a list of available layer entries for the given framework, without importing the layers.
+
+    Args:
+        framework_name: String represents the name of the framework.
+
+    Returns:
+        List of layer entries for the given framework.
+    """
+
     return layers_registry[framework_name]
 
 
@@ -52,11 +74,47 @@ def get_framework_layer_index(framework_name: str, layer_class: LayerInterface)
         Integer represents the index of the layer in the framework's layers list.
     """
 
-    return get_framework_layers(framework_name).index(layer_class)
+    for index, layer_entry in enumerate(get_framework_layer_entries(framework_name)):
+        if layer_entry.name == layer_class.__name__:
+            return index
+    raise ValueError(layer_class.__name__)
+
+
+def get_framework_layer_class(framework_name: str, layer_class_name: str) -> LayerInterface:
+    """Returns the layer class that has the given name in the framework's layers list.
+
+    Args:
+        framework_name: String represents the name of the framework.
+        layer_class_name: String represents the name of the required layer class.
+
+    Returns:
+        The required layer class.
+
+    Raises:
+        KeyError: If the framework has no layer class with the given name.
+    """
+
+    for layer_entry in get_framework_layer_entries(framework_name):
+        if layer_entry.name == layer_class_name:
+            return layer_entry.get_layer_class()
+    raise KeyError(layer_class_name)
+
+
+def get_framework_template_path(framework_name: str) -> str:
+    """Returns the path of the framework's template, it does not depend on the current working directory.
+
+    Args:
+        framework_name: String represents the name of the framework.
+
+    Returns:
+        String represents the path of the framework's template.
+    """
+
+    return os.path.join(FRAMEWORKS_DIR, framework_name, FRAMEWORK_TEMPLATE_FILE_NAME)
 
 
 def get_framework_template(framework_name: str) -> str:
-    """Reads the framework's template.
+    """Reads the framework's template, the template is cached until its file is modified.
 
     Args:
         framework_name: String represents the name of the framework.
@@ -65,7 +123,47 @@ def get_framework_template(framework_name: str) -> str:
         The framework's template.
     """
 
-    return open(os.path.join('./src/frameworks', framework_name, 'template.py'), 'r').read()
+    return load_framework_template(framework_name)[1]
+
+
+def get_parsed_framework_template(framework_name: str) -> List[Tuple[str, Union[int, None]]]:
+    """Reads and parses the framework's template, the parsed template is cached until its file is modified.
+
+    Args:
+        framework_name: String represents the name of the framework.
+
+    Returns:
+        List of (literal text, field index) pairs, the field index is None after the last literal text.
+    """
+
+    return load_framework_template(framework_name)[2]
+
+
+def load_framework_template(framework_name: str) -> Tuple[int, str, List[Tuple[str, Union[int, None]]]]:
+    template_path = get_framework_template_path(framework_name)
+    template_mtime = os.stat(template_path).st_mtime_ns
+
+    cached_template = framework_templates_cache.get(framework_name)
+    if cached_template is not None and cached_template[0] == template_mtime:
+        return cached_template
+
+    with open(template_path, 'r') as fp:
+        template = fp.read()
+
+    parsed_template = list()
+    next_field_index = 0
+    for literal_text, field_name, _, _ in string.Formatter().parse(template):
+        field_index = None
+        if field_name is not None:
+            if field_name:
+                field_index = int(field_name)
+            else:
+                field_index = next_field_index
+                next_field_index += 1
+        parsed_template.append((literal_text, field_index))
+
+    framework_templates_cache[framework_name] = (template_mtime, template, parsed_template)
+    return framework_templates_cache[framework_name]
 
 
 def get_formatted_framework_template(
@@ -87,3 +185,43 @@ def get_formatted_framework_template(
     """
 
     return get_framework_template(framework_name).format(layer_definitions, input_definitions, model_connections)
+
+
+def write_formatted_framework_template(
+    fp: TextIO,
+    framework_name: str,
+    input_definitions: Iterable[str],
+    layer_definitions: Iterable[str],
+    model_connections: Iterable[str],
+):
+    """Writes the framework's template formatted using the given layer definitions and model connections.
+
+    The definitions and connections are written one by one while they are generated, so the formatted template is
+    never held in memory. Each template field must appear once, because the given iterables are consumed once.
+
+    Args:
+        fp: Text file object to write the formatted template to.
+        framework_name: String represents the name of the framework.
+        input_definitions: Iterable of the input definitions.
+        layer_definitions: Iterable of the layer definitions.
+        model_connections: Iterable of the model connections.
+    """
+
+    fields = [
+        (layer_definitions, '\n'),
+        (input_definitions, ', '),
+        (model_connections, '\n'),
+    ]
+
+    for literal_text, field_index in get_parsed_framework_template(framework_name):
+        fp.write(literal_text)
+        if field_index is None:
+            continue
+
+        values, separator = fields[field_index]
+        is_first_value = True
+        for value in values:
+            if not is_first_value:
+                fp.write(separator)
+            fp.write(value)
+            is_first_value = False
@@ -2,6 +2,8 @@
 
 Available methods:
 - create_graph_from_qt_elements.
+- create_graph_from_edges.
+- evaluate_graph.
 - get_root_nodes.
 - is_root_node.
 - is_all_root_nodes_are_input_layers.
@@ -11,13 +13,34 @@ Available methods:
 
 
 # Built-in imports.
-from typing import Dict, List, Union
+from collections import deque
+from typing import Dict, List, Tuple, Union
 
 # First-party package imports.
+from frameworks.layer_interface import LayerInterface
 from widgets.diagram_item import DiagramItem
 from widgets.arrow import Arrow
 
 
+class GraphEvaluation(object):
+    """Class to hold the results of evaluating a uni-directional graph in a single pass."""
+
+    def __init__(
+        self,
+        root_nodes: List[int],
+        parents: List[List[int]],
+        is_one_connected_component: bool,
+        topological_sort: Union[List[int], None],
+    ):
+        self.root_nodes = root_nodes
+        self.parents = parents
+        self.is_one_connected_component = is_one_connected_component
+        self.topological_sort = topological_sort
+
+    def is_acyclic(self) -> bool:
+        return self.topological_sort is not None
+
+
 def create_graph_from_qt_elements(
     nodes: List[DiagramItem],
     edges: List[Arrow],
@@ -49,6 +72,87 @@ def create_graph_from_qt_elements(
     return graph
 
 
+def create_graph_from_edges(nodes_count: int, edges: List[Tuple[int, int]]) -> List[List[int]]:
+    """Generates a uni-directional graph from the given (start node, end node) pairs.
+
+    Args:
+        nodes_count: Integer represents the number of graph nodes.
+        edges: List of (start node, end node) pairs to be used as graph edges.
+
+    Returns:
+        Uni-directional graph represented in adjacency list format.
+    """
+
+    graph = [list() for _ in range(nodes_count)]
+
+    for start_node, end_node in edges:
+        graph[start_node].append(end_node)
+
+    return graph
+
+
+def evaluate_graph(graph: List[List[int]]) -> GraphEvaluation:
+    """Evaluates the given uni-directional graph in linear time.
+
+    The root nodes, the parents of every node, the connectivity and the topological sort are all computed
+    from the same in-degree array, so there is no need to build a bi-directional copy of the graph.
+
+    Args:
+        graph: Uni-directional graph represented in adjacency list format.
+
+    Returns:
+        GraphEvaluation object holds the root nodes, the parents of every node (sorted and without duplicates),
+        whether the graph is one connected component and its topological sort (None if it has a cycle).
+    """
+
+    nodes_count = len(graph)
+
+    nodes_in_degree = [0] * nodes_count
+    parents = [list() for _ in range(nodes_count)]
+    for node in range(nodes_count):
+        for child in graph[node]:
+            nodes_in_degree[child] += 1
+
+            # Nodes are visited in ascending order, so a duplicated edge can only repeat the last parent.
+            child_parents = parents[child]
+            if not child_parents or child_parents[-1] != node:
+                child_parents.append(node)
+
+    root_nodes = [node for node in range(nodes_count) if nodes_in_degree[node] == 0]
+
+    visited = [False] * nodes_count
+    visited_count = 0
+    if nodes_count:
+        queue = deque([0])
+        visited[0] = True
+        visited_count = 1
+
+        while queue:
+            current_node = queue.popleft()
+            for neighbours in (graph[current_node], parents[current_node]):
+                for neighbour in neighbours:
+                    if not visited[neighbour]:
+                        visited[neighbour] = True
+                        visited_count += 1
+                        queue.append(neighbour)
+
+    queue = deque(root_nodes)
+    topological_sort = list()
+    while queue:
+        current_node = queue.popleft()
+        topological_sort.append(current_node)
+
+        for child in graph[current_node]:
+            nodes_in_degree[child] -= 1
+            if nodes_in_degree[child] == 0:
+                queue.append(child)
+
+    if len(topological_sort) != nodes_count:
+        topological_sort = None
+
+    return GraphEvaluation(root_nodes, parents, visited_count == nodes_count, topological_sort)
+
+
 def get_root_nodes(graph: List[List[int]]) -> List[int]:
     """Given a uni-directional graph, returns the root nodes.
 
@@ -59,11 +163,11 @@ def get_root_nodes(graph: List[List[int]]) -> List[int]:
         List represents the root nodes.
     """
 
-    root_nodes = list()
+    is_root = [True] * len(graph)
     for node in range(len(graph)):
-        if is_root_node(graph, node):
-            root_nodes.append(node)
-    return root_nodes
+        for child in graph[node]:
+            is_root[child] = False
+    return [node for node in range(len(graph)) if is_root[node]]
 
 
 def is_root_node(graph: List[List[int]], element: int) -> bool:
@@ -83,11 +187,11 @@ def is_root_node(graph: List[List[int]], element: int) -> bool:
     return True
 
 
-def is_all_root_nodes_are_input_layers(nodes: List[DiagramItem], root_nodes: List[int]) -> bool:
+def is_all_root_nodes_are_input_layers(layers: List[LayerInterface], root_nodes: List[int]) -> bool:
     """Checks if the given root nodes are all input layers.
 
     Args:
-        nodes: List of DiagramItem(s) to be used as graph nodes.
+        layers: List of the graph nodes' framework layers.
         root_nodes: List of root node indexes.
 
     Returns:
@@ -95,14 +199,14 @@ def is_all_root_nodes_are_input_layers(nodes: List[DiagramItem], root_nodes: Lis
     """
 
     for root_node in root_nodes:
-        if not nodes[root_node].get_framework_layer().IS_INPUT_LAYER:
+        if not layers[root_node].IS_INPUT_LAYER:
             return False
     return True
 
 
 def is_one_connected_component(graph: List[List[int]]) -> bool:
     """Uses BFS algorithm ti check if the given bi-directional graph is one connected component of not.
-    
+
     Reference: https://www.geeksforgeeks.org/connected-components-in-an-undirected-graph.
 
     Args:
@@ -112,12 +216,11 @@ def is_one_connected_component(graph: List[List[int]]) -> bool:
         If the given graph is one connected component, then the returned value is True. False otherwise.
     """
 
-    queue = [0]
+    queue = deque([0])
     visited = [False for _ in range(len(graph))]
 
     while len(queue):
-        current_node = queue[0]
-        queue.pop(0)
+        current_node = queue.popleft()
 
         if visited[current_node]:
             continue
@@ -133,7 +236,7 @@ def is_one_connected_component(graph: List[List[int]]) -> bool:
 
 def create_graph_topological_sort(graph: List[List[int]]) -> Union[List[int], bool]:
     """Uses Kahn’s algorithm to creates a list contains the graph nodes sorted topologically.
-    
+
     Reference: https://www.geeksforgeeks.org/topological-sorting-indegree-based-solution.
 
     Args:
@@ -143,21 +246,20 @@ def create_graph_topological_sort(graph: List[List[int]]) -> Union[List[int], bo
         If the given graph is valid, then the returned value is a list contains the graph nodes sorted topologically.
         None otherwise.
     """
-    
+
     nodes_in_degree = [0] * len(graph)
     for node in range(len(graph)):
         for child in graph[node]:
             nodes_in_degree[child] += 1
 
-    queue = list()
+    queue = deque()
     for index, node_in in enumerate(nodes_in_degree):
         if node_in == 0:
             queue.append(index)
 
     topological_sort = list()
     while len(queue):
-        current_node = queue[0]
-        queue.pop(0)
+        current_node = queue.popleft()
         topological_sort.append(current_node)
 
         for child in graph[current_node]:
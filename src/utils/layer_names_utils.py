@@ -0,0 +1,39 @@
+"""Layer names utils file to check layer names without the Qt scene.
+
+Layer names become attributes of the exported model class, so they must be valid Python identifiers that are not
+keywords, names of the model class itself or clash with another layer's output attribute.
+
+Available methods:
+- get_layer_name_error.
+"""
+
+
+# Built-in imports.
+import keyword
+
+from typing import Any, Union
+
+# First-party package imports.
+from constants import diagram_constants
+from constants import main_window_constants
+
+
+def get_layer_name_error(name: Any) -> Union[str, None]:
+    """Checks whether the given name can name a layer, whether or not it is taken.
+
+    Args:
+        name: The layer name, any value that is not a string is not valid.
+
+    Returns:
+        The error message if the name is not valid, or None.
+    """
+
+    if not isinstance(name, str) or not name.isidentifier():
+        return main_window_constants.LAYER_NAME_INVALID_ERROR_MSG.format(name)
+    if (
+        keyword.iskeyword(name) or
+        name in diagram_constants.DIAGRAM_RESERVED_LAYER_NAMES or
+        name.endswith(diagram_constants.DIAGRAM_LAYER_OUTPUT_NAME_SUFFIX)
+    ):
+        return main_window_constants.LAYER_NAME_RESERVED_ERROR_MSG.format(name)
+    return None
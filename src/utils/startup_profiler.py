@@ -0,0 +1,135 @@
+"""Startup profiler, reports the import time of every module and the time until the main window is first painted.
+
+The profiler only uses built-in modules, so it can be started before PyQt5 and the application modules are
+imported and time them too.
+"""
+
+
+# Built-in imports.
+import sys
+import time
+
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Callable, Dict, List, TextIO, Tuple
+
+
+STARTUP_PROFILE_IMPORTS_COUNT = 25
+
+
+class ImportTimer(MetaPathFinder):
+    """Class to time the imports, every found module's loader is wrapped by a TimedLoader.
+
+    The total time of a module includes the modules it imports, its self time does not.
+    """
+
+    def __init__(self):
+        self.imports_times = dict()
+        self.imports_stack = list()
+
+    def start(self):
+        sys.meta_path.insert(0, self)
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname: str, path: Any, target: ModuleType = None) -> ModuleSpec:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = TimedLoader(spec.loader, self)
+            return spec
+
+        return None
+
+    def time_import(self, module_name: str, load: Callable[..., Any], *args: Any) -> Any:
+        self.imports_stack.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            return load(*args)
+        finally:
+            total_time = time.perf_counter() - start_time
+            children_time = self.imports_stack.pop()
+            if self.imports_stack:
+                self.imports_stack[-1] += total_time
+
+            # Extension modules are loaded by create_module and executed by exec_module, both are summed.
+            import_times = self.imports_times.setdefault(module_name, [0.0, 0.0])
+            import_times[0] += total_time - children_time
+            import_times[1] += total_time
+
+    def get_imports_times(self) -> List[Tuple[str, float, float]]:
+        """Returns the (module name, self time, total time) tuples of the timed imports, the slowest first."""
+
+        return sorted(
+            ((module_name, self_time, total_time) for module_name, (self_time, total_time) in self.imports_times.items()),
+            key=lambda import_times: import_times[1],
+            reverse=True,
+        )
+
+    def get_total_time(self) -> float:
+        return sum(self_time for self_time, _ in self.imports_times.values())
+
+
+class TimedLoader(object):
+    """Class to wrap a module loader, loading and executing the module are timed by the given ImportTimer."""
+
+    def __init__(self, loader: Any, import_timer: ImportTimer):
+        self.loader = loader
+        self.import_timer = import_timer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType:
+        return self.import_timer.time_import(spec.name, self.loader.create_module, spec)
+
+    def exec_module(self, module: ModuleType):
+        self.import_timer.time_import(module.__name__, self.loader.exec_module, module)
+
+
+class StartupProfiler(object):
+    """Class to time the startup stages, from the profiler start until the main window's first paint."""
+
+    def __init__(self):
+        self.import_timer = ImportTimer()
+        self.start_time = time.perf_counter()
+        self.stages_times = dict()
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.import_timer.start()
+
+    def mark_stage(self, stage_name: str):
+        """Records the time of the given stage since the profiler start, the first paint being the last stage."""
+
+        self.stages_times[stage_name] = time.perf_counter() - self.start_time
+
+    def stop(self):
+        self.import_timer.stop()
+
+    def get_stages_times(self) -> Dict[str, float]:
+        return self.stages_times
+
+    def write_report(self, fp: TextIO, imports_count: int = STARTUP_PROFILE_IMPORTS_COUNT):
+        fp.write('Startup stages (ms since start):\n')
+        for stage_name, stage_time in self.stages_times.items():
+            fp.write('  {:<24}{:>10.1f}\n'.format(stage_name, stage_time * 1000.0))
+
+        fp.write('\nImports: {:.1f} ms in {} modules\n'.format(
+            self.import_timer.get_total_time() * 1000.0,
+            len(self.import_timer.imports_times),
+        ))
+
+        fp.write('\nSlowest imports (ms):\n')
+        fp.write('  {:>10}{:>10}  {}\n'.format('self', 'total', 'module'))
+        for module_name, self_time, total_time in self.import_timer.get_imports_times()[:imports_count]:
+            fp.write('  {:>10.1f}{:>10.1f}  {}\n'.format(self_time * 1000.0, total_time * 1000.0, module_name))
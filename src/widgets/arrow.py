@@ -2,12 +2,16 @@
 import math
 
 # Third-party package imports.
-from PyQt5.QtCore import Qt, QLineF, QPointF, QRectF, QSizeF
-from PyQt5.QtGui import QPen, QPolygonF
+from PyQt5.QtCore import Qt, QLineF, QPointF, QRectF
+from PyQt5.QtGui import QPainterPath, QPen, QPolygonF
 from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsLineItem
 
 # First-party package imports.
-from widgets.diagram_item import DiagramItem
+from widgets.diagram_item import DiagramItem, is_low_detail
+
+
+# Shared by all the arrows, setting a pen copies it, which is cheaper than building one per arrow.
+ARROW_PEN = QPen(Qt.black, 2, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
 
 
 class Arrow(QGraphicsLineItem):
@@ -22,13 +26,23 @@ class Arrow(QGraphicsLineItem):
 
         self.start_item = start_item
         self.end_item = end_item
-        self.arrow_head = QPolygonF()
+
+        # Given by the scene when the arrow is first added, it stays the same if the arrow is removed and added back.
+        self.item_id = None
+
+        # Geometry cache, computed by updatePosition only when one of the arrow's items moves. The head's polygon is
+        # only built from its points once the arrow is drawn, most arrows of a big diagram are never on the screen.
+        self.arrow_head_points = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self.arrow_head = None
+        self.bounding_rect = QRectF()
+        self.shape_path = None
+        self.is_hidden = False
 
         # Could be used later to support coloring.
         self.color = Qt.black
 
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
-        self.setPen(QPen(self.color, 2, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        self.setPen(ARROW_PEN)
 
     def get_start_item(self) -> DiagramItem:
         return self.start_item
@@ -36,80 +50,105 @@ class Arrow(QGraphicsLineItem):
     def get_end_item(self) -> DiagramItem:
         return self.end_item
 
+    def set_color(self, color: Qt.GlobalColor):
+        self.color = color
+        self.update()
+
     def boundingRect(self) -> QRectF:
-        extra = (self.pen().width() + 20) / 2.0
-        p1 = self.line().p1()
-        p2 = self.line().p2()
-        return (
-            QRectF(p1, QSizeF(p2.x() - p1.x(), p2.y() - p1.y()))
-            .normalized()
-            .adjusted(-extra, -extra, extra, extra)
-        )
+        return self.bounding_rect
+
+    def shape(self) -> QPainterPath:
+        if self.shape_path is None:
+            self.shape_path = super(Arrow, self).shape()
+            self.shape_path.addPolygon(self.get_arrow_head())
+        return self.shape_path
 
-    def shape(self):
-        path = super(Arrow, self).shape()
-        path.addPolygon(self.arrow_head)
-        return path
+    def get_arrow_head(self) -> QPolygonF:
+        if self.arrow_head is None:
+            x1, y1, x2, y2, x3, y3 = self.arrow_head_points
+            self.arrow_head = QPolygonF([QPointF(x1, y1), QPointF(x2, y2), QPointF(x3, y3)])
+        return self.arrow_head
 
     def updatePosition(self):
-        line = QLineF(self.mapFromItem(self.start_item, 0, 0), self.mapFromItem(self.end_item, 0, 0))
-        self.setLine(line)
+        """Recomputes the cached arrow geometry, it has to be called whenever one of the arrow's items moves.
 
-    def paint(self, painter, option, widget=None):
-        if self.start_item.collidesWithItem(self.end_item):
-            return
+        The arrow is never moved, so the items' positions are its own coordinates, and the geometry is computed with
+        plain numbers, which keeps updating the arrows of a whole loaded diagram cheap.
+        """
 
         start_item = self.start_item
         end_item = self.end_item
-        color = self.color
-        pen = self.pen()
-        pen.setColor(color)
         arrow_size = 10.0
-        painter.setPen(pen)
-        painter.setBrush(color)
 
-        center_line = QLineF(start_item.pos(), end_item.pos())
-        end_polygon = end_item.polygon
-        p1 = end_polygon.first() + end_item.pos()
+        start_position = start_item.pos()
+        end_position = end_item.pos()
+        start_x, start_y = start_position.x(), start_position.y()
+        end_x, end_y = end_position.x(), end_position.y()
+
+        # Clip the arrow at the border of the end item instead of its center.
+        head_x, head_y = end_x, end_y
+        line_dx, line_dy = end_x - start_x, end_y - start_y
+        polygon_points = end_item.polygon_points
+        x1, y1 = polygon_points[-1]
+        for x2, y2 in polygon_points:
+            edge_dx, edge_dy = x2 - x1, y2 - y1
+            denominator = edge_dx * line_dy - edge_dy * line_dx
+            if denominator:
+                offset_x, offset_y = start_x - end_x - x1, start_y - end_y - y1
+                edge_ratio = (offset_x * line_dy - offset_y * line_dx) / denominator
+                line_ratio = (offset_x * edge_dy - offset_y * edge_dx) / denominator
+                if 0.0 <= edge_ratio <= 1.0 and 0.0 <= line_ratio <= 1.0:
+                    head_x, head_y = end_x + x1 + edge_ratio * edge_dx, end_y + y1 + edge_ratio * edge_dy
+                    break
+            x1, y1 = x2, y2
+
+        dx, dy = start_x - head_x, start_y - head_y
+        angle = math.acos(dx / max(1, math.hypot(dx, dy)))
+        if dy >= 0:
+            angle = (math.pi * 2.0) - angle
 
-        intersect_point = QPointF()
-        for i in end_polygon:
-            p2 = i + end_item.pos()
-            poly_line = QLineF(p1, p2)
-            intersect_type = poly_line.intersect(center_line, intersect_point)
-            if intersect_type == QLineF.BoundedIntersection:
-                break
-            p1 = p2
+        extra = (self.pen().width() + 20) / 2.0
 
-        self.setLine(QLineF(intersect_point, start_item.pos()))
-        line = self.line()
+        self.prepareGeometryChange()
+        self.is_hidden = start_item.is_colliding_with(end_item, -line_dx, -line_dy)
+        self.arrow_head_points = (
+            head_x,
+            head_y,
+            head_x + math.sin(angle + math.pi / 3.0) * arrow_size,
+            head_y + math.cos(angle + math.pi / 3.0) * arrow_size,
+            head_x + math.sin(angle + math.pi - math.pi / 3.0) * arrow_size,
+            head_y + math.cos(angle + math.pi - math.pi / 3.0) * arrow_size,
+        )
+        self.arrow_head = None
+        self.bounding_rect = QRectF(
+            min(head_x, start_x) - extra,
+            min(head_y, start_y) - extra,
+            abs(dx) + extra * 2.0,
+            abs(dy) + extra * 2.0,
+        )
+        self.shape_path = None
+        self.setLine(head_x, head_y, start_x, start_y)
 
-        angle = math.acos(line.dx() / max(1, line.length()))
-        if line.dy() >= 0:
-            angle = (math.pi * 2.0) - angle
+    def paint(self, painter, option, widget=None):
+        if self.is_hidden:
+            return
 
-        arrow_p1 = (
-            line.p1() +
-            QPointF(
-                math.sin(angle + math.pi / 3.0) * arrow_size,
-                math.cos(angle + math.pi / 3.0) * arrow_size,
-            )
-        )
+        color = self.color
 
-        arrow_p2 = (
-            line.p1() +
-            QPointF(
-                math.sin(angle + math.pi - math.pi / 3.0) * arrow_size,
-                math.cos(angle + math.pi - math.pi / 3.0) * arrow_size,
-            )
-        )
+        # Zoomed out arrows are drawn as hairlines without heads, which is much cheaper than stroking a wide pen.
+        if is_low_detail(painter, option):
+            painter.setPen(QPen(color, 0))
+            painter.drawLine(self.line())
+            return
 
-        self.arrow_head.clear()
-        for point in [line.p1(), arrow_p1, arrow_p2]:
-            self.arrow_head.append(point)
+        pen = self.pen()
+        pen.setColor(color)
+        painter.setPen(pen)
+        painter.setBrush(color)
 
+        line = self.line()
         painter.drawLine(line)
-        painter.drawPolygon(self.arrow_head)
+        painter.drawPolygon(self.get_arrow_head())
 
         if self.isSelected():
             painter.setPen(QPen(color, 1, Qt.DashLine))
@@ -0,0 +1,110 @@
+# Built-in imports.
+import array
+import time
+
+from typing import Any, Dict, Iterable, List
+
+# Third-party package imports.
+from PyQt5.QtCore import QPointF
+
+# First-party package imports.
+from constants import diagram_constants
+from widgets.arrow import Arrow
+from widgets.diagram_item import DiagramItem
+from widgets.diagram_undo_stack import DiagramCommand
+
+
+class InsertItemsCommand(DiagramCommand):
+    """Command of inserted items and arrows, undoing it removes them and keeps them to be added back."""
+
+    def __init__(self, scene: 'DiagramScene', items: List[DiagramItem], arrows: List[Arrow]):
+        self.scene = scene
+        self.items = items
+        self.arrows = arrows
+
+    def undo(self):
+        self.scene.remove_items(self.items + self.arrows)
+
+    def redo(self):
+        self.scene.add_items(self.items, self.arrows)
+
+    def get_cost(self) -> int:
+        return (
+            diagram_constants.DIAGRAM_UNDO_COMMAND_COST +
+            len(self.items) * diagram_constants.DIAGRAM_UNDO_ITEM_COST +
+            len(self.arrows) * diagram_constants.DIAGRAM_UNDO_ARROW_COST
+        )
+
+
+class RemoveItemsCommand(InsertItemsCommand):
+    """Command of removed items and arrows, the arrows include the ones removed with their items."""
+
+    def undo(self):
+        super(RemoveItemsCommand, self).redo()
+
+    def redo(self):
+        super(RemoveItemsCommand, self).undo()
+
+
+class MoveItemsCommand(DiagramCommand):
+    """Command of moved items, the old and new positions are kept as flat arrays of x and y coordinates."""
+
+    def __init__(self, scene: 'DiagramScene', items: List[DiagramItem], old_positions: List[QPointF]):
+        self.scene = scene
+        self.items = items
+        self.old_positions = self.get_positions_array(old_positions)
+        self.new_positions = self.get_positions_array(item.pos() for item in items)
+        self.push_time = time.monotonic()
+
+    def undo(self):
+        self.set_positions(self.old_positions)
+
+    def redo(self):
+        self.set_positions(self.new_positions)
+
+    def get_cost(self) -> int:
+        return diagram_constants.DIAGRAM_UNDO_COMMAND_COST + len(self.items) * diagram_constants.DIAGRAM_UNDO_POSITION_COST
+
+    def merge_with(self, command: DiagramCommand) -> bool:
+        if (
+            not isinstance(command, MoveItemsCommand) or
+            command.push_time - self.push_time > diagram_constants.DIAGRAM_UNDO_MOVE_MERGE_INTERVAL or
+            command.items != self.items
+        ):
+            return False
+
+        self.new_positions = command.new_positions
+        self.push_time = command.push_time
+        return True
+
+    def set_positions(self, positions: array.array):
+        self.scene.move_items(self.items, positions)
+
+    def get_positions_array(self, positions: Iterable[QPointF]) -> array.array:
+        positions_array = array.array('d')
+        for position in positions:
+            positions_array.append(position.x())
+            positions_array.append(position.y())
+        return positions_array
+
+
+class EditLayerCommand(DiagramCommand):
+    """Command of an item's layer parameters edited from its dialog."""
+
+    def __init__(
+        self,
+        scene: 'DiagramScene',
+        item: DiagramItem,
+        old_layer_parameters: Dict[str, Any],
+        new_layer_parameters: Dict[str, Any],
+    ):
+        self.scene = scene
+        self.item = item
+        self.old_layer_parameters = old_layer_parameters
+        self.new_layer_parameters = new_layer_parameters
+
+    def undo(self):
+        self.scene.set_layer_parameters(self.item, self.old_layer_parameters)
+
+    def redo(self):
+        self.scene.set_layer_parameters(self.item, self.new_layer_parameters)
@@ -0,0 +1,186 @@
+# Built-in imports.
+from typing import Dict, Iterable, List
+
+# First-party package imports.
+from widgets.arrow import Arrow
+from widgets.diagram_item import DiagramItem
+from widgets.diagram_graph_validator import DiagramGraphValidator
+
+
+class DiagramGraph(object):
+    """Class to keep the model graph of a diagram scene up to date while its items and arrows change.
+
+    The graph is kept in the same format graph_utils.create_graph_from_qt_elements builds it, so it can be
+    evaluated and exported directly. Removing a node moves the last node to its index, so every edit costs
+    time proportional to the degree of the edited nodes and not to the size of the graph. Every edit is also
+    forwarded to a DiagramGraphValidator, so the graph errors are known while the diagram is drawn.
+    """
+
+    def __init__(self):
+        self.nodes = list()
+        self.nodes_mapping = dict()
+        self.graph = list()
+        self.edges = dict()
+        self.validator = DiagramGraphValidator()
+
+    def get_validator(self) -> DiagramGraphValidator:
+        return self.validator
+
+    def get_nodes(self) -> List[DiagramItem]:
+        return self.nodes
+
+    def get_nodes_mapping(self) -> Dict[DiagramItem, int]:
+        return self.nodes_mapping
+
+    def get_graph(self) -> List[List[int]]:
+        return self.graph
+
+    def get_edges(self) -> List[Arrow]:
+        return list(self.edges)
+
+    def add_node(self, item: DiagramItem):
+        if item in self.nodes_mapping:
+            return
+
+        self.nodes_mapping[item] = len(self.nodes)
+        self.nodes.append(item)
+        self.graph.append(list())
+        self.validator.add_node(item)
+
+    def remove_node(self, item: DiagramItem) -> List[Arrow]:
+        """Removes the given node and its arrows.
+
+        Returns:
+            List of the arrows that were closing a cycle and are no longer closing one.
+        """
+
+        if item not in self.nodes_mapping:
+            return list()
+
+        for arrow in item.get_arrows():
+            self.remove_edge(arrow)
+
+        self.detach_node(item)
+        return self.validator.remove_node(item)
+
+    def add_edge(self, arrow: Arrow) -> bool:
+        """Adds the given arrow.
+
+        Returns:
+            If the arrow closes a cycle, then the returned value is False. True otherwise.
+        """
+
+        if arrow in self.edges:
+            return not self.validator.is_cycle_edge(arrow)
+
+        self.edges[arrow] = None
+        start_index = self.nodes_mapping[arrow.get_start_item()]
+        self.graph[start_index].append(self.nodes_mapping[arrow.get_end_item()])
+        return self.validator.add_edge(arrow)
+
+    def remove_edge(self, arrow: Arrow) -> List[Arrow]:
+        """Removes the given arrow.
+
+        Returns:
+            List of the arrows that were closing a cycle and are no longer closing one.
+        """
+
+        if arrow not in self.edges:
+            return list()
+
+        self.detach_edge(arrow)
+        return self.validator.remove_edge(arrow)
+
+    def add_batch(self, items: Iterable[DiagramItem], arrows: Iterable[Arrow]) -> List[Arrow]:
+        """Adds the given nodes then the given arrows at once, the arrows' nodes must be in the graph or given.
+
+        Returns:
+            List of the arrows that close a cycle.
+        """
+
+        added_items = list()
+        for item in items:
+            if item not in self.nodes_mapping:
+                self.nodes_mapping[item] = len(self.nodes)
+                self.nodes.append(item)
+                self.graph.append(list())
+                added_items.append(item)
+
+        added_arrows = list()
+        for arrow in arrows:
+            if arrow not in self.edges:
+                self.edges[arrow] = None
+                start_index = self.nodes_mapping[arrow.get_start_item()]
+                self.graph[start_index].append(self.nodes_mapping[arrow.get_end_item()])
+                added_arrows.append(arrow)
+
+        return self.validator.add_batch(added_items, added_arrows)
+
+    def remove_batch(self, items: Iterable[DiagramItem], arrows: Iterable[Arrow]) -> List[Arrow]:
+        """Removes the given nodes with their arrows, and the given arrows, at once.
+
+        Removing the arrows one by one costs the out degree of their start nodes each. When that adds up to more
+        than the size of the graph, which happens when many arrows of the same node are removed, the remaining
+        graph is rebuilt once instead.
+
+        Returns:
+            List of the arrows that were closing a cycle and are no longer closing one.
+        """
+
+        items = [item for item in dict.fromkeys(items) if item in self.nodes_mapping]
+        arrows = dict.fromkeys(arrow for arrow in arrows if arrow in self.edges)
+        for item in items:
+            arrows.update(dict.fromkeys(arrow for arrow in item.get_arrows() if arrow in self.edges))
+
+        removal_cost = sum(len(self.graph[self.nodes_mapping[arrow.get_start_item()]]) for arrow in arrows)
+        if removal_cost > len(self.nodes) + len(self.edges):
+            self.compact(items, arrows)
+        else:
+            for arrow in arrows:
+                self.detach_edge(arrow)
+            for item in items:
+                self.detach_node(item)
+
+        return self.validator.remove_batch(items, arrows)
+
+    def clear(self):
+        self.nodes.clear()
+        self.nodes_mapping.clear()
+        self.graph.clear()
+        self.edges.clear()
+        self.validator.clear()
+
+    def detach_node(self, item: DiagramItem):
+        index = self.nodes_mapping.pop(item)
+        last_index = len(self.nodes) - 1
+
+        if index != last_index:
+            moved_item = self.nodes[last_index]
+            self.nodes[index] = moved_item
+            self.graph[index] = self.graph[last_index]
+            self.nodes_mapping[moved_item] = index
+
+            for arrow in moved_item.get_arrows():
+                if arrow in self.edges and arrow.get_end_item() is moved_item:
+                    parent_children = self.graph[self.nodes_mapping[arrow.get_start_item()]]
+                    parent_children[parent_children.index(last_index)] = index
+
+        self.nodes.pop()
+        self.graph.pop()
+
+    def detach_edge(self, arrow: Arrow):
+        del self.edges[arrow]
+        start_index = self.nodes_mapping[arrow.get_start_item()]
+        self.graph[start_index].remove(self.nodes_mapping[arrow.get_end_item()])
+
+    def compact(self, items: List[DiagramItem], arrows: Dict[Arrow, None]):
+        for arrow in arrows:
+            del self.edges[arrow]
+
+        removed_items = set(items)
+        self.nodes = [node for node in self.nodes if node not in removed_items]
+        self.nodes_mapping = {node: index for index, node in enumerate(self.nodes)}
+        self.graph = [list() for _ in self.nodes]
+        for arrow in self.edges:
+            start_index = self.nodes_mapping[arrow.get_start_item()]
+            self.graph[start_index].append(self.nodes_mapping[arrow.get_end_item()])
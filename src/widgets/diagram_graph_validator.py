@@ -0,0 +1,341 @@
+# Built-in imports.
+from typing import Dict, Iterable, List, Set, Union
+
+# First-party package imports.
+from constants import diagram_constants
+from constants import main_window_constants
+from widgets.arrow import Arrow
+from widgets.diagram_item import DiagramItem
+from frameworks.layer_interface import LayerInterface
+
+
+class DiagramGraphValidator(object):
+    """Class to validate the model graph of a diagram incrementally while its items and arrows change.
+
+    Cycles are detected with the Pearce-Kelly online topological order algorithm: every node keeps a position in
+    a topological order of the acyclic part of the graph, and adding an arrow only searches and reorders the nodes
+    between its two ends. An arrow that would close a cycle is kept aside as a cycle edge, and cycle edges are
+    tried again whenever an arrow or a node is removed.
+
+    Reference: https://www.doc.ic.ac.uk/~phjk/Publications/DynamicTopoSortAlg-JEA-07.pdf.
+
+    Connected components are tracked with a union-find structure. Union-find can not split components, so removing
+    an arrow or a node marks it as outdated and it is rebuilt the next time the components are needed.
+
+    The layers checking their own parents, like block layers, are kept aside and checked last, like the export does.
+    """
+
+    def __init__(self):
+        self.order = dict()
+        self.next_order = 0
+        self.children = dict()
+        self.parents = dict()
+        self.cycle_edges = dict()
+        self.in_degrees = dict()
+        self.non_input_root_nodes = dict()
+        self.graph_error_nodes = dict()
+        self.components_parents = dict()
+        self.components_count = 0
+        self.is_components_outdated = False
+
+    def add_node(self, item: DiagramItem):
+        self.order[item] = self.next_order
+        self.next_order += 1
+        self.children[item] = dict()
+        self.parents[item] = dict()
+        self.in_degrees[item] = 0
+        framework_layer = item.get_framework_layer()
+        if not framework_layer.IS_INPUT_LAYER:
+            self.non_input_root_nodes[item] = None
+        if type(framework_layer).layer_graph_error is not LayerInterface.layer_graph_error:
+            self.graph_error_nodes[item] = None
+
+        if not self.is_components_outdated:
+            self.components_parents[item] = item
+            self.components_count += 1
+
+    def remove_node(self, item: DiagramItem) -> List[Arrow]:
+        """Removes the given node, its arrows must be removed before.
+
+        Returns:
+            List of the cycle edges that are no longer closing a cycle.
+        """
+
+        self.detach_node(item)
+        return self.accept_cycle_edges()
+
+    def add_edge(self, arrow: Arrow) -> bool:
+        """Adds the given arrow to the validated graph.
+
+        Returns:
+            If the arrow closes a cycle, then the returned value is False. True otherwise.
+        """
+
+        end_item = arrow.get_end_item()
+        self.in_degrees[end_item] += 1
+        self.non_input_root_nodes.pop(end_item, None)
+
+        if not self.is_components_outdated:
+            self.union_components(arrow.get_start_item(), end_item)
+
+        if self.accept_edge(arrow):
+            return True
+
+        self.cycle_edges[arrow] = None
+        return False
+
+    def remove_edge(self, arrow: Arrow) -> List[Arrow]:
+        """Removes the given arrow from the validated graph.
+
+        Returns:
+            List of the cycle edges that are no longer closing a cycle.
+        """
+
+        if self.detach_edge(arrow):
+            return self.accept_cycle_edges()
+        return list()
+
+    def add_batch(self, items: Iterable[DiagramItem], arrows: List[Arrow]) -> List[Arrow]:
+        """Adds the given nodes then the given arrows, the arrows' nodes must be added or given.
+
+        When many arrows are added and none of them closes a cycle, the nodes are put in a topological order of the
+        whole graph first, so adding every arrow after it costs constant time.
+
+        Returns:
+            List of the arrows that close a cycle.
+        """
+
+        for item in items:
+            self.add_node(item)
+
+        if len(arrows) >= diagram_constants.DIAGRAM_BATCH_ORDER_ARROWS_COUNT:
+            added_children = dict()
+            for arrow in arrows:
+                added_children.setdefault(arrow.get_start_item(), set()).add(arrow.get_end_item())
+
+            order = self.get_topological_order(added_children)
+            if order is not None:
+                self.order = {item: index for index, item in enumerate(order)}
+                self.next_order = len(order)
+
+        return [arrow for arrow in arrows if not self.add_edge(arrow)]
+
+    def remove_batch(self, items: Iterable[DiagramItem], arrows: Iterable[Arrow]) -> List[Arrow]:
+        """Removes the given arrows then the given nodes, all the arrows of the nodes must be given.
+
+        Returns:
+            List of the cycle edges that are no longer closing a cycle.
+        """
+
+        for arrow in arrows:
+            self.detach_edge(arrow)
+        for item in items:
+            self.detach_node(item)
+        return self.accept_cycle_edges()
+
+    def is_cycle_edge(self, arrow: Arrow) -> bool:
+        return arrow in self.cycle_edges
+
+    def get_components_count(self) -> int:
+        if self.is_components_outdated:
+            self.rebuild_components()
+        return self.components_count
+
+    def get_error_msg(self, diagram_dir_path: Union[str, None] = None) -> Union[str, None]:
+        """Checks the validated graph against the model graph rules in the same order the export does.
+
+        Args:
+            diagram_dir_path: String represents the directory of the diagram file, the relative file paths of the
+                layers are resolved against it. The current directory is used if None.
+
+        Returns:
+            If the graph is not valid, then the returned value is the error message. None otherwise.
+        """
+
+        if not self.order:
+            return None
+        if self.get_components_count() > 1:
+            return main_window_constants.MODEL_GRAPH_MULTIPLE_COMPONENTS_ERROR_MSG
+        if self.cycle_edges:
+            return main_window_constants.MODEL_GRAPH_CYCLE_ERROR_MSG
+        if self.non_input_root_nodes:
+            return main_window_constants.MODEL_GRAPH_ROOT_NODE_IS_NOT_INPUT_ERROR_MSG
+        for item in self.graph_error_nodes:
+            error_msg = item.get_framework_layer().layer_graph_error(self.get_parents_layers(item), diagram_dir_path)
+            if error_msg:
+                return error_msg
+        return None
+
+    def get_parents_layers(self, item: DiagramItem) -> List[LayerInterface]:
+        """Returns the layers of the given node's parents, once per arrow, in the order the arrows were accepted.
+
+        The export gives the parents in the model graph's node order instead, so a layer whose check depends on its
+        parents' order, like a block layer, has to order them itself.
+        """
+
+        return [
+            parent.get_framework_layer()
+            for parent, edges_count in self.parents[item].items()
+            for _ in range(edges_count)
+        ]
+
+    def clear(self):
+        self.__init__()
+
+    def detach_node(self, item: DiagramItem):
+        del self.order[item]
+        del self.children[item]
+        del self.parents[item]
+        del self.in_degrees[item]
+        self.non_input_root_nodes.pop(item, None)
+        self.graph_error_nodes.pop(item, None)
+        self.is_components_outdated = True
+
+    def detach_edge(self, arrow: Arrow) -> bool:
+        """Removes the given arrow without trying the cycle edges again.
+
+        Returns:
+            If the arrow was closing a cycle, then the returned value is False. True otherwise.
+        """
+
+        start_item = arrow.get_start_item()
+        end_item = arrow.get_end_item()
+
+        self.in_degrees[end_item] -= 1
+        if self.in_degrees[end_item] == 0 and not end_item.get_framework_layer().IS_INPUT_LAYER:
+            self.non_input_root_nodes[end_item] = None
+
+        self.is_components_outdated = True
+
+        if arrow in self.cycle_edges:
+            del self.cycle_edges[arrow]
+            return False
+
+        self.decrement_edge_count(self.children[start_item], end_item)
+        self.decrement_edge_count(self.parents[end_item], start_item)
+        return True
+
+    # Online topological order methods.
+    def accept_edge(self, arrow: Arrow) -> bool:
+        start_item = arrow.get_start_item()
+        end_item = arrow.get_end_item()
+
+        # A self-loop has both bounds equal, so the search below would never see it closing a cycle.
+        if start_item is end_item:
+            return False
+
+        lower_bound = self.order[end_item]
+        upper_bound = self.order[start_item]
+        if lower_bound < upper_bound:
+            forward_items = self.search_forward(end_item, upper_bound)
+            if forward_items is None:
+                return False
+            backward_items = self.search_backward(start_item, lower_bound)
+            self.reorder(backward_items, forward_items)
+
+        self.children[start_item][end_item] = self.children[start_item].get(end_item, 0) + 1
+        self.parents[end_item][start_item] = self.parents[end_item].get(start_item, 0) + 1
+        return True
+
+    def get_topological_order(
+        self,
+        added_children: Dict[DiagramItem, Set[DiagramItem]],
+    ) -> Union[List[DiagramItem], None]:
+        """Sorts the nodes by Kahn's algorithm over the acyclic arrows and the given added ones.
+
+        Returns:
+            List of the sorted nodes, or None if the added arrows close a cycle.
+        """
+
+        in_degrees = {item: len(parents) for item, parents in self.parents.items()}
+        for item, children in added_children.items():
+            for child in children:
+                if child not in self.children[item]:
+                    in_degrees[child] += 1
+
+        # Roots are taken in their current order, so an already sorted graph keeps its order.
+        order = sorted((item for item, in_degree in in_degrees.items() if in_degree == 0), key=self.order.__getitem__)
+        for item in order:
+            children = self.children[item]
+            for child in children:
+                in_degrees[child] -= 1
+                if in_degrees[child] == 0:
+                    order.append(child)
+            for child in added_children.get(item, ()):
+                if child not in children:
+                    in_degrees[child] -= 1
+                    if in_degrees[child] == 0:
+                        order.append(child)
+
+        if len(order) != len(in_degrees):
+            return None
+        return order
+
+    def accept_cycle_edges(self) -> List[Arrow]:
+        accepted_edges = [arrow for arrow in self.cycle_edges if self.accept_edge(arrow)]
+        for arrow in accepted_edges:
+            del self.cycle_edges[arrow]
+        return accepted_edges
+
+    def search_forward(self, item: DiagramItem, upper_bound: int) -> Union[List[DiagramItem], None]:
+        visited = {item}
+        stack = [item]
+        while stack:
+            for child in self.children[stack.pop()]:
+                child_order = self.order[child]
+                if child_order == upper_bound:
+                    return None
+                if child_order < upper_bound and child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+        return list(visited)
+
+    def search_backward(self, item: DiagramItem, lower_bound: int) -> List[DiagramItem]:
+        visited = {item}
+        stack = [item]
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if self.order[parent] > lower_bound and parent not in visited:
+                    visited.add(parent)
+                    stack.append(parent)
+        return list(visited)
+
+    def reorder(self, backward_items: List[DiagramItem], forward_items: List[DiagramItem]):
+        backward_items.sort(key=self.order.__getitem__)
+        forward_items.sort(key=self.order.__getitem__)
+
+        items = backward_items + forward_items
+        orders = sorted(self.order[item] for item in items)
+        for item, order in zip(items, orders):
+            self.order[item] = order
+
+    def decrement_edge_count(self, edge_counts: Dict[DiagramItem, int], item: DiagramItem):
+        edge_counts[item] -= 1
+        if edge_counts[item] == 0:
+            del edge_counts[item]
+
+    # Union-find methods.
+    def find_component(self, item: DiagramItem) -> DiagramItem:
+        while self.components_parents[item] is not item:
+            self.components_parents[item] = self.components_parents[self.components_parents[item]]
+            item = self.components_parents[item]
+        return item
+
+    def union_components(self, first_item: DiagramItem, second_item: DiagramItem):
+        first_root = self.find_component(first_item)
+        second_root = self.find_component(second_item)
+        if first_root is not second_root:
+            self.components_parents[second_root] = first_root
+            self.components_count -= 1
+
+    def rebuild_components(self):
+        self.components_parents = {item: item for item in self.order}
+        self.components_count = len(self.order)
+        self.is_components_outdated = False
+
+        for item, children in self.children.items():
+            for child in children:
+                self.union_components(item, child)
+
+        for arrow in self.cycle_edges:
+            self.union_components(arrow.get_start_item(), arrow.get_end_item())
@@ -2,70 +2,163 @@
 from typing import List
 
 # Third-party package imports.
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QPainter, QPen, QStaticText
 from PyQt5.QtWidgets import (
     QGraphicsItem,
     QGraphicsPolygonItem,
     QGraphicsSceneContextMenuEvent,
-    QGraphicsSimpleTextItem,
     QMenu,
+    QStyleOptionGraphicsItem,
 )
 
 # First-party package imports.
+from constants import diagram_constants
 from frameworks.layer_interface import LayerInterface
 
 
+def is_low_detail(painter: QPainter, option: QStyleOptionGraphicsItem) -> bool:
+    return option.levelOfDetailFromTransform(painter.worldTransform()) < diagram_constants.DIAGRAM_LOW_DETAIL_LEVEL
+
+
+class DiagramItemImage(object):
+    """Class to hold the polygon and label shared by the diagram items of one layer class."""
+
+    def __init__(self, framework_layer: LayerInterface):
+        self.polygon = framework_layer.layer_image()
+
+        # Plain coordinates of the polygon, the arrows' geometry is computed from them.
+        self.polygon_points = [(point.x(), point.y()) for point in self.polygon]
+
+        # Bounds of the polygon with a margin wider than any pen, items further apart than them never collide.
+        bounding_rect = self.polygon.boundingRect()
+        margin = diagram_constants.DIAGRAM_ITEM_COLLISION_MARGIN
+        self.collision_bounds = (
+            bounding_rect.left() - margin,
+            bounding_rect.top() - margin,
+            bounding_rect.right() + margin,
+            bounding_rect.bottom() + margin,
+        )
+
+        self.text_item = QStaticText(framework_layer.layer_name())
+        self.text_item.setPerformanceHint(QStaticText.AggressiveCaching)
+        size = self.text_item.size()
+        center = self.polygon.boundingRect().center()
+        self.text_item_position = QPointF(center.x() - size.width() / 2.0, center.y() - size.height() / 2.0)
+        self.low_detail_rect = self.polygon.boundingRect()
+
+
+# Laying out the label and reading the polygon cost more than the rest of an item, so they are done once per layer
+# class, a layer's name and image are the same for all the instances of its class.
+diagram_items_images = dict()
+
+
+def get_diagram_item_image(framework_layer: LayerInterface) -> DiagramItemImage:
+    layer_class = framework_layer.__class__
+    diagram_item_image = diagram_items_images.get(layer_class)
+    if diagram_item_image is None:
+        diagram_item_image = diagram_items_images[layer_class] = DiagramItemImage(framework_layer)
+    return diagram_item_image
+
+
 class DiagramItem(QGraphicsPolygonItem):
-    def __init__(self, framework_layer: LayerInterface, context_menu: QMenu, parent: QGraphicsItem = None):
+    def __init__(
+        self,
+        framework_layer: LayerInterface,
+        context_menu: QMenu,
+        parent: QGraphicsItem = None,
+        position: QPointF = None,
+    ):
         super(DiagramItem, self).__init__(parent)
 
-        self.arrows = list()
+        # Placed before it sends its geometry changes, so placing it does not call itemChange.
+        if position is not None:
+            self.setPos(position)
+
+        # Used as an ordered set, so arrows are detached in constant time.
+        self.arrows = dict()
         self.framework_layer = framework_layer
         self.context_menu = context_menu
-        self.polygon = self.framework_layer.layer_image()
 
-        self.create_text_item()
+        # Given by the scene when the item is first added, it stays the same if the item is removed and added back.
+        self.item_id = None
 
-        self.setPolygon(self.polygon)
-        self.setFlag(QGraphicsItem.ItemIsMovable, True)
-        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        diagram_item_image = get_diagram_item_image(framework_layer)
+        self.polygon = diagram_item_image.polygon
+        self.polygon_points = diagram_item_image.polygon_points
+        self.collision_bounds = diagram_item_image.collision_bounds
 
-    def create_text_item(self):
-        self.text_item = QGraphicsSimpleTextItem(self.framework_layer.layer_name(), self)
-        rect = self.text_item.boundingRect()
-        rect.moveCenter(self.boundingRect().center())
-        self.text_item.setPos(rect.topLeft())
+        self.create_text_item(diagram_item_image)
+
+        self.setPolygon(self.polygon)
+        self.setFlags(
+            QGraphicsItem.ItemIsMovable |
+            QGraphicsItem.ItemIsSelectable |
+            QGraphicsItem.ItemSendsGeometryChanges
+        )
+
+    def create_text_item(self, diagram_item_image: DiagramItemImage):
+        """Prepares the item's label, it is drawn by the item itself so zoomed out diagrams can skip it."""
+
+        self.text_item = diagram_item_image.text_item
+        self.text_item_position = diagram_item_image.text_item_position
+        self.low_detail_rect = diagram_item_image.low_detail_rect
+
+    def is_colliding_with(self, item: 'DiagramItem', dx: float, dy: float) -> bool:
+        """Checks whether the item collides with the given one, Qt's shape check only runs if their bounds overlap.
+
+        Args:
+            item: The other diagram item.
+            dx: Float represents the horizontal distance from the other item's position to this one's.
+            dy: Float represents the vertical distance from the other item's position to this one's.
+        """
+
+        left, top, right, bottom = self.collision_bounds
+        item_left, item_top, item_right, item_bottom = item.collision_bounds
+        if left + dx > item_right or right + dx < item_left or top + dy > item_bottom or bottom + dy < item_top:
+            return False
+        return self.collidesWithItem(item)
 
     def get_arrows(self) -> List['Arrow']:
-        return self.arrows
+        return list(self.arrows)
 
     def get_framework_layer(self) -> LayerInterface:
         return self.framework_layer
 
     def add_arrow(self, arrow):
-        self.arrows.append(arrow)
+        self.arrows[arrow] = None
 
     def remove_arrow(self, arrow):
-        try:
-            self.arrows.remove(arrow)
-        except ValueError:
-            pass
+        self.arrows.pop(arrow, None)
 
     def remove_arrows(self):
-        for arrow in self.arrows[:]:
-            arrow.get_start_item().remove_arrow(arrow)
-            arrow.get_end_item().remove_arrow(arrow)
-            self.scene().removeItem(arrow)
+        self.scene().remove_items(list(self.arrows))
 
     def mouseDoubleClickEvent(self, event):
-        self.framework_layer.layer_config_dialog()
+        self.scene().edit_diagram_item(self)
 
     def contextMenuEvent(self, event: QGraphicsSceneContextMenuEvent):
         self.scene().clearSelection()
         self.setSelected(True)
         self.context_menu.exec_(event.screenPos())
 
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        if is_low_detail(painter, option):
+            painter.setPen(QPen(self.pen().color(), 0, Qt.DashLine if self.isSelected() else Qt.SolidLine))
+            painter.setBrush(self.brush())
+            painter.drawRect(self.low_detail_rect)
+            return
+
+        super(DiagramItem, self).paint(painter, option, widget)
+        painter.setPen(Qt.black)
+        painter.drawStaticText(self.text_item_position, self.text_item)
+
     def itemChange(self, change: int, value: int) -> int:
-        if change == QGraphicsItem.ItemPositionChange:
-            for arrow in self.arrows:
-                arrow.updatePosition()
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            scene = self.scene()
+            if scene is not None:
+                scene.mark_item_moved(self)
+            else:
+                for arrow in self.arrows:
+                    arrow.updatePosition()
         return value
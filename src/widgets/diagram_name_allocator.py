@@ -0,0 +1,121 @@
+# Built-in imports.
+from typing import Iterable, List, Union
+
+# First-party package imports.
+from utils import layer_names_utils
+from constants import main_window_constants
+
+
+class DiagramNameAllocator(object):
+    """Class to hand out unique layer names that are valid Python identifiers, like dense_1 and dense_2.
+
+    Every prefix has a counter that only goes up, so a new name is found in constant time apart from the names
+    taken by loaded or renamed layers, which are skipped once.
+    """
+
+    def __init__(self):
+        # Used as an ordered set, of the layers' names and of the other names they take in the model code.
+        self.names = dict()
+        # Other names taken by the layers, like the names of a block layer's inner layers, by layer name.
+        self.expanded_names = dict()
+        self.prefixes_counters = dict()
+
+    def allocate_name(self, prefix: str, names_suffixes: Iterable[str] = ()) -> str:
+        counter = self.prefixes_counters.get(prefix, 0)
+        while True:
+            counter += 1
+            name = '{}_{}'.format(prefix, counter)
+            if name not in self.names and self.get_name_error(name) is None:
+                expanded_names = self.get_expanded_names(name, names_suffixes)
+                if not any(expanded_name in self.names for expanded_name in expanded_names):
+                    break
+
+        self.prefixes_counters[prefix] = counter
+        self.take_name(name, expanded_names)
+        return name
+
+    def add_name(self, name: str, prefix: str, names_suffixes: Iterable[str] = ()) -> str:
+        """Takes the given name if it is valid and free, otherwise allocates a new one with the given prefix.
+
+        Args:
+            name: The layer name to take.
+            prefix: The layer name prefix, used if the name can not be taken.
+            names_suffixes: The suffixes of the other names the layer takes, see LayerInterface.layer_names_suffixes.
+
+        Returns:
+            The taken name.
+        """
+
+        if not isinstance(name, str) or name in self.names or self.get_name_error(name) is not None:
+            return self.allocate_name(prefix, names_suffixes)
+
+        expanded_names = self.get_expanded_names(name, names_suffixes)
+        if any(expanded_name in self.names for expanded_name in expanded_names):
+            return self.allocate_name(prefix, names_suffixes)
+
+        self.take_name(name, expanded_names)
+        return name
+
+    def remove_name(self, name: str):
+        self.names.pop(name, None)
+        for expanded_name in self.expanded_names.pop(name, ()):
+            self.names.pop(expanded_name, None)
+
+    def rename(self, old_name: str, new_name: str, names_suffixes: Iterable[str] = ()) -> Union[str, None]:
+        """Frees the old name and takes the new one, if the new one and its other names are valid and free.
+
+        Returns:
+            The error message if the new name can not be taken, or None.
+        """
+
+        old_expanded_names = self.expanded_names.get(old_name, [])
+        expanded_names = self.get_expanded_names(new_name, names_suffixes)
+        if new_name == old_name and expanded_names == old_expanded_names:
+            return None
+
+        error_msg = self.get_name_error(new_name)
+        if error_msg is not None:
+            return error_msg
+
+        self.remove_name(old_name)
+        if new_name in self.names:
+            error_msg = main_window_constants.LAYER_NAME_TAKEN_ERROR_MSG.format(new_name)
+        else:
+            for expanded_name in expanded_names:
+                if expanded_name in self.names:
+                    error_msg = main_window_constants.LAYER_NAME_EXPANDED_TAKEN_ERROR_MSG.format(expanded_name)
+                    break
+
+        if error_msg is not None:
+            self.take_name(old_name, old_expanded_names)
+            return error_msg
+
+        self.take_name(new_name, expanded_names)
+        return None
+
+    def has_name(self, name: str) -> bool:
+        return name in self.names
+
+    def clear(self):
+        self.names.clear()
+        self.expanded_names.clear()
+        self.prefixes_counters.clear()
+
+    def get_name_error(self, name: str) -> Union[str, None]:
+        """Checks whether the given name can name a layer, whether or not it is taken.
+
+        Returns:
+            The error message if the name is not valid, or None.
+        """
+
+        return layer_names_utils.get_layer_name_error(name)
+
+    def get_expanded_names(self, name: str, names_suffixes: Iterable[str]) -> List[str]:
+        return ['{}_{}'.format(name, suffix) for suffix in names_suffixes]
+
+    def take_name(self, name: str, expanded_names: List[str]):
+        self.names[name] = None
+        if expanded_names:
+            self.expanded_names[name] = expanded_names
+            for expanded_name in expanded_names:
+                self.names[expanded_name] = None
@@ -1,19 +1,32 @@
+# Built-in imports.
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
+
 # Third-party package imports.
-from PyQt5.QtCore import Qt, QLineF, pyqtSignal
+from PyQt5.QtCore import Qt, QLineF, QPointF, QTimer, pyqtSignal
 from PyQt5.QtGui import QPen
 from PyQt5.QtWidgets import (
     QGraphicsItem,
     QGraphicsLineItem,
     QGraphicsScene,
     QGraphicsSceneMouseEvent,
-    QGraphicsSimpleTextItem,
     QMenu,
 )
 
 # First-party package imports.
 from utils import frameworks_utils
+from constants import diagram_constants
+from utils import diagram_file_utils
+from utils.diagram_file_utils import Diagram
+from utils.diagram_journal import DiagramJournal
+from frameworks.layer_interface import LayerInterface
 from widgets.arrow import Arrow
+from widgets.diagram_graph import DiagramGraph
+from widgets.diagram_commands import EditLayerCommand, InsertItemsCommand, MoveItemsCommand, RemoveItemsCommand
 from widgets.diagram_item import DiagramItem
+from widgets.diagram_name_allocator import DiagramNameAllocator
+from widgets.diagram_spatial_index import DiagramSpatialIndex
+from widgets.diagram_undo_stack import DiagramCommand, DiagramUndoStack
+from widgets.diagram_z_order import DiagramZOrder
 
 
 class DiagramScene(QGraphicsScene):
@@ -21,38 +34,131 @@ class DiagramScene(QGraphicsScene):
 
     item_inserted = pyqtSignal(DiagramItem)
 
+    diagram_graph_changed = pyqtSignal()
+
+    layer_name_error = pyqtSignal(str)
+
+    undo_stack_changed = pyqtSignal()
+
     def __init__(self, context_menu: QMenu, parent: QGraphicsItem = None):
         super(DiagramScene, self).__init__(parent)
 
         self.context_menu = context_menu
         self.framework_name = frameworks_utils.get_sorted_frameworks_list()[0]
+        # Directory of the diagram file, the layers' relative file paths are resolved against it, see MainWindow.
+        self.diagram_dir_path = None
         self.mode = self.move_item
         self.item_type = None
         self.line = None
+        self.diagram_graph = DiagramGraph()
+        self.spatial_index = DiagramSpatialIndex()
+        self.z_order = DiagramZOrder()
+        self.name_allocator = DiagramNameAllocator()
+        self.undo_stack = DiagramUndoStack()
+        self.journal = None
+        self.next_item_id = 0
+
+        # Positions of the dragged items when the drag started, to record their move once it ends.
+        self.drag_start_positions = None
+
+        # Diagram items and arrows in the order they were added to the scene, see remove_items.
+        self.scene_items = dict()
+
+        # Many edits can happen in one event loop tick, the graph change is reported once after them.
+        self.diagram_graph_changed_timer = QTimer()
+        self.diagram_graph_changed_timer.setSingleShot(True)
+        self.diagram_graph_changed_timer.setInterval(0)
+        self.diagram_graph_changed_timer.timeout.connect(self.diagram_graph_changed)
+
+        # Dragging many items moves every arrow many times in one event loop tick, arrows are updated once after them.
+        self.moved_items = dict()
+        self.moved_items_timer = QTimer()
+        self.moved_items_timer.setSingleShot(True)
+        self.moved_items_timer.setInterval(0)
+        self.moved_items_timer.timeout.connect(self.update_moved_items)
+
+        # Rendering settings, see DiagramViewSettings.
+        self.item_index_method = QGraphicsScene.BspTreeIndex
+        self.bulk_move_items_count = diagram_constants.DIAGRAM_BULK_MOVE_ITEMS_COUNT
+        self.is_scene_rect_growing = True
+        self.bulk_changes_count = 0
+        self.is_bulk_moving = False
 
         # Could be used later to support items & lines coloring.
         self.item_color = Qt.white
         self.line_color = Qt.black
+        self.cycle_line_color = Qt.red
 
     def set_framework_name(self, framework_name: str):
         self.framework_name = framework_name
 
+    def set_diagram_dir_path(self, diagram_dir_path: Union[str, None]):
+        self.diagram_dir_path = diagram_dir_path
+
     def set_mode(self, mode: int):
         self.mode = mode
 
     def set_item_type(self, item_type: int):
         self.item_type = item_type
 
+    def set_item_index_method(self, item_index_method: int):
+        self.item_index_method = item_index_method
+        if not self.bulk_changes_count:
+            self.setItemIndexMethod(item_index_method)
+
+    def set_bulk_move_items_count(self, bulk_move_items_count: int):
+        self.bulk_move_items_count = bulk_move_items_count
+
+    def set_scene_rect_growing(self, is_scene_rect_growing: bool):
+        self.is_scene_rect_growing = is_scene_rect_growing
+
+    def get_diagram_graph(self) -> DiagramGraph:
+        return self.diagram_graph
+
+    def get_undo_stack(self) -> DiagramUndoStack:
+        return self.undo_stack
+
+    def set_journal(self, journal: Union[DiagramJournal, None]):
+        """Sets the journal the edits are written to from now on, None stops writing them."""
+
+        self.journal = journal
+
+    def push_command(self, command: DiagramCommand):
+        self.undo_stack.push(command)
+        self.undo_stack_changed.emit()
+
+    def undo(self):
+        self.undo_stack.undo()
+        self.undo_stack_changed.emit()
+
+    def redo(self):
+        self.undo_stack.redo()
+        self.undo_stack_changed.emit()
+
+    def begin_bulk_change(self):
+        """Drops the item index until the matching end_bulk_change call.
+
+        Keeping the index up to date costs a lookup per changed item, rebuilding it once after many changes is cheaper.
+        """
+
+        if not self.bulk_changes_count:
+            self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.bulk_changes_count += 1
+
+    def end_bulk_change(self):
+        self.bulk_changes_count -= 1
+        if not self.bulk_changes_count:
+            self.setItemIndexMethod(self.item_index_method)
+
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent):
         if event.button() != Qt.LeftButton:
             return
 
         if self.mode == self.insert_item:
-            layers = frameworks_utils.get_framework_layers(self.framework_name)
-            item = DiagramItem(layers[self.item_type](), self.context_menu)
-            item.setBrush(self.item_color)
-            item.setPos(event.scenePos())
-            self.addItem(item)
+            layer_entries = frameworks_utils.get_framework_layer_entries(self.framework_name)
+            layer_class = layer_entries[self.item_type].get_layer_class()
+            item = self.create_diagram_item(layer_class(), event.scenePos())
+            self.push_command(InsertItemsCommand(self, [item], []))
             self.item_inserted.emit(item)
         elif self.mode == self.insert_line:
             self.line = QGraphicsLineItem(QLineF(event.scenePos(), event.scenePos()))
@@ -61,6 +167,19 @@ class DiagramScene(QGraphicsScene):
 
         super(DiagramScene, self).mousePressEvent(event)
 
+        if self.mode == self.move_item and self.mouseGrabberItem() is not None:
+            self.drag_start_positions = {
+                item: item.pos() for item in self.selectedItems() if isinstance(item, DiagramItem)
+            }
+
+        if (
+            self.mode == self.move_item and
+            self.bulk_move_items_count and
+            len(self.selectedItems()) >= self.bulk_move_items_count
+        ):
+            self.is_bulk_moving = True
+            self.begin_bulk_change()
+
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent):
         if self.mode == self.insert_line and self.line:
             new_line = QLineF(self.line.line().p1(), event.scenePos())
@@ -70,42 +189,482 @@ class DiagramScene(QGraphicsScene):
 
     def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent):
         if self.mode == self.insert_line and self.line:
-            start_items = self.items(self.line.line().p1())
-            if len(start_items) and start_items[0] == self.line:
-                start_items.pop(0)
-
-            end_items = self.items(self.line.line().p2())
-            if len(end_items) and end_items[0] == self.line:
-                end_items.pop(0)
-
+            line = self.line.line()
             self.removeItem(self.line)
             self.line = None
 
-            if len(start_items) and isinstance(start_items[0], QGraphicsSimpleTextItem):
-                start_items[0] = start_items[0].parentItem()
-
-            if len(end_items) and isinstance(end_items[0], QGraphicsSimpleTextItem):
-                end_items[0] = end_items[0].parentItem()
-
-            if (
-                len(start_items) and
-                len(end_items) and
-                isinstance(start_items[0], DiagramItem) and
-                isinstance(end_items[0], DiagramItem) and
-                start_items[0] != end_items[0]
-            ):
-                start_item = start_items[0]
-                end_item = end_items[0]
-                arrow = Arrow(start_item, end_item)
-                start_item.add_arrow(arrow)
-                end_item.add_arrow(arrow)
-                arrow.setZValue(-1000.0)
-                self.addItem(arrow)
-                arrow.updatePosition()
+            start_item = self.find_diagram_item(line.p1())
+            end_item = self.find_diagram_item(line.p2())
+            if start_item is not None and end_item is not None and start_item is not end_item:
+                arrow = self.create_arrow(start_item, end_item)
+                self.push_command(InsertItemsCommand(self, [], [arrow]))
 
         self.line = None
         super(DiagramScene, self).mouseReleaseEvent(event)
 
+        if self.drag_start_positions:
+            moved_items = [
+                item for item, position in self.drag_start_positions.items()
+                if item.scene() is self and item.pos() != position
+            ]
+            if moved_items:
+                self.journal_moved_items(moved_items)
+                self.push_command(MoveItemsCommand(
+                    self,
+                    moved_items,
+                    [self.drag_start_positions[item] for item in moved_items],
+                ))
+        self.drag_start_positions = None
+
+        if self.is_bulk_moving:
+            self.is_bulk_moving = False
+            self.end_bulk_change()
+
+    def create_diagram_item(self, framework_layer: LayerInterface, position: QPointF) -> DiagramItem:
+        item = self.new_diagram_item(framework_layer, position)
+        self.attach_diagram_item(item)
+        self.grow_scene_rect([item])
+        self.diagram_graph.add_node(item)
+        self.journal_added_items([item], [])
+        self.diagram_graph_changed_timer.start()
+        return item
+
+    def create_arrow(self, start_item: DiagramItem, end_item: DiagramItem) -> Arrow:
+        arrow = Arrow(start_item, end_item)
+        arrow.updatePosition()
+        self.attach_arrow(arrow)
+        if not self.diagram_graph.add_edge(arrow):
+            arrow.set_color(self.cycle_line_color)
+        self.journal_added_items([], [arrow])
+        self.diagram_graph_changed_timer.start()
+        return arrow
+
+    def add_items(self, items: List[DiagramItem], arrows: List[Arrow]):
+        """Adds the given items and arrows at once, like removed ones added back.
+
+        The arrows' geometry is computed once all the items are attached and before the arrows are, so every arrow is
+        indexed once, and many items are added without keeping the item index up to date, see the open benchmarks
+        of benchmarks/view_benchmark.py.
+
+        Args:
+            items: List of the diagram items to be added.
+            arrows: List of the arrows to be added, their items have to be in the scene or among the given items.
+        """
+
+        is_bulk_change = len(items) + len(arrows) >= diagram_constants.DIAGRAM_BULK_ADD_ITEMS_COUNT
+        if is_bulk_change:
+            self.begin_bulk_change()
+
+        for item in items:
+            self.attach_diagram_item(item)
+        self.grow_scene_rect(items)
+        for arrow in arrows:
+            arrow.updatePosition()
+        for arrow in arrows:
+            self.attach_arrow(arrow)
+
+        if is_bulk_change:
+            self.end_bulk_change()
+
+        cycle_arrows = set(self.diagram_graph.add_batch(items, arrows))
+        for arrow in arrows:
+            arrow.set_color(self.cycle_line_color if arrow in cycle_arrows else self.line_color)
+
+        self.journal_added_items(items, arrows)
+        self.diagram_graph_changed_timer.start()
+
+    def new_diagram_item(self, framework_layer: LayerInterface, position: QPointF) -> DiagramItem:
+        item = DiagramItem(framework_layer, self.context_menu, position=position)
+        item.setBrush(self.item_color)
+        return item
+
+    def attach_diagram_item(self, item: DiagramItem):
+        if item.item_id is None:
+            item.item_id = self.get_next_item_id()
+
+        framework_layer = item.get_framework_layer()
+        framework_layer.object_name = self.name_allocator.add_name(
+            framework_layer.object_name,
+            framework_layer.LAYER_NAME_PREFIX,
+            framework_layer.layer_names_suffixes(self.diagram_dir_path),
+        )
+
+        self.addItem(item)
+        self.scene_items[item] = None
+        self.spatial_index.add_item(item)
+        self.z_order.add_item(item)
+
+    def attach_arrow(self, arrow: Arrow):
+        """Adds the given arrow to the scene, its geometry has to be computed by its updatePosition before."""
+
+        if arrow.item_id is None:
+            arrow.item_id = self.get_next_item_id()
+
+        arrow.get_start_item().add_arrow(arrow)
+        arrow.get_end_item().add_arrow(arrow)
+        arrow.setZValue(diagram_constants.DIAGRAM_ARROW_Z_VALUE)
+        self.addItem(arrow)
+        self.scene_items[arrow] = None
+
+    def remove_diagram_item(self, item: DiagramItem):
+        self.remove_items([item])
+
+    def remove_arrow(self, arrow: Arrow):
+        self.remove_items([arrow])
+
+    def delete_items(self, items: List[QGraphicsItem]):
+        """Removes the given items like remove_items, the removal can be undone."""
+
+        removed_items, removed_arrows = self.remove_items(items)
+        if removed_items or removed_arrows:
+            self.push_command(RemoveItemsCommand(self, removed_items, removed_arrows))
+
+    def remove_items(self, items: List[QGraphicsItem]) -> Tuple[List[DiagramItem], List[Arrow]]:
+        """Removes the given items in one batch, diagram items are removed with all their arrows.
+
+        Args:
+            items: List of the items to be removed, typically the selected items.
+
+        Returns:
+            Tuple of the removed diagram items and arrows, including the arrows removed with their items.
+        """
+
+        removed_items = dict()
+        removed_arrows = dict()
+        for item in items:
+            if item.scene() is not self:
+                continue
+            if isinstance(item, DiagramItem):
+                removed_items[item] = None
+            elif isinstance(item, Arrow):
+                removed_arrows[item] = None
+            else:
+                self.removeItem(item)
+
+        for item in removed_items:
+            removed_arrows.update(dict.fromkeys(item.get_arrows()))
+
+        if not removed_items and not removed_arrows:
+            return list(), list()
+
+        accepted_arrows = self.diagram_graph.remove_batch(removed_items, removed_arrows)
+
+        # Arrows are only detached from the items that stay, the removed items are dropped with their arrows.
+        for arrow in removed_arrows:
+            start_item = arrow.get_start_item()
+            end_item = arrow.get_end_item()
+            if start_item not in removed_items:
+                start_item.remove_arrow(arrow)
+            if end_item not in removed_items:
+                end_item.remove_arrow(arrow)
+
+        for item in removed_items:
+            self.moved_items.pop(item, None)
+            self.spatial_index.remove_item(item)
+            self.z_order.remove_item(item)
+            self.name_allocator.remove_name(item.get_framework_layer().object_name)
+
+        removed_count = len(removed_items) + len(removed_arrows)
+        if removed_count >= diagram_constants.DIAGRAM_BULK_REMOVE_ITEMS_COUNT:
+            self.begin_bulk_change()
+
+        if removed_count >= diagram_constants.DIAGRAM_REBUILD_REMOVE_ITEMS_COUNT:
+            self.rebuild_scene_items(removed_items.keys() | removed_arrows.keys())
+        else:
+            for arrow in removed_arrows:
+                del self.scene_items[arrow]
+                self.removeItem(arrow)
+            for item in removed_items:
+                del self.scene_items[item]
+                self.removeItem(item)
+
+        if removed_count >= diagram_constants.DIAGRAM_BULK_REMOVE_ITEMS_COUNT:
+            self.end_bulk_change()
+
+        self.reset_arrows_color(accepted_arrows)
+        self.diagram_graph_changed_timer.start()
+
+        if self.journal is not None:
+            self.journal.write({
+                'op': 'remove',
+                'items': [item.item_id for item in removed_items],
+                'arrows': [arrow.item_id for arrow in removed_arrows],
+            })
+
+        return list(removed_items), list(removed_arrows)
+
+    def rebuild_scene_items(self, removed_items: Set[QGraphicsItem]):
+        """Removes the given items by taking every diagram item and arrow out of the scene and adding back the rest.
+
+        Qt looks for a removed item from the front of the scene's list of top level items, which keeps the order
+        the items were added in. Removing many items one by one costs the number of items for each of them, while
+        taking all the items out from the front of the list and adding back the remaining ones costs it once.
+        See the remove benchmarks of benchmarks/view_benchmark.py.
+
+        The remaining items do not move, so the moves Qt may report while they are added back are dropped, and their
+        selection is restored explicitly instead of relying on Qt keeping it.
+        """
+
+        scene_items = self.scene_items
+        self.scene_items = dict()
+        selected_items = [item for item in self.selectedItems() if item not in removed_items]
+        moved_items = self.moved_items
+        self.moved_items = dict()
+
+        self.begin_bulk_change()
+
+        for item in scene_items:
+            self.removeItem(item)
+
+        for item in scene_items:
+            if item not in removed_items:
+                self.addItem(item)
+                self.scene_items[item] = None
+
+        self.moved_items = moved_items
+        for item in selected_items:
+            item.setSelected(True)
+
+        self.end_bulk_change()
+
+    def edit_diagram_item(self, item: DiagramItem) -> bool:
+        """Opens the item's layer dialog, a new layer name is only kept if it is valid and unique.
+
+        Returns:
+            Boolean indicates whether the dialog was accepted.
+        """
+
+        framework_layer = item.get_framework_layer()
+        old_layer_parameters = framework_layer.get_layer_parameters()
+        old_name = framework_layer.object_name
+        if not framework_layer.layer_config_dialog():
+            return False
+
+        error_msg = self.name_allocator.rename(
+            old_name,
+            framework_layer.object_name,
+            framework_layer.layer_names_suffixes(self.diagram_dir_path),
+        )
+        if error_msg is not None:
+            framework_layer.object_name = old_name
+            self.layer_name_error.emit(error_msg)
+
+        new_layer_parameters = framework_layer.get_layer_parameters()
+        if new_layer_parameters != old_layer_parameters:
+            self.journal_edited_item(item)
+            self.push_command(EditLayerCommand(self, item, old_layer_parameters, new_layer_parameters))
+
+        self.diagram_graph_changed_timer.start()
+        return True
+
+    def set_layer_parameters(self, item: DiagramItem, layer_parameters: Dict[str, Any]):
+        """Sets the item's layer parameters, its name is kept only if it is still free."""
+
+        framework_layer = item.get_framework_layer()
+        self.name_allocator.remove_name(framework_layer.object_name)
+        framework_layer.set_layer_parameters(layer_parameters)
+        framework_layer.object_name = self.name_allocator.add_name(
+            framework_layer.object_name,
+            framework_layer.LAYER_NAME_PREFIX,
+            framework_layer.layer_names_suffixes(self.diagram_dir_path),
+        )
+        self.journal_edited_item(item)
+        self.diagram_graph_changed_timer.start()
+
+    def move_items(self, items: List[DiagramItem], positions: List[float]):
+        """Moves the given items to the given positions, given as a flat list of x and y coordinates."""
+
+        for index, item in enumerate(items):
+            item.setPos(positions[index * 2], positions[index * 2 + 1])
+        self.update_moved_items()
+        self.journal_moved_items(items)
+
+    def mark_item_moved(self, item: DiagramItem):
+        self.moved_items[item] = None
+        self.moved_items_timer.start()
+
+    def update_moved_items(self):
+        moved_items = self.moved_items
+        self.moved_items = dict()
+
+        dirty_arrows = dict()
+        self.grow_scene_rect(moved_items)
+        for item in moved_items:
+            self.spatial_index.update_item(item)
+            for arrow in item.get_arrows():
+                dirty_arrows[arrow] = None
+
+        for arrow in dirty_arrows:
+            arrow.updatePosition()
+
+    def bring_to_front(self, items: List[QGraphicsItem]):
+        self.z_order.bring_to_front([item for item in items if isinstance(item, DiagramItem)])
+
+    def send_to_back(self, items: List[QGraphicsItem]):
+        self.z_order.send_to_back([item for item in items if isinstance(item, DiagramItem)])
+
+    def find_diagram_item(self, point: QPointF) -> Union[DiagramItem, None]:
+        """Finds the diagram item at the given scene point, or the nearest one within the connection snap radius."""
+
+        if self.moved_items:
+            self.update_moved_items()
+
+        item = self.spatial_index.get_item_at(point)
+        if item is None:
+            item = self.spatial_index.get_nearest_item(point, diagram_constants.DIAGRAM_CONNECTION_SNAP_RADIUS)
+        return item
+
+    def grow_scene_rect(self, items: Iterable[DiagramItem]):
+        """Grows the scene rect to contain the given items, the rect is only read and set once for all of them."""
+
+        if not self.is_scene_rect_growing:
+            return
+
+        scene_rect = self.sceneRect()
+        grown_scene_rect = scene_rect
+        margin = diagram_constants.DIAGRAM_SCENE_GROWTH_MARGIN
+        for item in items:
+            item_rect = item.sceneBoundingRect()
+            if not grown_scene_rect.contains(item_rect):
+                grown_scene_rect = grown_scene_rect.united(item_rect.adjusted(-margin, -margin, margin, margin))
+
+        if grown_scene_rect is not scene_rect:
+            self.setSceneRect(grown_scene_rect)
+
+    def reset_arrows_color(self, arrows: List[Arrow]):
+        for arrow in arrows:
+            arrow.set_color(self.line_color)
+
+    def clear_diagram(self):
+        self.clear()
+        self.diagram_graph.clear()
+        self.spatial_index.clear()
+        self.z_order.clear()
+        self.name_allocator.clear()
+        self.undo_stack.clear()
+        self.drag_start_positions = None
+        self.scene_items.clear()
+        self.moved_items.clear()
+        self.diagram_graph_changed_timer.start()
+        self.undo_stack_changed.emit()
+
+        if self.journal is not None:
+            self.journal.write({'op': 'clear'})
+
+    def add_diagram(self, diagram: Diagram) -> List[DiagramItem]:
+        items, arrows = self.new_diagram_items(diagram, QPointF())
+        self.add_items(items, arrows)
+        return items
+
+    def new_diagram_items(self, diagram: Diagram, offset: QPointF) -> Tuple[List[DiagramItem], List[Arrow]]:
+        dx, dy = offset.x(), offset.y()
+        items = [
+            self.new_diagram_item(layer, QPointF(x + dx, y + dy))
+            for layer, (x, y) in zip(diagram.layers, diagram.positions)
+        ]
+        arrows = [Arrow(items[start_node], items[end_node]) for start_node, end_node in diagram.edges]
+        return items, arrows
+
+    # Journal methods, the records are only built here, they are encoded and written by the journal's thread.
+    def journal_added_items(self, items: List[DiagramItem], arrows: List[Arrow]):
+        if self.journal is None:
+            return
+
+        self.journal.write({
+            'op': 'add',
+            'framework': self.framework_name,
+            'items': [
+                [
+                    item.item_id,
+                    item.get_framework_layer().__class__.__name__,
+                    item.get_framework_layer().get_layer_parameters(),
+                    item.pos().x(),
+                    item.pos().y(),
+                ]
+                for item in items
+            ],
+            'arrows': [
+                [arrow.item_id, arrow.get_start_item().item_id, arrow.get_end_item().item_id]
+                for arrow in arrows
+            ],
+        })
+
+    def journal_moved_items(self, items: List[DiagramItem]):
+        if self.journal is None:
+            return
+
+        positions = list()
+        for item in items:
+            position = item.pos()
+            positions.append(position.x())
+            positions.append(position.y())
+
+        self.journal.write({'op': 'move', 'items': [item.item_id for item in items], 'positions': positions})
+
+    def journal_edited_item(self, item: DiagramItem):
+        if self.journal is None:
+            return
+
+        self.journal.write({
+            'op': 'edit',
+            'item': item.item_id,
+            'parameters': item.get_framework_layer().get_layer_parameters(),
+        })
+
+    def get_next_item_id(self) -> int:
+        self.next_item_id += 1
+        return self.next_item_id
+
+    def get_items_diagram(self, items: List[QGraphicsItem]) -> Diagram:
+        """Creates the diagram of the given diagram items and of the arrows between them, typically to copy them.
+
+        The diagram holds the items' own layers, it has to be encoded to get a copy of them.
+        """
+
+        diagram_items = [item for item in items if isinstance(item, DiagramItem)]
+        items_indices = {item: index for index, item in enumerate(diagram_items)}
+
+        edges = list()
+        for item in diagram_items:
+            for arrow in item.get_arrows():
+                end_index = items_indices.get(arrow.get_end_item())
+                if arrow.get_start_item() is item and end_index is not None:
+                    edges.append((items_indices[item], end_index))
+
+        return Diagram(
+            self.framework_name,
+            [item.get_framework_layer() for item in diagram_items],
+            [(item.pos().x(), item.pos().y()) for item in diagram_items],
+            edges,
+        )
+
+    def paste_diagram(self, diagram: Diagram, offset: QPointF) -> List[DiagramItem]:
+        """Adds the given diagram at once, its layers keep their names unless they are taken, then selects it."""
+
+        items, arrows = self.new_diagram_items(diagram, offset)
+        if not items:
+            return items
+
+        self.add_items(items, arrows)
+        self.push_command(InsertItemsCommand(self, items, arrows))
+
+        self.clearSelection()
+        for item in items:
+            item.setSelected(True)
+        return items
+
+    def duplicate_items(self, items: List[QGraphicsItem]) -> List[DiagramItem]:
+        """Pastes a copy of the given diagram items and of the arrows between them next to them."""
+
+        diagram = self.get_items_diagram(items)
+        if not diagram.layers:
+            return list()
+
+        # Encoding and decoding the diagram copies all its layers at once.
+        diagram = diagram_file_utils.decode_diagram(diagram_file_utils.encode_diagram(diagram, is_binary=True))
+        offset = diagram_constants.DIAGRAM_PASTE_OFFSET
+        return self.paste_diagram(diagram, QPointF(offset, offset))
+
     def isItemChange(self, type_: DiagramItem) -> bool:
         for item in self.selectedItems():
             if isinstance(item, type_):
@@ -0,0 +1,125 @@
+# Built-in imports.
+import math
+
+from typing import List, Tuple, Union
+
+# Third-party package imports.
+from PyQt5.QtCore import QPointF, QRectF
+
+# First-party package imports.
+from constants import diagram_constants
+from widgets.diagram_item import DiagramItem
+
+
+class DiagramSpatialIndex(object):
+    """Class to find the diagram items at or near a scene point without going through the scene's item index.
+
+    The scene is split into square cells and every item is kept in the cells its bounding rect overlaps, so a lookup
+    only checks the few items around the point, whatever the number of items and arrows in the scene. Arrows are
+    not indexed, they are never the target of a connection and their bounding rects cover large parts of the scene.
+    """
+
+    def __init__(self, cell_size: float = diagram_constants.DIAGRAM_SPATIAL_INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = dict()
+        self.items_cells = dict()
+        self.items_order = dict()
+        self.next_order = 0
+
+    def add_item(self, item: DiagramItem):
+        self.items_order[item] = self.next_order
+        self.next_order += 1
+        self.insert_item(item)
+
+    def update_item(self, item: DiagramItem):
+        """Moves the given item to the cells of its current bounding rect, it has to be called after it moves."""
+
+        if item not in self.items_cells:
+            return
+
+        cells_keys = self.get_rect_cells_keys(item.sceneBoundingRect())
+        if cells_keys != self.items_cells[item]:
+            self.delete_item(item)
+            self.insert_item(item, cells_keys)
+
+    def remove_item(self, item: DiagramItem):
+        if item not in self.items_cells:
+            return
+
+        self.delete_item(item)
+        del self.items_order[item]
+
+    def clear(self):
+        self.cells.clear()
+        self.items_cells.clear()
+        self.items_order.clear()
+        self.next_order = 0
+
+    def get_item_at(self, point: QPointF) -> Union[DiagramItem, None]:
+        """Finds the topmost item whose shape contains the given scene point.
+
+        Returns:
+            The found item, or None if the point is not on any item.
+        """
+
+        top_item = None
+        top_key = None
+        for item in self.cells.get(self.get_cell_key(point.x(), point.y()), ()):
+            if item.contains(item.mapFromScene(point)):
+                key = (item.zValue(), self.items_order[item])
+                if top_key is None or key > top_key:
+                    top_item = item
+                    top_key = key
+        return top_item
+
+    def get_nearest_item(self, point: QPointF, radius: float) -> Union[DiagramItem, None]:
+        """Finds the item whose bounding rect is the nearest to the given scene point, within the given radius.
+
+        Returns:
+            The found item, or None if no item is within the radius.
+        """
+
+        search_rect = QRectF(point.x() - radius, point.y() - radius, radius * 2.0, radius * 2.0)
+
+        nearest_item = None
+        nearest_distance = radius
+        visited_items = set()
+        for cell_key in self.get_rect_cells_keys(search_rect):
+            for item in self.cells.get(cell_key, ()):
+                if item in visited_items:
+                    continue
+                visited_items.add(item)
+
+                distance = self.get_rect_distance(item.sceneBoundingRect(), point)
+                if distance <= nearest_distance:
+                    nearest_item = item
+                    nearest_distance = distance
+        return nearest_item
+
+    def insert_item(self, item: DiagramItem, cells_keys: List[Tuple[int, int]] = None):
+        if cells_keys is None:
+            cells_keys = self.get_rect_cells_keys(item.sceneBoundingRect())
+
+        self.items_cells[item] = cells_keys
+        for cell_key in cells_keys:
+            self.cells.setdefault(cell_key, dict())[item] = None
+
+    def delete_item(self, item: DiagramItem):
+        for cell_key in self.items_cells.pop(item):
+            cell = self.cells[cell_key]
+            del cell[item]
+            if not cell:
+                del self.cells[cell_key]
+
+    def get_cell_key(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def get_rect_cells_keys(self, rect: QRectF) -> List[Tuple[int, int]]:
+        left, top = self.get_cell_key(rect.left(), rect.top())
+        right, bottom = self.get_cell_key(rect.right(), rect.bottom())
+        return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
+
+    def get_rect_distance(self, rect: QRectF, point: QPointF) -> float:
+        dx = max(rect.left() - point.x(), 0.0, point.x() - rect.right())
+        dy = max(rect.top() - point.y(), 0.0, point.y() - rect.bottom())
+        return math.hypot(dx, dy)
@@ -0,0 +1,107 @@
+# Built-in imports.
+import collections
+
+# First-party package imports.
+from constants import diagram_constants
+
+
+class DiagramCommand(object):
+    """Base class of the undo commands, a command holds the change it made, not a copy of the scene."""
+
+    def undo(self):
+        raise NotImplementedError
+
+    def redo(self):
+        raise NotImplementedError
+
+    def get_cost(self) -> int:
+        """Returns the estimated memory held by the command in bytes."""
+
+        return diagram_constants.DIAGRAM_UNDO_COMMAND_COST
+
+    def merge_with(self, command: 'DiagramCommand') -> bool:
+        """Merges the given command, pushed right after this one, into this one.
+
+        Returns:
+            Boolean indicates whether the command was merged.
+        """
+
+        return False
+
+
+class DiagramUndoStack(object):
+    """Class to keep the undo and redo history within a memory limit, the oldest commands are dropped past it.
+
+    Once only the next command to undo is left, the commands furthest from it on the redo side are dropped. The last
+    command is always kept, even if it is alone over the limit, so the last change can be undone or redone.
+    """
+
+    def __init__(self, memory_limit: int = diagram_constants.DIAGRAM_UNDO_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.commands = collections.deque()
+        self.commands_costs = collections.deque()
+        self.index = 0
+        self.cost = 0
+
+    def set_memory_limit(self, memory_limit: int):
+        self.memory_limit = memory_limit
+        self.evict_commands()
+
+    def get_cost(self) -> int:
+        return self.cost
+
+    def can_undo(self) -> bool:
+        return self.index > 0
+
+    def can_redo(self) -> bool:
+        return self.index < len(self.commands)
+
+    def push(self, command: DiagramCommand):
+        """Records the given command, which has already been done, and drops the commands that could be redone."""
+
+        while len(self.commands) > self.index:
+            self.commands.pop()
+            self.cost -= self.commands_costs.pop()
+
+        if self.commands and self.commands[-1].merge_with(command):
+            self.cost -= self.commands_costs.pop()
+            command = self.commands[-1]
+        else:
+            self.commands.append(command)
+            self.index += 1
+
+        command_cost = command.get_cost()
+        self.commands_costs.append(command_cost)
+        self.cost += command_cost
+
+        self.evict_commands()
+
+    def undo(self):
+        if not self.can_undo():
+            return
+
+        self.index -= 1
+        self.commands[self.index].undo()
+
+    def redo(self):
+        if not self.can_redo():
+            return
+
+        self.commands[self.index].redo()
+        self.index += 1
+
+    def clear(self):
+        self.commands.clear()
+        self.commands_costs.clear()
+        self.index = 0
+        self.cost = 0
+
+    def evict_commands(self):
+        while self.cost > self.memory_limit and len(self.commands) > 1:
+            if self.index > 1:
+                self.commands.popleft()
+                self.cost -= self.commands_costs.popleft()
+                self.index -= 1
+            else:
+                self.commands.pop()
+                self.cost -= self.commands_costs.pop()
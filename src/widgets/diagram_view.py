@@ -0,0 +1,65 @@
+# Third-party package imports.
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QWidget
+
+# First-party package imports.
+from constants import diagram_constants
+from widgets.diagram_scene import DiagramScene
+
+
+class DiagramViewSettings(object):
+    """Class to hold the rendering settings of a diagram view and its scene, so they can be benchmarked."""
+
+    def __init__(
+        self,
+        item_index_method: int = QGraphicsScene.BspTreeIndex,
+        bsp_tree_depth: int = diagram_constants.DIAGRAM_SCENE_BSP_TREE_DEPTH,
+        bulk_move_items_count: int = diagram_constants.DIAGRAM_BULK_MOVE_ITEMS_COUNT,
+        viewport_update_mode: int = QGraphicsView.SmartViewportUpdate,
+        is_background_cached: bool = True,
+        optimization_flags: int = QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing,
+        is_scene_rect_growing: bool = True,
+    ):
+        """
+        Args:
+            item_index_method: QGraphicsScene.BspTreeIndex or QGraphicsScene.NoIndex.
+            bsp_tree_depth: Integer represents the depth of the BSP tree index, 0 lets Qt choose it.
+            bulk_move_items_count: Integer represents the number of dragged items that drops the index while they
+                move, 0 never drops it.
+            viewport_update_mode: QGraphicsView.ViewportUpdateMode value.
+            is_background_cached: Boolean indicates whether the background is rendered once into an offscreen pixmap
+                and copied from it on every repaint.
+            optimization_flags: QGraphicsView.OptimizationFlags value.
+            is_scene_rect_growing: Boolean indicates whether the scene rect grows when items are placed past it.
+        """
+
+        self.item_index_method = item_index_method
+        self.bsp_tree_depth = bsp_tree_depth
+        self.bulk_move_items_count = bulk_move_items_count
+        self.viewport_update_mode = viewport_update_mode
+        self.is_background_cached = is_background_cached
+        self.optimization_flags = optimization_flags
+        self.is_scene_rect_growing = is_scene_rect_growing
+
+
+class DiagramView(QGraphicsView):
+    def __init__(self, scene: DiagramScene, settings: DiagramViewSettings = None, parent: QWidget = None):
+        super(DiagramView, self).__init__(scene, parent)
+
+        self.apply_settings(settings or DiagramViewSettings())
+
+    def get_settings(self) -> DiagramViewSettings:
+        return self.settings
+
+    def apply_settings(self, settings: DiagramViewSettings):
+        self.settings = settings
+
+        scene = self.scene()
+        scene.set_item_index_method(settings.item_index_method)
+        scene.setBspTreeDepth(settings.bsp_tree_depth)
+        scene.set_bulk_move_items_count(settings.bulk_move_items_count)
+        scene.set_scene_rect_growing(settings.is_scene_rect_growing)
+
+        self.setViewportUpdateMode(settings.viewport_update_mode)
+        self.setCacheMode(QGraphicsView.CacheBackground if settings.is_background_cached else QGraphicsView.CacheNone)
+        self.setOptimizationFlags(QGraphicsView.OptimizationFlags(settings.optimization_flags))
+        self.resetCachedContent()
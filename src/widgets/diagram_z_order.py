@@ -0,0 +1,68 @@
+# Built-in imports.
+from typing import List
+
+# First-party package imports.
+from constants import diagram_constants
+from widgets.diagram_item import DiagramItem
+
+
+class DiagramZOrder(object):
+    """Class to keep the stacking order of diagram items and move whole selections to its front or back.
+
+    Moved items are stacked one step above the front item or below the back item, so a move costs time proportional
+    to the number of moved items only. When the next move would pass the z-value limit, all the items are sorted by
+    their z-values once and spread again around 0, keeping their order.
+    """
+
+    def __init__(self, z_value_limit: float = diagram_constants.DIAGRAM_ITEM_Z_VALUE_LIMIT):
+        self.z_value_limit = z_value_limit
+        self.items = dict()
+        self.front_z_value = 0.0
+        self.back_z_value = 0.0
+        self.step = 1.0
+
+    def add_item(self, item: DiagramItem):
+        self.items[item] = None
+        self.front_z_value = max(self.front_z_value, item.zValue())
+        self.back_z_value = min(self.back_z_value, item.zValue())
+
+    def remove_item(self, item: DiagramItem):
+        self.items.pop(item, None)
+
+    def clear(self):
+        self.__init__(self.z_value_limit)
+
+    def bring_to_front(self, items: List[DiagramItem]):
+        """Stacks the given items above all the other items, keeping their order among themselves."""
+
+        items = sorted((item for item in items if item in self.items), key=DiagramItem.zValue)
+        if self.front_z_value + len(items) * self.step > self.z_value_limit:
+            self.renormalize(len(items))
+
+        for item in items:
+            self.front_z_value += self.step
+            item.setZValue(self.front_z_value)
+
+    def send_to_back(self, items: List[DiagramItem]):
+        """Stacks the given items below all the other items, keeping their order among themselves."""
+
+        items = sorted((item for item in items if item in self.items), key=DiagramItem.zValue, reverse=True)
+        if self.back_z_value - len(items) * self.step < -self.z_value_limit:
+            self.renormalize(len(items))
+
+        for item in items:
+            self.back_z_value -= self.step
+            item.setZValue(self.back_z_value)
+
+    def renormalize(self, moved_items_count: int):
+        """Spreads the items' z-values around 0, leaving room for the given number of moved items on both sides."""
+
+        items = sorted(self.items, key=DiagramItem.zValue)
+        self.step = min(1.0, self.z_value_limit / (len(items) / 2.0 + moved_items_count + 1))
+
+        z_value = -(len(items) - 1) / 2.0 * self.step
+        self.back_z_value = z_value
+        for item in items:
+            item.setZValue(z_value)
+            self.front_z_value = z_value
+            z_value += self.step
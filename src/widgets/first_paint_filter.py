@@ -0,0 +1,20 @@
+# Third-party package imports.
+from PyQt5.QtCore import QEvent, QObject, pyqtSignal
+
+
+class FirstPaintFilter(QObject):
+    """Class to report the first paint of the watched widget, it stops watching right after it."""
+
+    first_painted = pyqtSignal()
+
+    def __init__(self, widget: QObject):
+        super(FirstPaintFilter, self).__init__(widget)
+
+        self.widget = widget
+        self.widget.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self.widget and event.type() == QEvent.Paint:
+            self.widget.removeEventFilter(self)
+            self.first_painted.emit()
+        return False
@@ -1,21 +1,24 @@
 # Built-in imports.
-from typing import List, Dict
+import os
+
+from typing import List, Union
 
 # Third-party package imports.
-from PyQt5.QtCore import QRectF
+from PyQt5.QtCore import QMimeData, QPointF, QRectF, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import (
     QAction,
+    QApplication,
     QButtonGroup,
     QComboBox,
     QFileDialog,
-    QGraphicsView,
     QGridLayout,
     QHBoxLayout,
     QLabel,
     QMainWindow,
     QMessageBox,
     QSizePolicy,
+    QStyle,
     QToolBox,
     QToolButton,
     QVBoxLayout,
@@ -25,21 +28,51 @@ from PyQt5.QtWidgets import (
 # First-party package imports.
 import resources_rc
 
+from utils import diagram_file_utils
+from utils import diagram_journal
+from utils import export_utils
 from utils import frameworks_utils
-from utils import graph_utils
+from constants import diagram_constants
 from constants import main_window_constants
 from widgets.diagram_scene import DiagramScene
+from widgets.diagram_view import DiagramView
 from widgets.diagram_item import DiagramItem
-from widgets.arrow import Arrow
 from widgets.qaction_properties import QActionProperties
-from frameworks.layer_interface import LayerInterface
+from frameworks.layers_registry import LayerEntry
+
+
+DIAGRAM_JOURNAL_DIR = os.path.join(os.path.expanduser('~'), main_window_constants.DIAGRAM_JOURNAL_DIR_NAME)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted from the journal's writer thread, so the message is shown from the UI thread.
+    diagram_journal_failed = pyqtSignal(str)
+
+    def __init__(self, diagram_journal_dir: str = DIAGRAM_JOURNAL_DIR):
         super(MainWindow, self).__init__()
-        
+
+        self.diagram_file_path = None
+
+        # Number of pastes since the last copy, every paste is placed further from the copied items.
+        self.pastes_count = 0
+
         self.create_main_window_actions([
+            QActionProperties(
+                name=main_window_constants.OPEN_ACTION_NAME,
+                icon=self.style().standardIcon(QStyle.SP_DialogOpenButton),
+                text='&Open',
+                shortcut='Ctrl+O',
+                status_tip='Open a saved diagram',
+                triggered=self.open_diagram,
+            ),
+            QActionProperties(
+                name=main_window_constants.SAVE_ACTION_NAME,
+                icon=self.style().standardIcon(QStyle.SP_DialogSaveButton),
+                text='&Save',
+                shortcut='Ctrl+S',
+                status_tip='Save the diagram',
+                triggered=self.save_diagram,
+            ),
             QActionProperties(
                 name=main_window_constants.EXPORT_ACTION_NAME,
                 icon=QIcon(':/icons/export'),
@@ -48,6 +81,46 @@ class MainWindow(QMainWindow):
                 status_tip='Export to Python code',
                 triggered=self.export_diagram,
             ),
+            QActionProperties(
+                name=main_window_constants.UNDO_ACTION_NAME,
+                icon=self.style().standardIcon(QStyle.SP_ArrowBack),
+                text='&Undo',
+                shortcut='Ctrl+Z',
+                status_tip='Undo the last change',
+                triggered=self.undo,
+            ),
+            QActionProperties(
+                name=main_window_constants.REDO_ACTION_NAME,
+                icon=self.style().standardIcon(QStyle.SP_ArrowForward),
+                text='&Redo',
+                shortcut='Ctrl+Shift+Z',
+                status_tip='Redo the last undone change',
+                triggered=self.redo,
+            ),
+            QActionProperties(
+                name=main_window_constants.COPY_ACTION_NAME,
+                icon=QIcon(),
+                text='&Copy',
+                shortcut='Ctrl+C',
+                status_tip='Copy the selected items and the arrows between them',
+                triggered=self.copy_items,
+            ),
+            QActionProperties(
+                name=main_window_constants.PASTE_ACTION_NAME,
+                icon=QIcon(),
+                text='&Paste',
+                shortcut='Ctrl+V',
+                status_tip='Paste the copied items',
+                triggered=self.paste_items,
+            ),
+            QActionProperties(
+                name=main_window_constants.DUPLICATE_ACTION_NAME,
+                icon=QIcon(),
+                text='D&uplicate',
+                shortcut='Ctrl+D',
+                status_tip='Duplicate the selected items and the arrows between them',
+                triggered=self.duplicate_items,
+            ),
             QActionProperties(
                 name=main_window_constants.DELETE_ACTON_NAME,
                 icon=QIcon(':/icons/delete'),
@@ -92,6 +165,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(main_window_constants.MAIN_WINDOW_TITLE)
         self.setCentralWidget(self.widget)
 
+        self.create_diagram_journal(diagram_journal_dir)
+
     # Create methods.
     def create_main_window_actions(self, main_window_actions: List[QActionProperties]):
         self.main_window_actions = dict()
@@ -107,10 +182,20 @@ class MainWindow(QMainWindow):
 
     def create_file_menu(self):
         self.file_menu = self.menuBar().addMenu(main_window_constants.FILE_MENU_NAME)
+        self.file_menu.addAction(self.main_window_actions[main_window_constants.OPEN_ACTION_NAME])
+        self.file_menu.addAction(self.main_window_actions[main_window_constants.SAVE_ACTION_NAME])
+        self.file_menu.addSeparator()
         self.file_menu.addAction(self.main_window_actions[main_window_constants.EXPORT_ACTION_NAME])
 
     def create_edit_menu(self):
         self.edit_menu = self.menuBar().addMenu(main_window_constants.EDIT_MENU_NAME)
+        self.edit_menu.addAction(self.main_window_actions[main_window_constants.UNDO_ACTION_NAME])
+        self.edit_menu.addAction(self.main_window_actions[main_window_constants.REDO_ACTION_NAME])
+        self.edit_menu.addSeparator()
+        self.edit_menu.addAction(self.main_window_actions[main_window_constants.COPY_ACTION_NAME])
+        self.edit_menu.addAction(self.main_window_actions[main_window_constants.PASTE_ACTION_NAME])
+        self.edit_menu.addAction(self.main_window_actions[main_window_constants.DUPLICATE_ACTION_NAME])
+        self.edit_menu.addSeparator()
         self.edit_menu.addAction(self.main_window_actions[main_window_constants.DELETE_ACTON_NAME])
         self.edit_menu.addSeparator()
         self.edit_menu.addAction(self.main_window_actions[main_window_constants.TO_FRONT_ACTION_NAME])
@@ -167,18 +252,68 @@ class MainWindow(QMainWindow):
             QRectF(0, 0, main_window_constants.DIAGRAM_SCENE_SIZE, main_window_constants.DIAGRAM_SCENE_SIZE)
         )
         self.scene.item_inserted.connect(self.item_inserted)
-        self.view = QGraphicsView(self.scene)
+        self.scene.diagram_graph_changed.connect(self.diagram_graph_changed)
+        self.scene.layer_name_error.connect(self.show_layer_name_error_msg)
+        self.scene.undo_stack_changed.connect(self.undo_stack_changed)
+        self.undo_stack_changed()
+        self.view = DiagramView(self.scene)
+
+    def create_diagram_journal(self, diagram_journal_dir: str):
+        """Journals the scene edits to this instance's own journal, then recovers the diagram of a crashed instance."""
+
+        self.diagram_journal_failed.connect(self.show_diagram_journal_error_msg)
+        self.diagram_journal = diagram_journal.DiagramJournal(
+            diagram_journal.get_journal_file_path(diagram_journal_dir),
+            error_callback=lambda error: self.diagram_journal_failed.emit(str(error)),
+        )
+        try:
+            self.diagram_journal.start()
+        except OSError as error:
+            self.diagram_journal = None
+            self.show_diagram_journal_error_msg(str(error))
+            return
+
+        self.scene.set_journal(self.diagram_journal)
+        QApplication.instance().aboutToQuit.connect(self.close_diagram_journal)
+
+        orphan_journal = diagram_journal.find_orphan_journal(diagram_journal_dir)
+        if orphan_journal is None:
+            return
+
+        orphan_journal_file_path, orphan_journal_lock = orphan_journal
+        try:
+            journal_state = diagram_journal.read_journal(orphan_journal_file_path)
+            diagram = journal_state.get_diagram() if journal_state is not None else None
+            if diagram is not None:
+                self.frameworks_combobox.setCurrentIndex(self.frameworks_combobox.findText(diagram.framework_name))
+                self.scene.set_framework_name(diagram.framework_name)
+                self.scene.add_diagram(diagram)
+        except Exception:
+            # A journal that can not be recovered would fail every start, it is kept aside for the user instead.
+            self.scene.clear_diagram()
+            diagram_journal.remove_orphan_journal(orphan_journal_file_path, orphan_journal_lock, is_bad=True)
+            status_msg = main_window_constants.DIAGRAM_JOURNAL_NOT_RECOVERED_STATUS_MSG.format(
+                orphan_journal_file_path + main_window_constants.DIAGRAM_JOURNAL_BAD_FILE_SUFFIX,
+            )
+        else:
+            diagram_journal.remove_orphan_journal(orphan_journal_file_path, orphan_journal_lock)
+            if diagram is None:
+                return
+            status_msg = main_window_constants.DIAGRAM_JOURNAL_RECOVERED_STATUS_MSG
+
+        # Shown after the graph status the recovered diagram triggers.
+        QTimer.singleShot(0, lambda: self.statusBar().showMessage(status_msg))
 
     def create_framework_toolbox(self):
-        framework_layers = frameworks_utils.get_framework_layers(self.get_selected_framework())
+        layer_entries = frameworks_utils.get_framework_layer_entries(self.get_selected_framework())
 
         self.framework_layers_button_group = QButtonGroup()
         self.framework_layers_button_group.setExclusive(False)
         self.framework_layers_button_group.buttonClicked[int].connect(self.framework_layers_button_group_clicked)
 
         layout = QGridLayout()
-        for framework_layer in framework_layers:
-            layout.addWidget(self.create_framework_layer_widget(framework_layer()))
+        for index, layer_entry in enumerate(layer_entries):
+            layout.addWidget(self.create_framework_layer_widget(layer_entry, index))
 
         layout.setRowStretch(3, 10)
         layout.setColumnStretch(2, 10)
@@ -197,72 +332,155 @@ class MainWindow(QMainWindow):
         self.framework_toolbox.addItem(item_widget, main_window_constants.LAYERS)
 
     # Callback methods.
-    def export_diagram(self):
-        nodes = self.get_nodes_from_scene()
+    def open_diagram(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            'Open Diagram',
+            '',
+            main_window_constants.DIAGRAM_FILE_FILTERS,
+        )
 
-        if len(nodes) == 0:
+        if not file_path:
             return
 
-        edges = self.get_edges_from_scene()
-        nodes_mapping = self.create_nodes_mapping(nodes)
-        uni_graph = graph_utils.create_graph_from_qt_elements(nodes, edges, nodes_mapping)
-        bi_graph = graph_utils.create_graph_from_qt_elements(nodes, edges, nodes_mapping, is_bi_directional=True)
-        
-        is_one_connected_component = graph_utils.is_one_connected_component(bi_graph)
-        graph_topological_sort = graph_utils.create_graph_topological_sort(uni_graph)
-        root_nodes = graph_utils.get_root_nodes(uni_graph)
-        is_all_root_nodes_are_input_layers = graph_utils.is_all_root_nodes_are_input_layers(nodes, root_nodes)
-
-        if not is_one_connected_component:
-            self.show_model_graph_eval_error_msg(main_window_constants.MODEL_GRAPH_MULTIPLE_COMPONENTS_ERROR_MSG)
-        elif graph_topological_sort is None:
-            self.show_model_graph_eval_error_msg(main_window_constants.MODEL_GRAPH_CYCLE_ERROR_MSG)
-        elif not is_all_root_nodes_are_input_layers:
-            self.show_model_graph_eval_error_msg(main_window_constants.MODEL_GRAPH_ROOT_NODE_IS_NOT_INPUT_ERROR_MSG)
-        else:
-            input_definitions = self.build_input_definitions(map(nodes.__getitem__, root_nodes))
-            layer_definitions = self.build_layer_definitions(nodes, graph_topological_sort, root_nodes)
-            model_connections = self.build_model_connections(nodes, uni_graph, graph_topological_sort, root_nodes)
-            framework_template = frameworks_utils.get_formatted_framework_template(
-                self.get_selected_framework(),
-                input_definitions,
-                layer_definitions,
-                model_connections,
-            )
+        try:
+            diagram = diagram_file_utils.load_diagram(file_path)
+        except (OSError, KeyError, ValueError) as error:
+            self.show_diagram_file_error_msg('{}: {}'.format(error.__class__.__name__, error))
+            return
 
+        self.frameworks_combobox.setCurrentIndex(self.frameworks_combobox.findText(diagram.framework_name))
+        self.scene.clear_diagram()
+        self.scene.set_framework_name(diagram.framework_name)
+        self.diagram_file_path = file_path
+        self.scene.set_diagram_dir_path(self.get_diagram_dir_path())
+        self.scene.add_diagram(diagram)
+
+    def save_diagram(self):
+        file_path = self.diagram_file_path
+        if not file_path:
             file_path, _ = QFileDialog.getSaveFileName(
                 self,
-                'Export Model As',
-                'talzeeq.py',
-                'Python Language (*.py);;'
-                'All files (*.*)',
+                'Save Diagram As',
+                main_window_constants.DIAGRAM_FILE_DEFAULT_NAME,
+                main_window_constants.DIAGRAM_FILE_FILTERS,
             )
 
-            if file_path:
-                with open(file_path, 'w') as fp:
-                    fp.write(framework_template)
+        if not file_path:
+            return
+
+        diagram_graph = self.scene.get_diagram_graph()
+        nodes = diagram_graph.get_nodes()
+        nodes_mapping = diagram_graph.get_nodes_mapping()
+        diagram = diagram_file_utils.Diagram(
+            self.get_selected_framework(),
+            [node.get_framework_layer() for node in nodes],
+            [(node.pos().x(), node.pos().y()) for node in nodes],
+            [
+                (nodes_mapping[edge.get_start_item()], nodes_mapping[edge.get_end_item()])
+                for edge in diagram_graph.get_edges()
+            ],
+        )
+
+        diagram_file_utils.save_diagram(file_path, diagram)
+        self.diagram_file_path = file_path
+        self.scene.set_diagram_dir_path(self.get_diagram_dir_path())
+
+    def export_diagram(self):
+        diagram_graph = self.scene.get_diagram_graph()
+        nodes = diagram_graph.get_nodes()
+
+        if len(nodes) == 0:
+            return
+
+        layers = [node.get_framework_layer() for node in nodes]
+
+        try:
+            graph_evaluation = export_utils.evaluate_model_graph(
+                layers,
+                diagram_graph.get_graph(),
+                self.get_diagram_dir_path(),
+            )
+        except export_utils.ModelGraphError as error:
+            self.show_model_graph_eval_error_msg(str(error))
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            'Export Model As',
+            'talzeeq.py',
+            'Python Language (*.py);;'
+            'All files (*.*)',
+        )
+
+        if not file_path:
+            return
+
+        # The model is written through a temporary file, an error leaves the previous output file as it was.
+        try:
+            export_utils.write_model_file(file_path, self.get_selected_framework(), layers, graph_evaluation)
+        except (export_utils.ModelGraphError, OSError) as error:
+            self.show_model_graph_eval_error_msg(str(error))
+
+    def close_diagram_journal(self):
+        if self.diagram_journal is None:
+            return
+
+        # Only a clean exit deletes the journal, after a crash it is left to be recovered.
+        self.scene.set_journal(None)
+        self.diagram_journal.close(is_deleted=True)
+        self.diagram_journal = None
+
+    def undo(self):
+        self.scene.undo()
+
+    def redo(self):
+        self.scene.redo()
+
+    def copy_items(self):
+        diagram = self.scene.get_items_diagram(self.scene.selectedItems())
+        if not diagram.layers:
+            return
+
+        mime_data = QMimeData()
+        mime_data.setData(
+            main_window_constants.DIAGRAM_MIME_TYPE,
+            diagram_file_utils.encode_diagram(diagram, is_binary=True),
+        )
+        QApplication.clipboard().setMimeData(mime_data)
+        self.pastes_count = 0
+
+    def paste_items(self):
+        mime_data = QApplication.clipboard().mimeData()
+        if mime_data is None or not mime_data.hasFormat(main_window_constants.DIAGRAM_MIME_TYPE):
+            return
+
+        # The clipboard can hold anything, the decoding validates it like a diagram file before it reaches the scene.
+        data = bytes(mime_data.data(main_window_constants.DIAGRAM_MIME_TYPE))
+        try:
+            diagram = diagram_file_utils.decode_diagram(data)
+        except (KeyError, ValueError):
+            return
+
+        # Layers of another framework can not be mixed in the diagram.
+        if diagram.framework_name != self.scene.framework_name:
+            return
+
+        self.pastes_count += 1
+        offset = diagram_constants.DIAGRAM_PASTE_OFFSET * self.pastes_count
+        self.scene.paste_diagram(diagram, QPointF(offset, offset))
+
+    def duplicate_items(self):
+        self.scene.duplicate_items(self.scene.selectedItems())
 
     def delete_item(self):
-        for item in self.scene.selectedItems():
-            if isinstance(item, DiagramItem):
-                item.remove_arrows()
-            self.scene.removeItem(item)
+        self.scene.delete_items(self.scene.selectedItems())
 
     def bring_to_front(self):
-        for selected_item in self.scene.selectedItems():
-            z_value = 0
-            for item in selected_item.collidingItems():
-                if item.zValue() >= z_value and isinstance(item, DiagramItem):
-                    z_value = item.zValue() + 0.1
-            selected_item.setZValue(z_value)
+        self.scene.bring_to_front(self.scene.selectedItems())
 
     def send_to_back(self):
-        for selected_item in self.scene.selectedItems():
-            z_value = 0
-            for item in selected_item.collidingItems():
-                if item.zValue() <= z_value and isinstance(item, DiagramItem):
-                    z_value = item.zValue() - 0.1
-            selected_item.setZValue(z_value)
+        self.scene.send_to_back(self.scene.selectedItems())
 
     def pointer_group_clicked(self, index: int):
         self.scene.set_mode(self.pointer_type_group.checkedId())
@@ -283,6 +501,20 @@ class MainWindow(QMainWindow):
         )
         self.framework_layers_button_group.button(layer_index).setChecked(False)
 
+    def diagram_graph_changed(self):
+        error_msg = self.scene.get_diagram_graph().get_validator().get_error_msg(self.get_diagram_dir_path())
+        if error_msg:
+            self.statusBar().showMessage(error_msg.split('\n')[0])
+        elif self.scene.get_diagram_graph().get_nodes():
+            self.statusBar().showMessage(main_window_constants.MODEL_GRAPH_VALID_STATUS_MSG)
+        else:
+            self.statusBar().clearMessage()
+
+    def undo_stack_changed(self):
+        undo_stack = self.scene.get_undo_stack()
+        self.main_window_actions[main_window_constants.UNDO_ACTION_NAME].setEnabled(undo_stack.can_undo())
+        self.main_window_actions[main_window_constants.REDO_ACTION_NAME].setEnabled(undo_stack.can_redo())
+
     def framework_layers_button_group_clicked(self, id: int):
         buttons = self.framework_layers_button_group.buttons()
 
@@ -301,14 +533,12 @@ class MainWindow(QMainWindow):
     def get_selected_framework(self) -> str:
         return str(self.frameworks_combobox.currentText())
 
-    def get_nodes_from_scene(self) -> List[DiagramItem]:
-        return list(filter(lambda item: isinstance(item, DiagramItem), self.scene.items()))
+    def get_diagram_dir_path(self) -> Union[str, None]:
+        """Returns the directory of the diagram file, the relative block file paths are resolved against it."""
 
-    def get_edges_from_scene(self) -> List[Arrow]:
-        return list(filter(lambda item: isinstance(item, Arrow), self.scene.items()))
-
-    def create_nodes_mapping(self, nodes: List[DiagramItem]) -> Dict[DiagramItem, int]:
-        return { node:index for index, node in enumerate(nodes) }
+        if not self.diagram_file_path:
+            return None
+        return os.path.dirname(os.path.abspath(self.diagram_file_path))
 
     def show_model_graph_eval_error_msg(self, message: str):
         msg = QMessageBox()
@@ -318,58 +548,35 @@ class MainWindow(QMainWindow):
         msg.setWindowTitle(main_window_constants.MODEL_GRAPH_EVAL_ERROR_MSG_TEXT)
         msg.exec_()
 
-    def build_input_definitions(self, root_nodes: List[DiagramItem]) -> str:
-        input_definitions = list()
-        for node in root_nodes:
-            input_definitions.append(node.get_framework_layer().layer_definition())
-        return ', '.join(input_definitions)
-
-    def build_layer_definitions(
-        self,
-        nodes: List[DiagramItem],
-        graph_topological_sort: List[int],
-        root_nodes: List[int],
-    ) -> str:
-        layer_definitions = list()
-        for element in graph_topological_sort:
-            if element not in root_nodes:
-                layer_definitions.append(nodes[element].get_framework_layer().layer_definition())
-        return '\n'.join(layer_definitions)
-
-    def build_model_connections(
-        self,
-        nodes: List[DiagramItem],
-        graph: List[List[int]],
-        graph_topological_sort: List[int],
-        root_nodes: List[int],
-    ) -> str:
-        model_connections = list()
-
-        for element in graph_topological_sort:
-            parents = list()
-            is_root = list()
-            for node in range(len(graph)):
-                if element in graph[node]:
-                    parents.append(nodes[node].get_framework_layer())
-                    is_root.append(node in root_nodes)
-
-            layer_connections = nodes[element].get_framework_layer().layer_connections(parents, is_root)
-            if layer_connections:
-                model_connections.append(layer_connections)
-
-        return '\n'.join(model_connections)
-
-    def create_framework_layer_widget(self, framework_layer: LayerInterface) -> QWidget:
+    def show_diagram_journal_error_msg(self, error_msg: str):
+        """Shows the journal error for the rest of the session, the graph status messages do not replace it."""
+
+        # The journal does not accept records anymore, so the scene stops building them.
+        self.scene.set_journal(None)
+        error_label = QLabel(main_window_constants.DIAGRAM_JOURNAL_ERROR_STATUS_MSG.format(error_msg))
+        self.statusBar().addPermanentWidget(error_label)
+
+    def show_diagram_file_error_msg(self, message: str):
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Critical)
+        msg.setText(main_window_constants.DIAGRAM_FILE_ERROR_MSG_TEXT)
+        msg.setInformativeText(message)
+        msg.setWindowTitle(main_window_constants.DIAGRAM_FILE_ERROR_MSG_TITLE)
+        msg.exec_()
+
+    def show_layer_name_error_msg(self, message: str):
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Warning)
+        msg.setText(main_window_constants.LAYER_NAME_ERROR_MSG_TEXT)
+        msg.setInformativeText(message)
+        msg.setWindowTitle(main_window_constants.LAYER_NAME_ERROR_MSG_TITLE)
+        msg.exec_()
+
+    def create_framework_layer_widget(self, layer_entry: LayerEntry, index: int) -> QWidget:
         button = QToolButton()
-        button.setText(framework_layer.layer_name())
+        button.setText(layer_entry.display_name)
         button.setCheckable(True)
-        self.framework_layers_button_group.addButton(
-            button,
-            frameworks_utils.get_framework_layer_index(
-                self.get_selected_framework(),
-                framework_layer.__class__,
-            ),
-        )
+        self.framework_layers_button_group.addButton(button, index)
 
         layout = QVBoxLayout()
         layout.addWidget(button)
@@ -0,0 +1,52 @@
+"""Tests configuration, the application modules are imported from src the same way the application runs."""
+
+
+# Built-in imports.
+import os
+import sys
+
+# The tests never show a window, so they run without a display server.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# Third-party package imports.
+import pytest
+
+from PyQt5.QtWidgets import QApplication
+
+
+@pytest.fixture(scope='session')
+def qapp() -> QApplication:
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+@pytest.fixture
+def main_window(qapp, tmp_path):
+    # First-party package imports.
+    from widgets.main_window import MainWindow
+
+    main_window = MainWindow(diagram_journal_dir=str(tmp_path / 'journals'))
+    yield main_window
+    main_window.close_diagram_journal()
+    main_window.deleteLater()
+
+
+@pytest.fixture
+def scene(qapp):
+    # Third-party package imports.
+    from PyQt5.QtCore import QRectF
+    from PyQt5.QtWidgets import QMenu
+
+    # First-party package imports.
+    from constants import main_window_constants
+    from widgets.diagram_scene import DiagramScene
+
+    context_menu = QMenu()
+    scene = DiagramScene(context_menu)
+    scene.setSceneRect(
+        QRectF(0, 0, main_window_constants.DIAGRAM_SCENE_SIZE, main_window_constants.DIAGRAM_SCENE_SIZE)
+    )
+    yield scene
+    scene.clear_diagram()
+    scene.deleteLater()
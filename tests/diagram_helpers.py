@@ -0,0 +1,24 @@
+"""Helpers to build small Keras diagrams for the tests."""
+
+
+# First-party package imports.
+from utils import frameworks_utils
+from utils.diagram_file_utils import Diagram
+from frameworks.layer_interface import LayerInterface
+
+
+def create_layer(layer_class_name: str, object_name: str, **layer_parameters) -> LayerInterface:
+    layer = frameworks_utils.get_framework_layer_class('Keras', layer_class_name)()
+    layer.object_name = object_name
+    layer.set_layer_parameters(layer_parameters)
+    return layer
+
+
+def create_chain_diagram(layers_count: int) -> Diagram:
+    """Creates a diagram of an input layer followed by a chain of dense layers."""
+
+    layers = [create_layer('InputLayer', 'x')]
+    layers += [create_layer('DenseLayer', 'dense_{}'.format(node)) for node in range(1, layers_count)]
+    positions = [(node * 250.0, 0.0) for node in range(layers_count)]
+    edges = [(node, node + 1) for node in range(layers_count - 1)]
+    return Diagram('Keras', layers, positions, edges)
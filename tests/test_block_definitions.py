@@ -0,0 +1,138 @@
+# Built-in imports.
+import os
+
+from typing import List, Tuple
+
+# Third-party package imports.
+import pytest
+
+# First-party package imports.
+from utils import export_utils
+from utils import diagram_file_utils
+from utils.diagram_file_utils import Diagram
+from frameworks import block_definitions
+from diagram_helpers import create_layer
+
+
+@pytest.fixture(autouse=True)
+def clear_block_definitions():
+    block_definitions.clear_block_definitions()
+    yield
+    block_definitions.clear_block_definitions()
+
+
+def save_diagram(file_path: str, layers_names: List[Tuple[str, str, dict]], edges: List[Tuple[int, int]]):
+    """Saves a diagram of the given (layer class name, object name, parameters) layers, newer than the last save."""
+
+    layers = [
+        create_layer(layer_class_name, object_name, **layer_parameters)
+        for layer_class_name, object_name, layer_parameters in layers_names
+    ]
+    positions = [(node * 250.0, 0.0) for node in range(len(layers))]
+    modification_time = os.path.getmtime(file_path) + 10 if os.path.exists(file_path) else None
+    diagram_file_utils.save_diagram(file_path, Diagram('Keras', layers, positions, edges))
+    if modification_time is not None:
+        os.utime(file_path, (modification_time, modification_time))
+
+
+def save_block_user_diagram(file_path: str, block_file_path: str, inputs_count: int = 1):
+    """Saves a diagram feeding its input layers to a block layer of the given block file."""
+
+    layers_names = [('InputLayer', 'x_{}'.format(node), dict()) for node in range(inputs_count)]
+    layers_names.append(('BlockLayer', 'block', dict(block_file_path=block_file_path)))
+    save_diagram(file_path, layers_names, [(node, inputs_count) for node in range(inputs_count)])
+
+
+def save_dense_block_diagram(file_path: str, inputs_count: int):
+    """Saves a block diagram of the given number of input layers feeding one dense layer."""
+
+    layers_names = [('InputLayer', 'x_{}'.format(node), dict()) for node in range(inputs_count)]
+    layers_names.append(('DenseLayer', 'dense', dict()))
+    save_diagram(file_path, layers_names, [(node, inputs_count) for node in range(inputs_count)])
+
+
+@pytest.fixture
+def nested_block_paths(tmp_path) -> Tuple[str, str, str]:
+    """Saves outer.tlz using a block of a.tlz, which uses a block of block.tlz, which is one dense layer."""
+
+    block_path, a_path, outer_path = (str(tmp_path / name) for name in ('block.tlz', 'a.tlz', 'outer.tlz'))
+    save_dense_block_diagram(block_path, 1)
+    save_block_user_diagram(a_path, block_path)
+    save_block_user_diagram(outer_path, a_path)
+    return block_path, a_path, outer_path
+
+
+def test_nested_block_expands_to_its_layers(qapp, nested_block_paths):
+    _, _, outer_path = nested_block_paths
+
+    model_code = export_utils.export_diagram_file(outer_path)
+
+    assert 'block = ' in model_code
+
+
+def test_nested_block_change_is_checked_again(qapp, nested_block_paths):
+    block_path, _, outer_path = nested_block_paths
+    export_utils.export_diagram_file(outer_path)
+
+    save_dense_block_diagram(block_path, 2)
+
+    with pytest.raises(export_utils.ModelGraphError, match='block'):
+        export_utils.export_diagram_file(outer_path)
+
+    save_dense_block_diagram(block_path, 1)
+
+    assert 'block = ' in export_utils.export_diagram_file(outer_path)
+
+
+def test_nested_block_recursion_is_detected_after_change(qapp, nested_block_paths):
+    block_path, a_path, outer_path = nested_block_paths
+    export_utils.export_diagram_file(outer_path)
+
+    save_block_user_diagram(block_path, a_path)
+
+    with pytest.raises(export_utils.ModelGraphError, match='a.tlz'):
+        export_utils.export_diagram_file(outer_path)
+    with pytest.raises(export_utils.ModelGraphError):
+        export_utils.export_diagram_file(outer_path)
+
+
+def test_removed_nested_block_file_is_reported(qapp, nested_block_paths):
+    block_path, _, outer_path = nested_block_paths
+    export_utils.export_diagram_file(outer_path)
+
+    os.remove(block_path)
+
+    with pytest.raises(export_utils.ModelGraphError, match='block.tlz'):
+        export_utils.export_diagram_file(outer_path)
+
+
+def test_relative_block_paths_are_resolved_against_their_diagrams(qapp, tmp_path, monkeypatch):
+    blocks_dir = tmp_path / 'model' / 'blocks'
+    blocks_dir.mkdir(parents=True)
+    (tmp_path / 'other').mkdir()
+    save_dense_block_diagram(str(blocks_dir / 'dense.tlz'), 1)
+    save_block_user_diagram(str(blocks_dir / 'a.tlz'), 'dense.tlz')
+    save_block_user_diagram(str(tmp_path / 'model' / 'outer.tlz'), os.path.join('blocks', 'a.tlz'))
+
+    monkeypatch.chdir(tmp_path / 'other')
+
+    assert 'block = ' in export_utils.export_diagram_file(os.path.join('..', 'model', 'outer.tlz'))
+
+
+def test_block_inner_layer_name_taken_by_another_layer_is_reported(qapp, tmp_path):
+    block_path, outer_path = str(tmp_path / 'block.tlz'), str(tmp_path / 'outer.tlz')
+    block_layers_names = [('InputLayer', 'x', dict()), ('DenseLayer', 'a', dict()), ('DenseLayer', 'b', dict())]
+    save_diagram(block_path, block_layers_names, [(0, 1), (1, 2)])
+    layers_names = [('InputLayer', 'x', dict()), ('BlockLayer', 'block', dict(block_file_path=block_path))]
+    layers_names.append(('DenseLayer', 'block_a', dict()))
+    save_diagram(outer_path, layers_names, [(0, 1), (1, 2)])
+
+    with pytest.raises(export_utils.ModelGraphError, match='block_a'):
+        export_utils.export_diagram_file(outer_path)
+
+
+def test_unchecked_block_layer_error_is_model_graph_error(qapp, tmp_path):
+    block_layer = create_layer('BlockLayer', 'block', block_file_path=str(tmp_path / 'missing.tlz'))
+
+    with pytest.raises(export_utils.ModelGraphError, match='missing.tlz'):
+        block_layer.layer_definition()
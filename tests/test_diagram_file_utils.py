@@ -0,0 +1,122 @@
+# Built-in imports.
+import json
+import struct
+
+# Third-party package imports.
+import pytest
+
+# First-party package imports.
+from utils import diagram_file_utils
+from widgets import main_window as main_window_module
+from diagram_helpers import create_chain_diagram
+
+
+@pytest.mark.parametrize('is_binary', [False, True])
+def test_encode_decode_round_trip(is_binary):
+    diagram = create_chain_diagram(5)
+    diagram.layers[2].units = 7
+    diagram.layers[2].activation = 'relu'
+    diagram.edges.append((1, 4))
+
+    decoded_diagram = diagram_file_utils.decode_diagram(diagram_file_utils.encode_diagram(diagram, is_binary))
+
+    assert decoded_diagram.framework_name == diagram.framework_name
+    assert [layer.get_layer_parameters() for layer in decoded_diagram.layers] == [
+        layer.get_layer_parameters() for layer in diagram.layers
+    ]
+    assert [type(layer) for layer in decoded_diagram.layers] == [type(layer) for layer in diagram.layers]
+    assert [tuple(position) for position in decoded_diagram.positions] == diagram.positions
+    assert [tuple(edge) for edge in decoded_diagram.edges] == diagram.edges
+
+
+def encode_corrupted_diagram(is_binary: bool, **header_changes) -> bytes:
+    """Encodes a valid diagram, then replaces the given header fields of its JSON encoding."""
+
+    diagram = create_chain_diagram(3)
+    header = json.loads(diagram_file_utils.encode_diagram(diagram).decode('utf-8'))
+    header.update(header_changes)
+    if not is_binary:
+        return json.dumps(header).encode('utf-8')
+
+    nodes, positions, edges = header.pop('nodes'), header.pop('positions'), header.pop('edges')
+    header_bytes = json.dumps(header).encode('utf-8')
+    return b''.join([
+        diagram_file_utils.DIAGRAM_BINARY_PREFIX.pack(
+            diagram_file_utils.DIAGRAM_BINARY_MAGIC,
+            diagram_file_utils.DIAGRAM_FILE_VERSION,
+            len(header_bytes),
+            len(nodes),
+            len(edges) // 2,
+        ),
+        header_bytes,
+        diagram_file_utils.encode_array('I', nodes),
+        diagram_file_utils.encode_array('d', positions),
+        diagram_file_utils.encode_array('I', edges),
+    ])
+
+
+@pytest.mark.parametrize('is_binary', [False, True])
+@pytest.mark.parametrize('header_changes', [
+    dict(edges=[0, 7]),
+    dict(nodes=[0, 5, 1]),
+    dict(parameters=[[None], [None, 32, 'linear', False]]),
+    dict(parameters=[[None], [None, 32], [None, 32, 'linear', False]]),
+])
+def test_decode_rejects_corrupted_diagram(is_binary, header_changes):
+    with pytest.raises(ValueError):
+        diagram_file_utils.decode_diagram(encode_corrupted_diagram(is_binary, **header_changes))
+
+
+def test_binary_columns_are_fixed_width_little_endian():
+    diagram = create_chain_diagram(3)
+
+    data = diagram_file_utils.encode_diagram(diagram, is_binary=True)
+    _, _, header_length, _, _ = diagram_file_utils.DIAGRAM_BINARY_PREFIX.unpack_from(data)
+    columns = data[diagram_file_utils.DIAGRAM_BINARY_PREFIX.size + header_length:]
+
+    assert columns == struct.pack(
+        '<3I6d4I',
+        0, 1, 1,
+        *[coordinate for position in diagram.positions for coordinate in position],
+        0, 1, 1, 2,
+    )
+
+
+def test_decode_rejects_half_edge():
+    # The binary encoding stores the edges count, only the JSON one can hold half an edge.
+    with pytest.raises(ValueError):
+        diagram_file_utils.decode_diagram(encode_corrupted_diagram(False, edges=[0, 1, 2]))
+
+
+def test_decode_rejects_corrupted_v1_diagram():
+    header = {
+        'version': 1,
+        'framework': 'Keras',
+        'nodes': [{'layer': 'InputLayer', 'parameters': {'object_name': 'x'}, 'position': [0, 0]}],
+        'edges': [[0, 3]],
+    }
+
+    with pytest.raises(ValueError):
+        diagram_file_utils.decode_diagram(json.dumps(header).encode('utf-8'))
+
+
+@pytest.mark.parametrize('is_binary', [False, True])
+def test_open_corrupted_diagram_keeps_scene(main_window, monkeypatch, tmp_path, is_binary):
+    file_path = str(tmp_path / 'corrupted.tlz')
+    with open(file_path, 'wb') as fp:
+        fp.write(encode_corrupted_diagram(is_binary, edges=[0, 7]))
+
+    class FileDialog(object):
+        @staticmethod
+        def getOpenFileName(*args):
+            return file_path, ''
+
+    error_msgs = list()
+    monkeypatch.setattr(main_window_module, 'QFileDialog', FileDialog)
+    monkeypatch.setattr(main_window, 'show_diagram_file_error_msg', error_msgs.append)
+
+    main_window.scene.add_diagram(create_chain_diagram(2))
+    main_window.open_diagram()
+
+    assert len(error_msgs) == 1
+    assert len(main_window.scene.get_diagram_graph().get_nodes()) == 2
@@ -0,0 +1,191 @@
+# Built-in imports.
+import json
+import os
+import time
+
+# Third-party package imports.
+from PyQt5.QtCore import QPointF
+from PyQt5.QtWidgets import QApplication, QLabel
+
+# First-party package imports.
+from utils import diagram_journal
+from constants import main_window_constants
+from widgets.diagram_item import DiagramItem
+from widgets.main_window import MainWindow
+from diagram_helpers import create_chain_diagram
+
+
+def write_orphan_journal(journal_dir: str, instance_id: str, layers_count: int) -> str:
+    """Writes the journal of a crashed instance with a chain of the given number of layers, without a lock."""
+
+    items = [[1, 'InputLayer', {'object_name': 'x'}, 0.0, 0.0]]
+    items += [
+        [node + 1, 'DenseLayer', {'object_name': 'dense_{}'.format(node)}, node * 250.0, 0.0]
+        for node in range(1, layers_count)
+    ]
+    arrows = [[layers_count + node, node, node + 1] for node in range(1, layers_count)]
+
+    os.makedirs(journal_dir, exist_ok=True)
+    file_path = os.path.join(journal_dir, 'journal-{}.jsonl'.format(instance_id))
+    with open(file_path, 'w') as fp:
+        fp.write(json.dumps({'op': 'clear'}) + '\n')
+        fp.write(json.dumps({'op': 'add', 'framework': 'Keras', 'items': items, 'arrows': arrows}) + '\n')
+    return file_path
+
+
+def get_nodes_count(main_window: MainWindow) -> int:
+    return len([item for item in main_window.scene.items() if isinstance(item, DiagramItem)])
+
+
+def test_orphan_journal_is_recovered_and_removed(qapp, tmp_path):
+    journal_dir = str(tmp_path)
+    orphan_journal_file_path = write_orphan_journal(journal_dir, '1-1', 3)
+
+    main_window = MainWindow(diagram_journal_dir=journal_dir)
+    try:
+        assert get_nodes_count(main_window) == 3
+        assert not os.path.exists(orphan_journal_file_path)
+    finally:
+        main_window.close_diagram_journal()
+
+
+def wait_for_journal_records(file_path: str, records_count: int):
+    """Waits for the journal's writer thread to write the given number of records."""
+
+    for _ in range(500):
+        if os.path.exists(file_path):
+            with open(file_path) as fp:
+                if len(fp.readlines()) >= records_count:
+                    return
+        time.sleep(0.01)
+    raise TimeoutError(file_path)
+
+
+def test_running_instance_journal_is_not_recovered_or_removed(qapp, tmp_path):
+    journal_dir = str(tmp_path)
+    first_main_window = MainWindow(diagram_journal_dir=journal_dir)
+    second_main_window = None
+    try:
+        first_main_window.scene.add_diagram(create_chain_diagram(2))
+        first_journal_file_path = first_main_window.diagram_journal.file_path
+        wait_for_journal_records(first_journal_file_path, 2)
+
+        second_main_window = MainWindow(diagram_journal_dir=journal_dir)
+        assert get_nodes_count(second_main_window) == 0
+        assert second_main_window.diagram_journal.file_path != first_journal_file_path
+
+        second_main_window.close_diagram_journal()
+        assert os.path.exists(first_journal_file_path)
+    finally:
+        if second_main_window is not None:
+            second_main_window.close_diagram_journal()
+        first_main_window.close_diagram_journal()
+
+    assert not os.path.exists(first_journal_file_path)
+
+
+def test_bad_orphan_journal_is_moved_aside(qapp, tmp_path):
+    journal_dir = str(tmp_path)
+    orphan_journal_file_path = write_orphan_journal(journal_dir, '1-1', 3)
+    with open(orphan_journal_file_path, 'a') as fp:
+        fp.write(json.dumps({'op': 'edit', 'item': 2, 'parameters': 5}) + '\n')
+
+    main_window = MainWindow(diagram_journal_dir=journal_dir)
+    try:
+        assert get_nodes_count(main_window) == 0
+        assert not os.path.exists(orphan_journal_file_path)
+        assert os.path.exists(orphan_journal_file_path + main_window_constants.DIAGRAM_JOURNAL_BAD_FILE_SUFFIX)
+    finally:
+        main_window.close_diagram_journal()
+
+    second_main_window = MainWindow(diagram_journal_dir=journal_dir)
+    second_main_window.close_diagram_journal()
+
+
+def test_replay_stops_at_torn_last_line(tmp_path):
+    file_path = write_orphan_journal(str(tmp_path), '1-1', 3)
+    with open(file_path, 'a') as fp:
+        fp.write(json.dumps({'op': 'move', 'items': [2], 'positions': [10.0, 20.0]}) + '\n')
+        fp.write(json.dumps({'op': 'remove', 'items': [1, 2, 3], 'arrows': []})[:20])
+
+    diagram = diagram_journal.read_journal(file_path).get_diagram()
+
+    assert len(diagram.layers) == 3
+    assert diagram.positions[1] == (10.0, 20.0)
+    assert sorted(diagram.edges) == [(0, 1), (1, 2)]
+
+
+def test_journal_is_compacted_to_its_state(tmp_path):
+    file_path = str(tmp_path / 'journal-1-1.jsonl')
+    journal = diagram_journal.DiagramJournal(file_path, fsync_interval=0.01, compact_size=1024)
+    journal.start()
+    journal.write({
+        'op': 'add',
+        'framework': 'Keras',
+        'items': [[1, 'InputLayer', {'object_name': 'x'}, 0.0, 0.0]],
+        'arrows': [],
+    })
+    for step in range(1000):
+        journal.write({'op': 'move', 'items': [1], 'positions': [float(step), 0.0]})
+        if step % 100 == 0:
+            time.sleep(0.02)
+    journal.close()
+
+    with open(file_path) as fp:
+        records_count = len(fp.readlines())
+    diagram = diagram_journal.read_journal(file_path).get_diagram()
+
+    assert records_count < 1000
+    assert diagram.positions == [(999.0, 0.0)]
+    assert not os.path.exists(file_path + '.tmp')
+
+
+def test_undo_redo_records_replay_to_scene(scene, tmp_path):
+    file_path = str(tmp_path / 'journal-1-1.jsonl')
+    journal = diagram_journal.DiagramJournal(file_path)
+    journal.start()
+    scene.set_journal(journal)
+
+    items = scene.paste_diagram(create_chain_diagram(4), QPointF())
+    scene.delete_items(items[2:])
+    scene.undo()
+    scene.move_items(items[:1], [50.0, 60.0])
+    scene.undo()
+    scene.redo()
+    scene.set_journal(None)
+    journal.close()
+
+    diagram = diagram_journal.read_journal(file_path).get_diagram()
+    scene_diagram = scene.get_items_diagram(items)
+
+    assert [layer.object_name for layer in diagram.layers] == [layer.object_name for layer in scene_diagram.layers]
+    assert diagram.positions == scene_diagram.positions
+    assert sorted(diagram.edges) == sorted(scene_diagram.edges)
+
+
+def test_writer_error_stops_journal_and_is_reported(tmp_path):
+    file_path = str(tmp_path / 'journal-1-1.jsonl')
+    os.makedirs(file_path)
+    errors = list()
+    journal = diagram_journal.DiagramJournal(file_path, error_callback=errors.append)
+    journal.start()
+    journal.thread.join(5)
+
+    records_count = journal.records.qsize()
+    journal.write({'op': 'clear'})
+    assert journal.records.qsize() == records_count
+    journal.close()
+
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+    assert journal.get_error() is errors[0]
+    assert not os.path.exists(file_path + main_window_constants.DIAGRAM_JOURNAL_LOCK_FILE_SUFFIX)
+
+
+def test_writer_error_is_shown_in_status_bar(main_window):
+    main_window.diagram_journal_failed.emit('No space left on device')
+    QApplication.processEvents()
+
+    assert main_window.scene.journal is None
+    assert any(
+        'No space left on device' in label.text() for label in main_window.statusBar().findChildren(QLabel)
+    )
@@ -0,0 +1,121 @@
+# First-party package imports.
+from utils import diagram_file_utils
+from utils import export_utils
+from utils.diagram_file_utils import Diagram
+from constants import diagram_constants
+from constants import main_window_constants
+from frameworks import block_definitions
+from widgets.arrow import Arrow
+from widgets.diagram_item import DiagramItem
+from diagram_helpers import create_chain_diagram, create_layer
+
+
+def test_rebuilding_remove_keeps_remaining_items_state(scene, monkeypatch):
+    monkeypatch.setattr(diagram_constants, 'DIAGRAM_REBUILD_REMOVE_ITEMS_COUNT', 10)
+    items = scene.add_diagram(create_chain_diagram(40))
+    scene.update_moved_items()
+
+    removed_items, remaining_items = items[:30], items[30:]
+    for item in remaining_items[::2]:
+        item.setSelected(True)
+    selected_items = set(remaining_items[::2])
+
+    scene.remove_items(removed_items)
+
+    assert set(scene.selectedItems()) == selected_items
+    assert not scene.moved_items
+    assert set(item for item in scene.items() if isinstance(item, DiagramItem)) == set(remaining_items)
+    assert len([item for item in scene.items() if isinstance(item, Arrow)]) == len(remaining_items) - 1
+    assert set(scene.scene_items) == set(scene.items())
+    assert remaining_items[0] in scene.items(remaining_items[0].pos())
+
+
+def test_validator_reports_block_layer_errors(scene, tmp_path):
+    block_path = str(tmp_path / 'block.tlz')
+    layers = [create_layer('InputLayer', 'x'), create_layer('BlockLayer', 'block_1', block_file_path=block_path)]
+    items = scene.add_diagram(Diagram('Keras', layers, [(0.0, 0.0), (250.0, 0.0)], [(0, 1)]))
+    validator = scene.get_diagram_graph().get_validator()
+
+    try:
+        assert 'block.tlz' in validator.get_error_msg()
+
+        block_layers = [create_layer('InputLayer', 'x_1'), create_layer('InputLayer', 'x_2')]
+        block_layers.append(create_layer('DenseLayer', 'dense_1'))
+        block_diagram = Diagram('Keras', block_layers, [(0.0, 0.0), (0.0, 250.0), (250.0, 0.0)], [(0, 2), (1, 2)])
+        diagram_file_utils.save_diagram(block_path, block_diagram)
+
+        assert 'block_1' in validator.get_error_msg()
+
+        input_items = scene.add_diagram(Diagram('Keras', [create_layer('InputLayer', 'y')], [(0.0, 250.0)], []))
+        scene.add_items(list(), [Arrow(input_items[0], items[1])])
+
+        assert validator.get_error_msg() is None
+    finally:
+        block_definitions.clear_block_definitions()
+
+
+def test_block_inner_layers_names_are_taken(scene, tmp_path):
+    block_path = str(tmp_path / 'block.tlz')
+    block_layers = [create_layer('InputLayer', 'x'), create_layer('DenseLayer', 'a'), create_layer('DenseLayer', 'b')]
+    block_diagram = Diagram('Keras', block_layers, [(0.0, 0.0), (250.0, 0.0), (500.0, 0.0)], [(0, 1), (1, 2)])
+    diagram_file_utils.save_diagram(block_path, block_diagram)
+
+    layers = [create_layer('BlockLayer', 'block_1', block_file_path=block_path)]
+    layers.append(create_layer('DenseLayer', 'block_1_a'))
+    try:
+        items = scene.add_diagram(Diagram('Keras', layers, [(0.0, 0.0), (250.0, 0.0)], []))
+
+        assert items[0].get_framework_layer().object_name == 'block_1'
+        assert items[1].get_framework_layer().object_name == 'dense_1'
+        assert scene.name_allocator.rename('dense_1', 'block_1_a') is not None
+
+        scene.remove_items([items[0]])
+
+        assert scene.name_allocator.rename('dense_1', 'block_1_a') is None
+    finally:
+        block_definitions.clear_block_definitions()
+
+
+def test_block_inputs_keep_their_parents_after_unrelated_node_is_removed(scene, tmp_path):
+    block_path = str(tmp_path / 'block.tlz')
+    block_layers = [create_layer('InputLayer', 'x_1'), create_layer('InputLayer', 'x_2')]
+    block_layers += [create_layer('DenseLayer', 'a'), create_layer('DenseLayer', 'b'), create_layer('DenseLayer', 'c')]
+    block_positions = [(node * 250.0, 0.0) for node in range(len(block_layers))]
+    block_diagram = Diagram('Keras', block_layers, block_positions, [(0, 2), (1, 3), (2, 4), (3, 4)])
+    diagram_file_utils.save_diagram(block_path, block_diagram)
+
+    # The block's parents are dense_1 and y, removing dense_2 moves y before dense_1 in the model graph.
+    layers = [create_layer('InputLayer', 'x'), create_layer('DenseLayer', 'dense_2')]
+    layers += [create_layer('DenseLayer', 'dense_1'), create_layer('BlockLayer', 'block_1', block_file_path=block_path)]
+    layers.append(create_layer('InputLayer', 'y'))
+    positions = [(node * 250.0, 0.0) for node in range(len(layers))]
+    diagram_graph = scene.get_diagram_graph()
+    try:
+        items = scene.add_diagram(Diagram('Keras', layers, positions, [(0, 1), (0, 2), (2, 3), (4, 3)]))
+        model_codes = list()
+        for removed_items in ([], [items[1]]):
+            scene.remove_items(removed_items)
+            nodes_layers = [node.get_framework_layer() for node in diagram_graph.get_nodes()]
+
+            assert diagram_graph.get_validator().get_error_msg() is None
+            model_codes.append(export_utils.export_model('Keras', nodes_layers, diagram_graph.get_graph()))
+
+        for model_code in model_codes:
+            assert 'self.block_1_a(self.dense_1_output)' in model_code
+            assert 'self.block_1_b(y)' in model_code
+    finally:
+        block_definitions.clear_block_definitions()
+
+
+def test_validator_reports_self_loop_as_cycle(scene):
+    diagram = create_chain_diagram(3)
+    diagram.edges.append((1, 1))
+    scene.add_diagram(diagram)
+    validator = scene.get_diagram_graph().get_validator()
+
+    assert validator.get_error_msg() == main_window_constants.MODEL_GRAPH_CYCLE_ERROR_MSG
+
+    self_loop_arrow = next(arrow for arrow in validator.cycle_edges)
+    scene.remove_items([self_loop_arrow])
+
+    assert validator.get_error_msg() is None
@@ -0,0 +1,122 @@
+# First-party package imports.
+from constants import diagram_constants
+from widgets.diagram_undo_stack import DiagramCommand, DiagramUndoStack
+
+
+class RecordedCommand(DiagramCommand):
+    """Command of a fixed cost recording its undo and redo calls."""
+
+    def __init__(self, name: str, cost: int, calls: list, is_mergeable: bool = False):
+        self.name = name
+        self.cost = cost
+        self.calls = calls
+        self.is_mergeable = is_mergeable
+
+    def undo(self):
+        self.calls.append(('undo', self.name))
+
+    def redo(self):
+        self.calls.append(('redo', self.name))
+
+    def get_cost(self) -> int:
+        return self.cost
+
+    def merge_with(self, command: DiagramCommand) -> bool:
+        if not (self.is_mergeable and command.is_mergeable):
+            return False
+
+        self.name += command.name
+        self.cost += command.cost
+        return True
+
+
+def get_names(undo_stack: DiagramUndoStack) -> list:
+    return [command.name for command in undo_stack.commands]
+
+
+def test_push_undo_redo():
+    calls = list()
+    undo_stack = DiagramUndoStack(1000)
+    undo_stack.push(RecordedCommand('a', 10, calls))
+    undo_stack.push(RecordedCommand('b', 10, calls))
+
+    undo_stack.undo()
+    undo_stack.undo()
+    undo_stack.undo()
+    undo_stack.redo()
+
+    assert calls == [('undo', 'b'), ('undo', 'a'), ('redo', 'a')]
+    assert undo_stack.can_undo() and undo_stack.can_redo()
+
+
+def test_push_drops_redo_commands_and_their_cost():
+    undo_stack = DiagramUndoStack(1000)
+    undo_stack.push(RecordedCommand('a', 10, list()))
+    undo_stack.push(RecordedCommand('b', 20, list()))
+    undo_stack.undo()
+    undo_stack.push(RecordedCommand('c', 30, list()))
+
+    assert get_names(undo_stack) == ['a', 'c']
+    assert undo_stack.get_cost() == 40
+    assert not undo_stack.can_redo()
+
+
+def test_push_merges_commands_and_their_cost():
+    undo_stack = DiagramUndoStack(1000)
+    undo_stack.push(RecordedCommand('a', 10, list(), is_mergeable=True))
+    undo_stack.push(RecordedCommand('b', 20, list(), is_mergeable=True))
+    undo_stack.push(RecordedCommand('c', 30, list()))
+
+    assert get_names(undo_stack) == ['ab', 'c']
+    assert undo_stack.get_cost() == 60
+    assert undo_stack.index == 2
+
+
+def test_push_evicts_oldest_commands():
+    undo_stack = DiagramUndoStack(50)
+    for name in 'abcd':
+        undo_stack.push(RecordedCommand(name, 20, list()))
+
+    assert get_names(undo_stack) == ['c', 'd']
+    assert undo_stack.get_cost() == 40
+    assert undo_stack.index == 2
+
+
+def test_newest_command_is_kept_over_the_limit():
+    undo_stack = DiagramUndoStack(50)
+    undo_stack.push(RecordedCommand('a', 20, list()))
+    undo_stack.push(RecordedCommand('b', 100, list()))
+
+    assert get_names(undo_stack) == ['b']
+    assert undo_stack.can_undo()
+
+
+def test_lowered_limit_evicts_redo_commands_once_undone_to_the_start():
+    undo_stack = DiagramUndoStack(1000)
+    for name in 'abcd':
+        undo_stack.push(RecordedCommand(name, 100, list()))
+    for _ in range(4):
+        undo_stack.undo()
+
+    undo_stack.set_memory_limit(250)
+
+    assert get_names(undo_stack) == ['a', 'b']
+    assert undo_stack.get_cost() == 200
+    assert undo_stack.index == 0 and undo_stack.can_redo()
+
+
+def test_eviction_keeps_next_command_to_undo_before_redo_commands():
+    undo_stack = DiagramUndoStack(1000)
+    for name in 'abcd':
+        undo_stack.push(RecordedCommand(name, 100, list()))
+    undo_stack.undo()
+    undo_stack.undo()
+
+    undo_stack.set_memory_limit(150)
+
+    assert get_names(undo_stack) == ['b']
+    assert undo_stack.index == 1 and not undo_stack.can_redo()
+
+
+def test_default_memory_limit():
+    assert DiagramUndoStack().memory_limit == diagram_constants.DIAGRAM_UNDO_MEMORY_LIMIT
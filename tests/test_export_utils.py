@@ -0,0 +1,76 @@
+# Built-in imports.
+import os
+
+# Third-party package imports.
+import pytest
+
+# First-party package imports.
+from utils import export_utils
+from utils import graph_utils
+from constants import main_window_constants
+from widgets import main_window as main_window_module
+from diagram_helpers import create_chain_diagram
+
+
+def export_diagram(diagram) -> str:
+    graph = graph_utils.create_graph_from_edges(len(diagram.layers), diagram.edges)
+    return export_utils.export_model(diagram.framework_name, diagram.layers, graph)
+
+
+def test_export_model_connections():
+    model_code = export_diagram(create_chain_diagram(3))
+
+    assert 'def call(self, x, training=False):' in model_code
+    assert 'self.dense_1_output = self.dense_1(x)' in model_code
+    assert 'self.dense_2_output = self.dense_2(self.dense_1_output)' in model_code
+
+
+@pytest.mark.parametrize('object_name, error_msg', [
+    ('x', main_window_constants.LAYER_NAME_TAKEN_ERROR_MSG.format('x')),
+    (None, main_window_constants.MODEL_GRAPH_LAYER_NAME_MISSING_ERROR_MSG),
+    ('dense-1', main_window_constants.LAYER_NAME_INVALID_ERROR_MSG.format('dense-1')),
+    ('model', main_window_constants.LAYER_NAME_RESERVED_ERROR_MSG.format('model')),
+    ('dense_output', main_window_constants.LAYER_NAME_RESERVED_ERROR_MSG.format('dense_output')),
+])
+def test_export_rejects_layer_names(object_name, error_msg):
+    diagram = create_chain_diagram(3)
+    diagram.layers[2].object_name = object_name
+
+    with pytest.raises(export_utils.ModelGraphError) as error_info:
+        export_diagram(diagram)
+    assert str(error_info.value) == error_msg
+
+
+def test_export_error_keeps_previous_output_file(main_window, monkeypatch, tmp_path):
+    os.makedirs(str(tmp_path / 'models'))
+    file_path = str(tmp_path / 'models' / 'talzeeq.py')
+    with open(file_path, 'w') as fp:
+        fp.write('previous model')
+
+    class FileDialog(object):
+        @staticmethod
+        def getSaveFileName(*args):
+            return file_path, ''
+
+    def raise_model_graph_error():
+        raise export_utils.ModelGraphError('The layer can not be written.')
+
+    error_msgs = list()
+    monkeypatch.setattr(main_window_module, 'QFileDialog', FileDialog)
+    monkeypatch.setattr(main_window, 'show_model_graph_eval_error_msg', error_msgs.append)
+
+    items = main_window.scene.add_diagram(create_chain_diagram(3))
+    monkeypatch.setattr(items[2].get_framework_layer(), 'layer_definition', raise_model_graph_error)
+    main_window.export_diagram()
+
+    assert error_msgs == ['The layer can not be written.']
+    with open(file_path) as fp:
+        assert fp.read() == 'previous model'
+    assert os.listdir(str(tmp_path / 'models')) == ['talzeeq.py']
+
+    monkeypatch.undo()
+    monkeypatch.setattr(main_window_module, 'QFileDialog', FileDialog)
+    main_window.export_diagram()
+
+    with open(file_path) as fp:
+        assert 'self.dense_2_output = self.dense_2(self.dense_1_output)' in fp.read()
@@ -0,0 +1,100 @@
+# Built-in imports.
+import json
+
+from typing import List
+
+# Third-party package imports.
+from PyQt5.QtCore import QMimeData
+from PyQt5.QtWidgets import QApplication
+
+# First-party package imports.
+from utils import diagram_file_utils
+from constants import main_window_constants
+from widgets.arrow import Arrow
+from widgets.main_window import MainWindow
+from widgets.diagram_item import DiagramItem
+from diagram_helpers import create_chain_diagram
+
+
+def get_layers_names(main_window: MainWindow) -> List[str]:
+    return sorted(
+        item.get_framework_layer().object_name
+        for item in main_window.scene.items()
+        if isinstance(item, DiagramItem)
+    )
+
+
+def get_arrows_count(main_window: MainWindow) -> int:
+    return len([item for item in main_window.scene.items() if isinstance(item, Arrow)])
+
+
+def set_clipboard_diagram(data: bytes):
+    mime_data = QMimeData()
+    mime_data.setData(main_window_constants.DIAGRAM_MIME_TYPE, data)
+    QApplication.clipboard().setMimeData(mime_data)
+
+
+def test_copy_paste_renames_taken_names_and_is_undone_at_once(main_window):
+    items = main_window.scene.add_diagram(create_chain_diagram(3))
+    for item in items:
+        item.setSelected(True)
+
+    main_window.copy_items()
+    main_window.paste_items()
+
+    assert get_layers_names(main_window) == ['dense_1', 'dense_2', 'dense_3', 'dense_4', 'input_1', 'x']
+    assert get_arrows_count(main_window) == 4
+    assert not any(item.isSelected() for item in items)
+
+    main_window.scene.undo()
+
+    assert get_layers_names(main_window) == ['dense_1', 'dense_2', 'x']
+    assert get_arrows_count(main_window) == 2
+
+
+def test_duplicate_copies_selected_items_and_their_arrows(main_window):
+    items = main_window.scene.add_diagram(create_chain_diagram(3))
+    items[1].setSelected(True)
+    items[2].setSelected(True)
+
+    main_window.duplicate_items()
+
+    assert get_layers_names(main_window) == ['dense_1', 'dense_2', 'dense_3', 'dense_4', 'x']
+    assert get_arrows_count(main_window) == 3
+
+    main_window.scene.undo()
+
+    assert get_layers_names(main_window) == ['dense_1', 'dense_2', 'x']
+
+
+def test_corrupted_clipboard_diagram_is_not_pasted(main_window):
+    main_window.scene.add_diagram(create_chain_diagram(2))
+    header = json.loads(diagram_file_utils.encode_diagram(create_chain_diagram(2)))
+
+    corrupted_headers = [
+        dict(header, edges=[0, 7]),
+        dict(header, edges=[0]),
+        dict(header, nodes=[0, 5]),
+        dict(header, nodes=1),
+        dict(header, parameters=[['x'], 5]),
+        dict(header, framework='Unknown'),
+    ]
+    for corrupted_header in corrupted_headers:
+        set_clipboard_diagram(json.dumps(corrupted_header).encode('utf-8'))
+        main_window.paste_items()
+    for data in [b'[]', b'not a diagram', diagram_file_utils.encode_diagram(create_chain_diagram(2), True)[:30]]:
+        set_clipboard_diagram(data)
+        main_window.paste_items()
+
+    assert get_layers_names(main_window) == ['dense_1', 'x']
+    assert not main_window.scene.get_undo_stack().can_undo()
+
+
+def test_pasted_layer_without_a_name_string_is_renamed(main_window):
+    header = json.loads(diagram_file_utils.encode_diagram(create_chain_diagram(2)))
+    header['parameters'] = [[['x']], [5, 32, 'linear', False]]
+
+    set_clipboard_diagram(json.dumps(header).encode('utf-8'))
+    main_window.paste_items()
+
+    assert get_layers_names(main_window) == ['dense_1', 'input_1']
@@ -0,0 +1,53 @@
+# Built-in imports.
+import json
+
+# Third-party package imports.
+import pytest
+
+# First-party package imports.
+from utils import diagram_file_utils
+from talzeeq.__main__ import main
+from diagram_helpers import create_chain_diagram
+
+
+def test_export_writes_model(tmp_path):
+    diagram_path = str(tmp_path / 'chain.tlz')
+    output_path = str(tmp_path / 'chain.py')
+    diagram_file_utils.save_diagram(diagram_path, create_chain_diagram(3))
+
+    assert main(['export', diagram_path, '-o', output_path]) == 0
+    with open(output_path) as fp:
+        assert 'self.dense_2_output = self.dense_2(self.dense_1_output)' in fp.read()
+
+
+@pytest.mark.parametrize('file_content, error_name', [
+    (None, 'FileNotFoundError'),
+    (b'{"version": 2, "framework"', 'JSONDecodeError'),
+    (b'{"version": 99}', 'ValueError'),
+    (json.dumps({
+        'version': 2, 'framework': 'Keras', 'layers': [{'name': 'NoLayer', 'parameters': []}],
+        'parameters': [[]], 'nodes': [0], 'positions': [0, 0], 'edges': [],
+    }).encode('utf-8'), 'KeyError'),
+])
+def test_export_reports_file_errors_on_one_line(tmp_path, capsys, file_content, error_name):
+    diagram_path = str(tmp_path / 'bad.tlz')
+    if file_content is not None:
+        with open(diagram_path, 'wb') as fp:
+            fp.write(file_content)
+
+    assert main(['export', diagram_path]) == 1
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err.startswith('talzeeq: error: {}: {}'.format(diagram_path, error_name))
+    assert captured.err.count('\n') == 1
+
+
+def test_export_reports_model_graph_errors_on_one_line(tmp_path, capsys):
+    diagram = create_chain_diagram(3)
+    diagram.edges.append((2, 1))
+    diagram_path = str(tmp_path / 'cycle.tlz')
+    diagram_file_utils.save_diagram(diagram_path, diagram)
+
+    assert main(['export', diagram_path]) == 1
+    assert capsys.readouterr().err.count('\n') == 1